@@ -1,15 +1,15 @@
-from app import create_app
+from app import create_app, logger
 import os
 
 # Força produção na Vercel
 if os.getenv('VERCEL'):
     os.environ['FLASK_ENV'] = 'production'
 
-# Debug
-print("🚀 Iniciando API na Vercel")
-print(f"FLASK_ENV: {os.getenv('FLASK_ENV')}")
-print(f"POSTGRES_SERVER: {os.getenv('POSTGRES_SERVER', 'NAO_CONFIGURADO')}")
-print(f"DATABASE_URL: {'CONFIGURADA' if os.getenv('DATABASE_URL') else 'NAO_CONFIGURADA'}")
-
-# Cria app
+# Cria app (configura os logs estruturados)
 app = create_app('config.ProductionConfig')
+
+logger.info("Iniciando API na Vercel", extra={
+    'flask_env': os.getenv('FLASK_ENV'),
+    'postgres_server': os.getenv('POSTGRES_SERVER', 'NAO_CONFIGURADO'),
+    'database_url': 'CONFIGURADA' if os.getenv('DATABASE_URL') else 'NAO_CONFIGURADA',
+})
@@ -4,12 +4,19 @@
 
 # FLASK - Framework web minimalista para Python
 # Documentação: https://flask.palletsprojects.com/
+import json
+import logging
 import os
-from flask import Flask, jsonify, request
+import time
+from datetime import datetime, timedelta, timezone
+from flask import Flask, Response, abort, jsonify, request
+import click  # CLI do Flask (flask seed ...)
+from flask.cli import AppGroup  # Grupo de comandos (flask admin ...)
 
 # Flask → Classe principal para criar aplicação web
 # jsonify → Converte dicionário Python em JSON (formato para APIs)
 # request → Objeto global com dados da requisição HTTP (body, headers, etc)
+# Response → Resposta em stream (Server-Sent Events em /tarefas/stream)
 
 # SQLALCHEMY - ORM (Object-Relational Mapping)
 # Traduz classes Python em tabelas SQL
@@ -36,9 +43,9 @@ from flask_bcrypt import Bcrypt
 # Cliente envia token no header: Authorization: Bearer eyJhbGci...
 # Servidor valida token e identifica usuário
 from flask_jwt_extended import (
-    JWTManager,           # Gerenciador JWT
     create_access_token,  # Cria token após login
     jwt_required,         # Decorator: rota precisa de token
+    get_jwt,              # Payload completo do token (jti, exp) → logout
     get_jwt_identity      # Extrai email do token
 )
 
@@ -46,7 +53,15 @@ from flask_jwt_extended import (
 # Cria interface /docs com todos endpoints
 # Resource → Classe que representa endpoint REST
 # fields → Define tipos de dados (string, int, bool)
-from flask_restx import Api, Resource, fields
+from flask_restx import Api, Resource, fields, marshal
+from flask_restx import abort as restx_abort
+
+# SQLALCHEMY CORE - Construtores de SQL (UPDATE/DELETE em um único comando)
+# select/update/delete geram SQL parametrizado direto, sem carregar objetos na sessão
+from sqlalchemy import bindparam, case, delete, insert, literal, select, text, union_all, update
+from sqlalchemy.types import SmallInteger, TypeDecorator
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # CORS - Cross-Origin Resource Sharing
 # Permite frontend (localhost:8000) acessar backend (localhost:5000)
@@ -55,7 +70,52 @@ from flask_cors import CORS
 
 # SCHEMAS - Nossos schemas Pydantic customizados
 # Importa validações que criamos em schemas.py
-from schemas import TarefaCreateSchema, TarefaUpdateSchema
+from schemas import (
+    LoginSchema,
+    PrioridadeEnum,
+    RegistroSchema,
+    TarefaCreateSchema,
+    TarefaUpdateSchema,
+)
+
+# COMPRESSÃO - gzip/brotli negociado via Accept-Encoding (ver compressao.py)
+from compressao import init_compressao
+
+# MANUTENÇÃO - purga de tarefas excluídas em segundo plano (ver manutencao.py)
+from manutencao import TrabalhadorDeManutencao
+
+# COALESCÊNCIA - agrupa PUTs repetidos da mesma tarefa em um só commit (ver coalescencia.py)
+from coalescencia import CoalescedorDeEscritas
+
+# EVENTOS - push de mudanças via SSE, LISTEN/NOTIFY no PostgreSQL (ver eventos.py)
+from eventos import CanalDeEventos
+
+# REVOGAÇÃO - logout de tokens JWT checado em memória (ver revogacao.py)
+from revogacao import ListaDeRevogacao
+
+# CACHE DE TOKENS - JWTManager que não reverifica o mesmo token (ver cache_tokens.py)
+from cache_tokens import JWTManagerComCache
+
+# SEMEADOR - dados sintéticos em massa para benchmark/staging (ver semeador.py)
+from semeador import DISTRIBUICOES, Semeador, interpretar_prioridades
+
+# CONSULTAS LENTAS - SQL acima do limiar vai para log + /admin/consultas-lentas (ver consultas_lentas.py)
+from consultas_lentas import RegistroDeConsultasLentas
+
+# RASTREAMENTO - spans por requisição exportados em OTLP/JSON (ver rastreamento.py)
+from rastreamento import Rastreador
+
+# DNS - hostaddr IPv4 resolvido com timeout e cache (ver resolvedor_dns.py)
+from resolvedor_dns import ResolvedorDNS
+
+# IDEMPOTÊNCIA - Idempotency-Key em rotas de criação (ver idempotencia.py)
+from idempotencia import ChavesDeIdempotencia
+
+# LEITURA ÚNICA - GETs idênticos e simultâneos viram uma consulta (ver leitura_unica.py)
+from leitura_unica import LeituraUnica
+
+# LOGS - JSON estruturado via fila + log de acesso por requisição (ver logs.py)
+from logs import LogDeAcesso, configurar_logs
 
 # ===================================================================================
 # 🌍 INSTÂNCIAS GLOBAIS (Padrão Application Factory)
@@ -72,8 +132,20 @@ from schemas import TarefaCreateSchema, TarefaUpdateSchema
 
 db = SQLAlchemy()        # ORM - comunica com banco de dados
 bcrypt = Bcrypt()        # Hashing de senhas
-jwt = JWTManager()       # Gerenciamento de tokens JWT
+jwt = JWTManagerComCache()  # Gerenciamento de tokens JWT (+ cache de verificados)
 migrate = Migrate()      # Migrações do banco
+manutencao = TrabalhadorDeManutencao()  # Jobs de banco em períodos ociosos
+coalescencia = CoalescedorDeEscritas()  # Buffer de escrita (opcional, COALESCENCIA_ATIVA)
+eventos = CanalDeEventos()              # Pub/sub de mudanças para /tarefas/stream
+revogacao = ListaDeRevogacao()          # Blocklist de tokens (logout)
+consultas_lentas = RegistroDeConsultasLentas()  # Log de SQL lento (+ EXPLAIN)
+rastreamento = Rastreador()             # Tracing HTTP/SQL/bcrypt (spans OTLP)
+log_acesso = LogDeAcesso()              # Um registro JSON por requisição
+resolvedor_dns = ResolvedorDNS()        # IPv4 do banco em cache (hostaddr)
+idempotencia = ChavesDeIdempotencia()   # Replay de POST repetido (Idempotency-Key)
+leitura_unica = LeituraUnica()          # Single-flight de GET /tarefas por worker
+
+logger = logging.getLogger('tarefas')   # Mensagens da app (no lugar de print)
 
 
 # ===================================================================================
@@ -94,6 +166,29 @@ migrate = Migrate()      # Migrações do banco
 # - Type safety
 
 
+class PrioridadeTipo(TypeDecorator):
+    """
+    Prioridade gravada como SMALLINT, exposta ao Python como 'baixa'/'media'/'alta'.
+
+    A API, os schemas e as comparações (Tarefa.prioridade == 'alta') continuam
+    usando o texto; só o banco vê o código (PrioridadeEnum.codigo: 1, 2, 3).
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return PrioridadeEnum(value).codigo
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # .value → str simples ('alta'), igual ao que a coluna String devolvia
+        return PrioridadeEnum.de_codigo(int(value)).value
+
+
 class Usuario(db.Model):
     """
     Modelo de Usuário - representa tabela 'usuario' no banco.
@@ -109,11 +204,27 @@ class Usuario(db.Model):
     # EMAIL - único (não permite duplicados), obrigatório
     # String(120) = VARCHAR(120) em SQL
     email = db.Column(db.String(120), unique=True, nullable=False)
+
+    # ix_usuario_email_lower: 'A@x.com' e 'a@x.com' são o MESMO usuário
+    # → unicidade e buscas (filtro_email) sobre lower(email); o email é guardado
+    #   como foi digitado no registro (é o que aparece na tela e vai no token)
+    __table_args__ = (
+        db.Index('ix_usuario_email_lower', db.func.lower(email), unique=True),
+    )
     
     # SENHA - hash bcrypt (200 chars), obrigatório
     # NUNCA armazene senha em texto plano!
     # Exemplo hash: "$2b$12$NaXz8Gh5..." (60 chars, mas deixamos 200 para segurança)
     senha = db.Column(db.String(200), nullable=False)
+
+    # FEED DE MUDANÇAS (GET /tarefas/changes)
+    # seq_mudancas: contador de escritas do usuário; cada escrita em tarefa faz +1
+    #   e grava o novo valor em tarefa.seq (o UPDATE trava esta linha até o commit
+    #   → a sequência de cada usuário cresce na mesma ordem dos commits)
+    # seq_expurgo: maior seq de tarefa excluída já removida pela purga
+    #   → cursor menor que isso perdeu exclusões: cliente precisa recarregar tudo
+    seq_mudancas = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    seq_expurgo = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
     
     # RELACIONAMENTO - Permite acessar usuario.tarefas
     # backref='usuario' - Permite acessar tarefa.usuario
@@ -125,6 +236,9 @@ class Usuario(db.Model):
         lazy=True,                  # Lazy loading (performance)
         cascade='all, delete-orphan'  # Deleção em cascata
     )
+    tarefas_arquivadas = db.relationship(
+        'TarefaArquivada', lazy=True, cascade='all, delete-orphan'
+    )
 
 
 class Tarefa(db.Model):
@@ -133,7 +247,43 @@ class Tarefa(db.Model):
     
     Relacionamento: N tarefas → 1 usuário (many-to-one)
     Cada tarefa DEVE ter um dono (user_id obrigatório)
+
+    Soft delete: DELETE /tarefas/<id> só preenche deleted_at.
+    A remoção física acontece depois, em lotes (ver purgar_tarefas_excluidas).
     """
+
+    # ÍNDICES PARCIAIS (WHERE ...) - indexam só as linhas que interessam
+    # ix_tarefa_user_ativas: listagem do usuário ignora tarefas excluídas
+    #   → índice não cresce com lixo aguardando purga
+    # ix_tarefa_excluidas: purga acha as excluídas mais antigas sem varrer a tabela
+    __table_args__ = (
+        db.Index(
+            'ix_tarefa_user_ativas', 'user_id', 'id',
+            postgresql_where=text('deleted_at IS NULL'),
+            sqlite_where=text('deleted_at IS NULL'),
+        ),
+        db.Index(
+            'ix_tarefa_excluidas', 'deleted_at',
+            postgresql_where=text('deleted_at IS NOT NULL'),
+            sqlite_where=text('deleted_at IS NOT NULL'),
+        ),
+        # ix_tarefa_user_seq: feed de mudanças lê "seq > :cursor" do usuário em ordem
+        #   (também serve a busca pelo dono incluindo excluídas e a FK tarefa.user_id)
+        db.Index('ix_tarefa_user_seq', 'user_id', 'seq'),
+        # ix_tarefa_pendentes_prioridade: pendentes do usuário agrupadas por prioridade
+        db.Index(
+            'ix_tarefa_pendentes_prioridade', 'user_id', 'prioridade',
+            postgresql_where=text('NOT concluida AND deleted_at IS NULL'),
+            sqlite_where=text('NOT concluida AND deleted_at IS NULL'),
+        ),
+        # ix_tarefa_user_prioridade: GET /tarefas?ordem=prioridade
+        #   ORDER BY prioridade DESC, id sai direto do índice (sem sort)
+        db.Index(
+            'ix_tarefa_user_prioridade', 'user_id', text('prioridade DESC'), 'id',
+            postgresql_where=text('deleted_at IS NULL'),
+            sqlite_where=text('deleted_at IS NULL'),
+        ),
+    )
     
     # PRIMARY KEY
     id = db.Column(db.Integer, primary_key=True)
@@ -148,7 +298,8 @@ class Tarefa(db.Model):
     
     # PRIORIDADE - enum-like (baixa, media, alta)
     # Default = 'baixa' (se não informar, assume baixa)
-    prioridade = db.Column(db.String(50), nullable=False, default='baixa')
+    # No banco: SMALLINT 1/2/3 (ver PrioridadeTipo); no Python e na API: texto
+    prioridade = db.Column(PrioridadeTipo, nullable=False, default='baixa')
     
     # FOREIGN KEY - Chave estrangeira para tabela Usuario
     # db.ForeignKey('usuario.id') = referencia coluna "id" da tabela "usuario"
@@ -156,6 +307,527 @@ class Tarefa(db.Model):
     # Isso cria relacionamento N:1 (muitas tarefas → 1 usuário)
     user_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
 
+    # SOFT DELETE - momento da exclusão (UTC); NULL = tarefa ativa
+    deleted_at = db.Column(db.DateTime, nullable=True)
+
+    # VERSÃO - incrementada a cada escrita (controle de concorrência otimista)
+    # Exposta como ETag; cliente devolve em If-Match → UPDATE ... WHERE versao = :v
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    # SEQUÊNCIA DE MUDANÇA - valor de usuario.seq_mudancas na última escrita
+    # Exclusões (deleted_at) também recebem seq → viram "tombstones" no feed
+    seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+
+    # CONCLUSÃO - quando a tarefa foi marcada como concluída (NULL = pendente)
+    # Concluídas há mais de ARQUIVO_APOS_DIAS vão para tarefa_arquivada
+    concluida_em = db.Column(db.DateTime, nullable=True)
+
+
+class TarefaArquivada(db.Model):
+    """
+    Tarefas concluídas há muito tempo (tabela "fria").
+
+    POR QUE UMA TABELA SEPARADA?
+    ----------------------------
+    A maioria das linhas de tarefa são concluídas que ninguém abre de novo, mas
+    elas ocupam espaço nos índices "quentes" consultados a cada GET /tarefas.
+    O job arquivar_tarefas_concluidas move essas linhas para cá em lotes;
+    a listagem só lê daqui com ?incluir_arquivadas=true.
+
+    Mesmas colunas de Tarefa (mesmo id). PUT/DELETE em tarefa arquivada
+    devolve a linha para tarefa antes de aplicar (desarquivar_tarefa).
+    """
+
+    __tablename__ = 'tarefa_arquivada'
+    __table_args__ = (
+        db.Index('ix_tarefa_arquivada_user', 'user_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    descricao = db.Column(db.String(200), nullable=False)
+    concluida = db.Column(db.Boolean, default=True)
+    prioridade = db.Column(PrioridadeTipo, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), nullable=False)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    concluida_em = db.Column(db.DateTime, nullable=True)
+    arquivada_em = db.Column(db.DateTime, nullable=False)
+
+
+class TokenRevogado(db.Model):
+    """
+    Tokens JWT revogados (logout) - fonte durável da blocklist.
+
+    Cada worker mantém uma cópia em memória (revogacao.py) sincronizada
+    incrementalmente por revogado_em; linhas com expira_em no passado são
+    removidas pelo job purgar_tokens_expirados.
+    """
+
+    __tablename__ = 'token_revogado'
+
+    jti = db.Column(db.String(36), primary_key=True)              # ID único do token
+    expira_em = db.Column(db.DateTime, nullable=False, index=True)  # exp do token (UTC)
+    revogado_em = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class RespostaIdempotente(db.Model):
+    """
+    Primeira resposta de cada Idempotency-Key, por usuário (idempotencia.py).
+
+    status NULL = requisição ainda em andamento. Linhas com expira_em no
+    passado são removidas pelo job purgar_respostas_idempotentes.
+    """
+
+    __tablename__ = 'resposta_idempotente'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('usuario.id'), primary_key=True)
+    chave = db.Column(db.String(255), primary_key=True)
+    hash_requisicao = db.Column(db.String(64), nullable=False)  # sha256 de método + caminho + corpo
+    status = db.Column(db.SmallInteger, nullable=True)
+    corpo = db.Column(db.Text, nullable=True)                   # JSON da resposta
+    criada_em = db.Column(db.DateTime, nullable=False)
+    expira_em = db.Column(db.DateTime, nullable=False, index=True)
+
+
+# Colunas copiadas entre tarefa ↔ tarefa_arquivada
+COLUNAS_ARQUIVO = (
+    'id', 'descricao', 'concluida', 'prioridade', 'user_id', 'versao', 'seq', 'concluida_em',
+)
+
+
+# ===================================================================================
+# 🔎 CONSULTAS AUXILIARES (ESCOPO POR USUÁRIO)
+# ===================================================================================
+
+# Ordenações aceitas em GET /tarefas?ordem= (cada uma tem índice correspondente)
+# Nomes de coluna ('-' = decrescente) → servem para tarefa e para o UNION com o arquivo
+ORDENACOES_TAREFA = {
+    'id': ('id',),
+    'prioridade': ('-prioridade', 'id'),
+}
+
+
+def ordenar(colunas, ordem):
+    """Expressões ORDER BY da ordenação pedida sobre uma coleção de colunas (.c)."""
+    return [
+        colunas[nome[1:]].desc() if nome.startswith('-') else colunas[nome]
+        for nome in ORDENACOES_TAREFA[ordem]
+    ]
+
+# Colunas devolvidas pelos endpoints de tarefa (RETURNING / SELECT)
+# Mesmo formato do modelo 'TarefaOutput' do Swagger
+COLUNAS_TAREFA = (Tarefa.id, Tarefa.descricao, Tarefa.concluida, Tarefa.prioridade, Tarefa.versao)
+
+
+def listar_tarefas(user_id, ordem, incluir_arquivadas):
+    """
+    Tarefas do usuário (sem as excluídas) como lista de dicts, na ordem pedida.
+
+    Por padrão só a tabela quente: ORDER BY coberto pelos índices parciais
+    (user_id, id) / (user_id, prioridade DESC, id).
+    """
+    ativas = (
+        select(*COLUNAS_TAREFA)
+        .where(Tarefa.user_id == user_id, Tarefa.deleted_at.is_(None))
+    )
+    if incluir_arquivadas:
+        todas = union_all(
+            ativas.add_columns(literal(False).label('arquivada')),
+            select(
+                *(getattr(TarefaArquivada, c.key) for c in COLUNAS_TAREFA),
+                literal(True).label('arquivada'),
+            ).where(TarefaArquivada.user_id == user_id),
+        ).subquery()
+        consulta = select(todas).order_by(*ordenar(todas.c, ordem))
+    else:
+        consulta = ativas.order_by(*ordenar(Tarefa.__table__.c, ordem))
+    return [dict(t) for t in db.session.execute(consulta).mappings()]
+
+
+def filtro_email(email):
+    """
+    Condição WHERE por email sem diferenciar maiúsculas/minúsculas.
+
+    lower() dos DOIS lados no banco: mesma regra de comparação do índice
+    ix_usuario_email_lower (que o planner usa para esta expressão).
+    """
+    return db.func.lower(Usuario.email) == db.func.lower(email)
+
+
+def inserir_usuario(email, senha_hash):
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING id → registro em UMA ida ao banco.
+
+    Sem checar antes com SELECT: dois registros simultâneos do mesmo email não
+    passam os dois pela checagem; o índice único decide e o perdedor recebe None.
+    """
+    dialeto = db.session.get_bind().dialect.name
+    inserir = postgresql_insert if dialeto == 'postgresql' else sqlite_insert
+    comando = (
+        inserir(Usuario)
+        .values(email=email, senha=senha_hash)
+        .on_conflict_do_nothing()  # Sem alvo: vale para email e lower(email)
+        .returning(Usuario.id)
+    )
+    return db.session.execute(comando).scalar()
+
+
+def filtro_usuario_logado():
+    """
+    Condição WHERE do usuário dono do token JWT.
+
+    Claim uid (tokens emitidos no login) → pela chave primária; tokens antigos,
+    sem a claim, caem no email via filtro_email() (mesma regra sem caixa do
+    login, coberta por ix_usuario_email_lower).
+    """
+    uid = get_jwt().get('uid')
+    if uid is not None:
+        return Usuario.id == uid
+    return filtro_email(get_jwt_identity())
+
+
+def id_usuario_atual():
+    """
+    ID do usuário dono do token JWT, para usar dentro de um comando SQL.
+
+    POR QUE NÃO Usuario.query...first()?
+    ------------------------------------
+    Com a claim uid o ID já está no token (nenhuma consulta). Sem ela, a busca
+    pelo email vira uma subconsulta embutida no próprio comando, e o banco
+    resolve tudo em UMA ida e volta:
+
+        UPDATE tarefa SET ... WHERE tarefa.id = :id
+          AND tarefa.user_id = (SELECT usuario.id FROM usuario WHERE lower(usuario.email) = lower(:email))
+        RETURNING ...
+    """
+    uid = get_jwt().get('uid')
+    if uid is not None:
+        return uid
+    return select(Usuario.id).where(filtro_usuario_logado()).scalar_subquery()
+
+
+def id_do_usuario_logado():
+    """
+    ID do dono do token: claim uid (tokens emitidos no login) sem ida ao banco;
+    tokens antigos, sem a claim, caem na busca pelo email.
+    """
+    uid = get_jwt().get('uid')
+    if uid is not None:
+        return uid
+    return db.session.execute(select(Usuario.id).where(filtro_usuario_logado())).scalar()
+
+
+def filtro_tarefa_do_usuario(id):
+    """Condições WHERE que limitam a tarefa ao dono do token (sem acesso cruzado)."""
+    return (
+        Tarefa.id == id,
+        Tarefa.user_id == id_usuario_atual(),
+        Tarefa.deleted_at.is_(None),
+    )
+
+
+def desarquivar_tarefa(id):
+    """
+    Devolve uma tarefa arquivada do usuário logado para a tabela quente.
+
+    Mesma transação da escrita que vem depois (PUT/DELETE): se ela falhar,
+    o rollback devolve a tarefa ao arquivo.
+
+    Returns:
+        bool: True se a tarefa estava arquivada (e foi restaurada)
+    """
+    colunas = [getattr(TarefaArquivada, nome) for nome in COLUNAS_ARQUIVO]
+    linha = db.session.execute(
+        delete(TarefaArquivada)
+        .where(TarefaArquivada.id == id, TarefaArquivada.user_id == id_usuario_atual())
+        .returning(*colunas)
+        .execution_options(synchronize_session=False)
+    ).mappings().first()
+    if linha is None:
+        return False
+    db.session.execute(insert(Tarefa).values(**linha))
+    return True
+
+
+def registrar_mudanca(*filtro_usuario, passos=1):
+    """
+    UPDATE usuario SET seq_mudancas = seq_mudancas + <passos> WHERE <filtro>.
+
+    Deve rodar na MESMA transação da escrita em tarefa, ANTES dela.
+    A escrita usa seq_do_dono() para copiar o novo valor para tarefa.seq.
+    Várias tarefas na mesma transação: passos = quantidade, e cada uma fica
+    com seq_do_dono() - i (seqs distintos → o cursor do feed não pula nenhuma).
+    """
+    return (
+        update(Usuario)
+        .where(*filtro_usuario)
+        .values(seq_mudancas=Usuario.seq_mudancas + passos)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def registrar_mudancas_do_lote(quantidades):
+    """Flush coalescido: avança o contador de cada usuário pelo nº de tarefas dele no lote."""
+    por_passos = {}
+    for user_id, quantidade in quantidades.items():
+        por_passos.setdefault(quantidade, []).append(user_id)
+    for passos, user_ids in por_passos.items():
+        db.session.execute(registrar_mudanca(Usuario.id.in_(user_ids), passos=passos))
+
+
+def seq_do_dono():
+    """Subconsulta correlacionada: seq_mudancas atual do dono da tarefa."""
+    return (
+        select(Usuario.seq_mudancas)
+        .where(Usuario.id == Tarefa.user_id)
+        .scalar_subquery()
+    )
+
+
+def versoes_if_match():
+    """
+    Versões aceitas pelo cabeçalho If-Match da requisição.
+
+    EXEMPLOS:
+    ---------
+    (sem If-Match)      → None (sem pré-condição, última escrita vence)
+    If-Match: *         → None (qualquer versão existente)
+    If-Match: "3"       → [3]
+    If-Match: W/"3", "4" → [3, 4] (ETag fraco vem da compressão)
+    If-Match: "abc"     → [] (nunca casa → 412)
+    """
+    if 'If-Match' not in request.headers or request.if_match.star_tag:
+        return None
+    versoes = []
+    for etag in request.if_match.as_set(include_weak=True):
+        try:
+            versoes.append(int(etag))
+        except ValueError:
+            pass
+    return versoes
+
+
+def etag_da_versao(versao):
+    """Cabeçalho ETag para uma versão de tarefa."""
+    return {'ETag': f'"{versao}"'}
+
+
+def agora_utc():
+    """Data/hora atual em UTC, sem fuso (mesmo formato da coluna DateTime)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ===================================================================================
+# 📥 CORPO DAS REQUISIÇÕES (validação direto dos bytes)
+# ===================================================================================
+
+def validar_corpo(schema):
+    """
+    Parse + validação do corpo bruto em uma passada (ver schemas.py):
+    model_validate_json() usa o validador que o pydantic já compilou na classe,
+    sem o dict intermediário do json.loads. JSON inválido → ValidationError.
+
+    request.get_data() respeita MAX_CONTENT_LENGTH (413) e fica em cache
+    (a Idempotency-Key também lê os mesmos bytes). Corpo que não é JSON → 415,
+    como o request.get_json() fazia.
+
+    Raises:
+        ValidationError: JSON inválido ou regra do schema violada
+    """
+    if not request.is_json:
+        abort(415)
+    return schema.model_validate_json(request.get_data())
+
+
+def abortar_validacao(erro):
+    """
+    400 com a lista de erros; sem 'input' (não devolve senha nem o corpo recebido).
+
+    Exceção (e não return): o 400 não passa pelo marshal_with da rota, que
+    moldaria {"erros": ...} no formato de tarefa.
+    """
+    restx_abort(400, 'Dados inválidos', erros=erro.errors(include_url=False, include_input=False))
+
+
+# ===================================================================================
+# 🧹 JOBS DE MANUTENÇÃO (executados por manutencao.py em períodos ociosos)
+# ===================================================================================
+
+@manutencao.registrar
+def purgar_tarefas_excluidas(app, deve_continuar):
+    """
+    Remove fisicamente tarefas excluídas há mais de PURGA_RETENCAO_SEGUNDOS.
+
+    LOTES LIMITADOS:
+    ----------------
+    Cada lote lê até PURGA_TAMANHO_LOTE excluídas, avança usuario.seq_expurgo
+    (horizonte do feed de mudanças) e faz DELETE ... WHERE id IN (...), tudo em
+    uma transação curta (locks curtos, WAL pequeno).
+    Entre lotes, dorme 1/PURGA_LOTES_POR_SEGUNDO segundos (taxa configurável)
+    e para se o worker voltar a receber requisições.
+
+    Returns:
+        int: Quantidade de tarefas removidas
+    """
+    config = app.config
+    tamanho_lote = config['PURGA_TAMANHO_LOTE']
+    limite = agora_utc() - timedelta(seconds=config['PURGA_RETENCAO_SEGUNDOS'])
+
+    lote = (
+        select(Tarefa.id, Tarefa.user_id, Tarefa.seq)
+        .where(Tarefa.deleted_at < limite)
+        .order_by(Tarefa.deleted_at)
+        .limit(tamanho_lote)
+    )
+
+    # Avança o horizonte do feed: seq_expurgo = max(seq_expurgo, :seq)
+    # (Core: executemany com bindparam, sem o "bulk UPDATE por PK" do ORM)
+    usuario = Usuario.__table__
+    avancar_horizonte = (
+        update(usuario)
+        .where(usuario.c.id == bindparam('b_user_id'))
+        .values(seq_expurgo=case(
+            (usuario.c.seq_expurgo < bindparam('b_seq'), bindparam('b_seq')),
+            else_=usuario.c.seq_expurgo,
+        ))
+    )
+
+    total = 0
+    while deve_continuar():
+        linhas = db.session.execute(lote).all()
+        if not linhas:
+            break
+
+        horizontes = {}
+        for linha in linhas:
+            horizontes[linha.user_id] = max(horizontes.get(linha.user_id, 0), linha.seq)
+        db.session.execute(avancar_horizonte, [
+            {'b_user_id': user_id, 'b_seq': seq} for user_id, seq in horizontes.items()
+        ])
+        removidas = db.session.execute(
+            delete(Tarefa)
+            .where(Tarefa.id.in_([linha.id for linha in linhas]))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        total += removidas
+
+        if removidas < tamanho_lote:
+            break  # Acabaram as excluídas elegíveis
+        time.sleep(1 / config['PURGA_LOTES_POR_SEGUNDO'])
+
+    if config['PURGA_COMPACTAR'] and total >= config['PURGA_COMPACTAR_APOS']:
+        compactar_tabela_tarefa()
+    return total
+
+
+@manutencao.registrar
+def arquivar_tarefas_concluidas(app, deve_continuar):
+    """
+    Move para tarefa_arquivada as concluídas há mais de ARQUIVO_APOS_DIAS.
+
+    Cada lote é UMA transação: DELETE ... RETURNING na tabela quente e INSERT
+    das mesmas linhas no arquivo. O DELETE trava as linhas → um PUT concorrente
+    ou espera (e não acha mais a tarefa: desarquiva) ou vence antes e a linha
+    deixa de casar com o WHERE (concluida_em mudou).
+
+    FEED DE MUDANÇAS:
+    -----------------
+    A tarefa arquivada some da tabela quente sem deixar tombstone. Na mesma
+    transação, cada dono do lote ganha uma mudança nova e seq_expurgo passa a
+    ser ela → cursores anteriores recebem resync (recarregam sem as arquivadas)
+    e os streams abertos são avisados depois do COMMIT.
+
+    Returns:
+        int: Quantidade de tarefas arquivadas
+    """
+    config = app.config
+    tamanho_lote = config['ARQUIVO_TAMANHO_LOTE']
+    limite = agora_utc() - timedelta(days=config['ARQUIVO_APOS_DIAS'])
+    elegiveis = (
+        Tarefa.concluida.is_(True),
+        Tarefa.concluida_em < limite,
+        Tarefa.deleted_at.is_(None),
+    )
+    lote = select(Tarefa.id).where(*elegiveis).limit(tamanho_lote).scalar_subquery()
+    colunas = [getattr(Tarefa, nome) for nome in COLUNAS_ARQUIVO]
+
+    total = 0
+    while deve_continuar():
+        linhas = db.session.execute(
+            delete(Tarefa)
+            .where(Tarefa.id.in_(lote), *elegiveis)
+            .returning(*colunas)
+            .execution_options(synchronize_session=False)
+        ).mappings().all()
+        user_ids = {linha['user_id'] for linha in linhas}
+        if linhas:
+            agora = agora_utc()
+            db.session.execute(
+                insert(TarefaArquivada),
+                [{**linha, 'arquivada_em': agora} for linha in linhas],
+            )
+            db.session.execute(registrar_mudanca(Usuario.id.in_(user_ids)))
+            db.session.execute(
+                update(Usuario)
+                .where(Usuario.id.in_(user_ids))
+                .values(seq_expurgo=Usuario.seq_mudancas)
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+        app.extensions['eventos'].publicar(*user_ids)
+        total += len(linhas)
+
+        if len(linhas) < tamanho_lote:
+            break  # Acabaram as concluídas elegíveis
+        time.sleep(1 / config['ARQUIVO_LOTES_POR_SEGUNDO'])
+    return total
+
+
+@manutencao.registrar
+def purgar_tokens_expirados(app, deve_continuar):
+    """
+    Remove revogações de tokens que já expiraram (o exp do JWT já os recusa).
+
+    Returns:
+        int: Quantidade de linhas removidas
+    """
+    removidas = db.session.execute(
+        delete(TokenRevogado).where(TokenRevogado.expira_em < agora_utc())
+    ).rowcount
+    db.session.commit()
+    return removidas
+
+
+@manutencao.registrar
+def purgar_respostas_idempotentes(app, deve_continuar):
+    """
+    Remove respostas de Idempotency-Key cujo prazo (IDEMPOTENCIA_TTL_HORAS) passou.
+
+    Returns:
+        int: Quantidade de linhas removidas
+    """
+    removidas = db.session.execute(
+        delete(RespostaIdempotente).where(RespostaIdempotente.expira_em < agora_utc())
+    ).rowcount
+    db.session.commit()
+    return removidas
+
+
+def compactar_tabela_tarefa():
+    """
+    Devolve ao banco o espaço das linhas removidas pela purga.
+
+    PostgreSQL: VACUUM (ANALYZE) → marca espaço reutilizável e atualiza estatísticas
+    SQLite: PRAGMA incremental_vacuum → libera páginas (se auto_vacuum=INCREMENTAL)
+
+    VACUUM não roda dentro de transação → conexão em modo AUTOCOMMIT.
+    """
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conexao:
+        if conexao.dialect.name == 'postgresql':
+            conexao.execute(text('VACUUM (ANALYZE) tarefa'))
+        elif conexao.dialect.name == 'sqlite':
+            conexao.execute(text('PRAGMA incremental_vacuum'))
 
 
 # ===================================================================================
@@ -208,6 +880,9 @@ def create_app(config_class='config.DevelopmentConfig'):
     # Ex: DevelopmentConfig tem SQLALCHEMY_DATABASE_URI = "sqlite:///..."
     app.config.from_object(config_class)
 
+    # Logs primeiro: tudo que a inicialização registrar já sai estruturado
+    app.extensions['logs'] = configurar_logs(app.config)
+
     # ==================
     # 3. INICIALIZAR EXTENSÕES
     # ==================
@@ -221,9 +896,41 @@ def create_app(config_class='config.DevelopmentConfig'):
     # Útil para testes (cada teste cria app separada)
     
     db.init_app(app)          # ORM - conecta ao banco configurado
+    resolvedor_dns.init_app(app, db)  # hostaddr resolvido ao conectar (se DNS_HOSTADDR_ATIVO)
+    consultas_lentas.init_app(app, db)  # Cronômetro de SQL + log das lentas
     bcrypt.init_app(app)      # Hashing - usa SECRET_KEY do config
     jwt.init_app(app)         # JWT - usa JWT_SECRET_KEY do config
+    revogacao.init_app(app, db, jwt, TokenRevogado)  # Blocklist em memória (logout)
+    idempotencia.init_app(    # Idempotency-Key: resposta guardada por usuário
+        app, db, RespostaIdempotente, usuario_atual=id_do_usuario_logado,
+    )
     migrate.init_app(app, db) # Migrations - conecta Flask-Migrate ao banco
+    manutencao.init_app(app)  # Jobs em segundo plano (só roda se MANUTENCAO_ATIVA)
+    eventos.init_app(app, db) # Avisos de mudança para os streams SSE
+    notificacoes = app.extensions['eventos']
+    coalescencia.init_app(    # Buffer de PUTs (se COALESCENCIA_ATIVA)
+        app, db, Tarefa.__table__,
+        valores_extras=lambda: {
+            'versao': Tarefa.versao + 1,
+            'seq': seq_do_dono() - bindparam('b_recuo', type_=db.BigInteger),
+        },
+        antes_de_gravar=registrar_mudancas_do_lote,
+        depois_de_gravar=lambda user_ids: notificacoes.publicar(*user_ids),
+    )
+    escritas = app.extensions['coalescencia']
+    rastreamento.init_app(app, db)  # Traces OTLP/JSON por requisição (se RASTREAMENTO_ATIVO)
+    rastros = app.extensions['rastreamento']
+    log_acesso.init_app(app, db)    # Registro de acesso (amostrado por rota)
+    leitura_unica.init_app(app)     # Single-flight de leituras (se LEITURA_UNICA_ATIVA)
+    leituras = app.extensions['leitura_unica']
+
+    # Corpo acima de MAX_CONTENT_LENGTH: 413 só pelo Content-Length, antes de
+    # verificar JWT ou ler um byte (sem Content-Length o Werkzeug corta ao ler)
+    @app.before_request
+    def recusar_corpo_grande():
+        limite = app.config['MAX_CONTENT_LENGTH']
+        if limite is not None and (request.content_length or 0) > limite:
+            return {'erro': f'Corpo da requisição maior que {limite} bytes'}, 413
     
     # ==================
     # 4. CORS - CRUCIAL PARA FRONTEND
@@ -252,12 +959,18 @@ def create_app(config_class='config.DevelopmentConfig'):
         app,
         resources={r"/*": {"origins": cors_origins if not allow_any_origin else "*"}},
         supports_credentials=not allow_any_origin,
-        allow_headers=["Content-Type", "Authorization"],
-        expose_headers=["Content-Type", "Authorization"],
+        allow_headers=["Content-Type", "Authorization", "If-Match", "Idempotency-Key"],
+        expose_headers=["Content-Type", "Authorization", "ETag", "Idempotent-Replayed", "Retry-After"],
         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         max_age=600,
     )
 
+    # ==================
+    # 4.1 COMPRESSÃO DE RESPOSTAS
+    # ==================
+    # Listas de tarefas e Swagger saem comprimidos (gzip/brotli) quando o cliente aceita
+    init_compressao(app)
+
     # ==================
     # 5. CONFIGURAR SWAGGER (Flask-RESTX)
     # ==================
@@ -361,6 +1074,10 @@ def create_app(config_class='config.DevelopmentConfig'):
         'tarefas', description='Operações relacionadas a tarefas',
         decorators=[jwt_required()]
     )
+    ns_admin = api.namespace(
+        'admin', description='Diagnóstico de produção (ADMIN_EMAILS)',
+        decorators=[jwt_required()]
+    )
 
     modelo_registro = ns_auth.model('Registro', {
         'email': fields.String(required=True, description='Email para novo usuário'),
@@ -376,7 +1093,10 @@ def create_app(config_class='config.DevelopmentConfig'):
         'id': fields.Integer(readOnly=True),
         'descricao': fields.String,
         'concluida': fields.Boolean,
-        'prioridade': fields.String
+        'prioridade': fields.String,
+        'versao': fields.Integer(readOnly=True, description='Versão (mesmo valor do ETag)'),
+        'arquivada': fields.Boolean(readOnly=True, default=False,
+                                    description='Concluída antiga, lida de tarefa_arquivada'),
     })
 
     modelo_tarefa_input = ns_tarefas.model('TarefaInput', {
@@ -400,17 +1120,19 @@ def create_app(config_class='config.DevelopmentConfig'):
         @ns_auth.response(409, 'Este email já está em uso')
         def post(self):
             """Registra um novo usuário."""
-            dados = request.get_json()
-            email = dados.get('email')
-            senha = dados.get('senha')
-
-            if Usuario.query.filter_by(email=email).first():
-                return {'erro': 'Este email já está em uso'}, 409
+            try:
+                with rastros.span('pydantic.validar', schema='RegistroSchema'):
+                    registro = validar_corpo(RegistroSchema)
+            except ValidationError as e:
+                abortar_validacao(e)
+            email, senha = registro.email, registro.senha
 
-            senha_hash = bcrypt.generate_password_hash(senha).decode('utf-8')
-            novo_usuario = Usuario(email=email, senha=senha_hash)
-            db.session.add(novo_usuario)
+            with rastros.span('bcrypt.gerar_hash'):
+                senha_hash = bcrypt.generate_password_hash(senha).decode('utf-8')
+            novo_id = inserir_usuario(email, senha_hash)
             db.session.commit()
+            if novo_id is None:
+                return {'erro': 'Este email já está em uso'}, 409
             return {'mensagem': 'Usuário criado com sucesso!'}, 201
 
     @ns_auth.route('/login')
@@ -418,25 +1140,46 @@ def create_app(config_class='config.DevelopmentConfig'):
         @ns_auth.expect(modelo_login)
         def post(self):
             """Autentica um usuário e retorna um token JWT."""
-            dados = request.get_json()
-            email = dados.get('email')
-            senha = dados.get('senha')
-            usuario = Usuario.query.filter_by(email=email).first()
+            try:
+                with rastros.span('pydantic.validar', schema='LoginSchema'):
+                    login = validar_corpo(LoginSchema)
+            except ValidationError as e:
+                abortar_validacao(e)
+            email, senha = login.email, login.senha
+            usuario = Usuario.query.filter(filtro_email(email)).first()
 
-            if not usuario or not bcrypt.check_password_hash(usuario.senha, senha):
+            if not usuario:
+                return {'erro': 'Credenciais inválidas'}, 401
+            with rastros.span('bcrypt.verificar'):
+                senha_confere = bcrypt.check_password_hash(usuario.senha, senha)
+            if not senha_confere:
                 return {'erro': 'Credenciais inválidas'}, 401
 
-            access_token = create_access_token(identity=email)
+            # Identidade = email como está no banco (o digitado pode diferir na caixa)
+            # uid: o log de acesso identifica o usuário sem consultar o banco
+            access_token = create_access_token(
+                identity=usuario.email, additional_claims={'uid': usuario.id}
+            )
             return {'access_token': access_token}
 
+    @ns_auth.route('/logout')
+    class LogoutResource(Resource):
+        @ns_auth.doc(security='jwt')
+        @ns_auth.response(200, 'Token revogado')
+        @jwt_required()
+        def post(self):
+            """Revoga o token atual (ele deixa de valer em todos os workers)."""
+            payload = get_jwt()
+            app.extensions['revogacao'].revogar(payload['jti'], payload['exp'])
+            return {'mensagem': 'Logout realizado'}, 200
+
     @ns_auth.route('/me')
     class MeResource(Resource):
         @ns_auth.doc(security='jwt')
         @jwt_required()
         def get(self):
             """Retorna os dados do usuário logado (validação de token)."""
-            email = get_jwt_identity()
-            usuario = Usuario.query.filter_by(email=email).first()
+            usuario = Usuario.query.filter(filtro_usuario_logado()).first()
             
             if not usuario:
                 return {'erro': 'Usuário não encontrado'}, 404
@@ -451,75 +1194,539 @@ def create_app(config_class='config.DevelopmentConfig'):
     @ns_tarefas.route('')
     @ns_tarefas.doc(security='jwt')
     class ListaDeTarefasResource(Resource):
-        @ns_tarefas.marshal_list_with(modelo_tarefa_output)
+        @ns_tarefas.response(200, 'Lista de tarefas', [modelo_tarefa_output])
+        @ns_tarefas.doc(params={
+            'ordem': "'id' (padrão) ou 'prioridade' (alta → baixa, depois id)",
+            'incluir_arquivadas': 'true → inclui concluídas antigas (tabela de arquivo)',
+        })
         def get(self):
             """Lista todas as tarefas do usuário logado"""
-            # Obtém o email do usuário a partir do token JWT
-            email_usuario = get_jwt_identity()
-            usuario = Usuario.query.filter_by(email=email_usuario).first()
+            ordem = request.args.get('ordem', 'id')
+            if ordem not in ORDENACOES_TAREFA:
+                ns_tarefas.abort(400, f"ordem deve ser uma de: {', '.join(ORDENACOES_TAREFA)}")
+            incluir_arquivadas = request.args.get('incluir_arquivadas', 'false').lower() == 'true'
+
+            # Usuário do token JWT (claim uid; tokens antigos → email sem caixa)
+            usuario = Usuario.query.filter(filtro_usuario_logado()).first()
             
             if not usuario:
                 return {'erro': 'Usuário não encontrado'}, 404
             
-            # Retorna apenas as tarefas do usuário logado
-            return Tarefa.query.filter_by(user_id=usuario.id).all()
+            # Abas simultâneas do mesmo usuário dividem UMA consulta e UM marshalling
+            # (o voo devolve a lista já serializada); seq_mudancas na chave →
+            # requisição posterior a uma escrita não reaproveita leitura antiga
+            def consultar():
+                tarefas = listar_tarefas(usuario.id, ordem, incluir_arquivadas)
+                with rastros.span('restx.marshal'):
+                    return marshal(tarefas, modelo_tarefa_output)
+
+            chave = ('GET /tarefas', usuario.id, usuario.seq_mudancas, ordem, incluir_arquivadas)
+            tarefas = leituras.executar(chave, consultar)
+
+            # Leitura após escrita: aplica PUTs coalescidos que ainda não foram gravados
+            sobrepostas = escritas.sobrepor_lista(usuario.id, tarefas)
+            if sobrepostas is not tarefas:
+                # Só as tarefas alteradas passam pelo marshal de novo
+                sobrepostas = [
+                    nova if nova is original else marshal(nova, modelo_tarefa_output)
+                    for nova, original in zip(sobrepostas, tarefas)
+                ]
+                if ordem == 'prioridade':
+                    # Prioridade pendente pode ter mudado: reordena só neste caso
+                    sobrepostas.sort(key=lambda t: (-PrioridadeEnum(t['prioridade']).codigo, t['id']))
+            return sobrepostas
 
         @ns_tarefas.expect(modelo_tarefa_input)
-        @ns_tarefas.marshal_with(modelo_tarefa_output, code=201)
+        @ns_tarefas.doc(params={
+            'Idempotency-Key': {'in': 'header', 'description': 'Repetir com a mesma chave devolve a 1ª resposta'},
+        })
+        @ns_tarefas.response(409, 'Requisição com esta Idempotency-Key ainda em andamento')
+        @ns_tarefas.response(422, 'Idempotency-Key já usada com outro corpo')
+        @idempotencia.idempotente
+        @rastros.marshal_rastreado(ns_tarefas.marshal_with(modelo_tarefa_output, code=201))
         def post(self):
             """Cria uma nova tarefa para o usuário logado"""
-            dados = api.payload
             try:
-                tarefa_validada = TarefaCreateSchema(**dados)
+                with rastros.span('pydantic.validar', schema='TarefaCreateSchema'):
+                    tarefa_validada = validar_corpo(TarefaCreateSchema)
             except ValidationError as e:
-                return {"erros": e.errors()}, 400
+                abortar_validacao(e)
 
             # Obtém o ID do usuário logado
-            email_usuario = get_jwt_identity()
-            usuario = Usuario.query.filter_by(email=email_usuario).first()
+            usuario = Usuario.query.filter(filtro_usuario_logado()).first()
             
             if not usuario:
                 return {'erro': 'Usuário não encontrado'}, 404
 
-            # Cria a tarefa associada ao usuário
-            nova_tarefa = Tarefa(**tarefa_validada.model_dump(), user_id=usuario.id)
+            # Cria a tarefa associada ao usuário (registrada no feed de mudanças)
+            db.session.execute(registrar_mudanca(Usuario.id == usuario.id))
+            nova_tarefa = Tarefa(
+                **tarefa_validada.model_dump(),
+                user_id=usuario.id,
+                seq=select(Usuario.seq_mudancas).where(Usuario.id == usuario.id).scalar_subquery(),
+            )
             db.session.add(nova_tarefa)
             db.session.commit()
+            notificacoes.publicar(usuario.id)
             return nova_tarefa, 201
 
     @ns_tarefas.route('/<int:id>')
     @ns_tarefas.doc(security='jwt', params={'id': 'O ID da Tarefa'})
+    @ns_tarefas.response(404, 'Tarefa não encontrada')
     class TarefaResource(Resource):
-        @ns_tarefas.marshal_with(modelo_tarefa_output)
+        # 🎯 UM COMANDO SQL POR REQUISIÇÃO, SEMPRE FILTRADO PELO DONO
+        # Antes: get_or_404(id) + setattr + commit → 2 idas ao banco e QUALQUER
+        # usuário podia alterar/deletar a tarefa de outro (só bastava saber o id).
+        # Agora: WHERE id = :id AND user_id = <dono do token> em um único comando.
+        # Tarefa de outro usuário e tarefa inexistente → mesmo 404 (não vaza existência).
+        #
+        # 🔒 CONCORRÊNCIA OTIMISTA (ETag / If-Match)
+        # Duas abas editam a mesma tarefa: sem controle, a última escrita apaga a outra.
+        # GET devolve ETag: "<versao>". PUT/DELETE com If-Match só aplicam se a versão
+        # ainda for a mesma: UPDATE ... WHERE versao = :v (atômico, sem SELECT FOR UPDATE).
+        # Versão mudou → 412 Precondition Failed; cliente recarrega e tenta de novo.
+
+        @rastros.marshal_rastreado(ns_tarefas.marshal_with(modelo_tarefa_output))
         def get(self, id):
-            """Busca uma tarefa pelo seu ID."""
-            return Tarefa.query.get_or_404(id)
+            """Busca uma tarefa pelo seu ID (versão no cabeçalho ETag)."""
+            tarefa = db.session.execute(
+                select(*COLUNAS_TAREFA, Tarefa.user_id).where(*filtro_tarefa_do_usuario(id))
+            ).mappings().first()
+
+            if tarefa is None:
+                # Não está na tabela quente: pode ser uma concluída antiga (arquivo)
+                arquivada = db.session.execute(
+                    select(*(getattr(TarefaArquivada, c.key) for c in COLUNAS_TAREFA))
+                    .where(TarefaArquivada.id == id, TarefaArquivada.user_id == id_usuario_atual())
+                ).mappings().first()
+                if arquivada is None:
+                    ns_tarefas.abort(404, 'Tarefa não encontrada')
+                return {**arquivada, 'arquivada': True}, 200, etag_da_versao(arquivada['versao'])
+
+            if escritas.pendente(tarefa['user_id'], id):
+                # Versão final só existe depois do flush → sem ETag por enquanto
+                return escritas.sobrepor(tarefa['user_id'], dict(tarefa))
+            return dict(tarefa), 200, etag_da_versao(tarefa['versao'])
 
         @ns_tarefas.expect(modelo_tarefa_input)
-        @ns_tarefas.marshal_with(modelo_tarefa_output)
+        @rastros.marshal_rastreado(ns_tarefas.marshal_with(modelo_tarefa_output))
+        @ns_tarefas.response(412, 'A tarefa foi alterada por outra requisição (If-Match)')
         def put(self, id):
-            """Atualiza uma tarefa existente."""
-            tarefa = Tarefa.query.get_or_404(id)
-            dados = api.payload
+            """Atualiza uma tarefa existente (aceita If-Match com o ETag do GET)."""
             try:
-                dados_validados = TarefaUpdateSchema(**dados).model_dump(exclude_unset=True)
+                with rastros.span('pydantic.validar', schema='TarefaUpdateSchema'):
+                    dados_validados = validar_corpo(TarefaUpdateSchema).model_dump(
+                        mode='json', exclude_unset=True
+                    )
             except ValidationError as e:
-                return {"erros": e.errors()}, 400
+                abortar_validacao(e)
+            if 'concluida' in dados_validados:
+                # Relógio do arquivamento (ver arquivar_tarefas_concluidas)
+                dados_validados['concluida_em'] = agora_utc() if dados_validados['concluida'] else None
+
+            versoes = versoes_if_match()
+            filtro = filtro_tarefa_do_usuario(id)
+            if versoes is not None:
+                # Pré-condição precisa da versão gravada: grava PUTs coalescidos antes
+                escritas.descarregar()
+                filtro += (Tarefa.versao.in_(versoes),)
+
+            if dados_validados and escritas.ativo and versoes is None:
+                # Modo coalescência: confere o dono com um SELECT (sem commit) e deixa
+                # o flusher gravar o estado final junto com os outros PUTs da janela
+                consulta = select(*COLUNAS_TAREFA, Tarefa.user_id).where(*filtro)
+                tarefa = db.session.execute(consulta).mappings().first()
+                if tarefa is None and desarquivar_tarefa(id):
+                    db.session.commit()  # Volta para a tabela quente antes de bufferizar
+                    tarefa = db.session.execute(consulta).mappings().first()
+                if tarefa is None:
+                    ns_tarefas.abort(404, 'Tarefa não encontrada')
+
+                escritas.registrar(tarefa['user_id'], id, dados_validados)
+                return escritas.sobrepor(tarefa['user_id'], dict(tarefa))
 
-            for key, value in dados_validados.items():
-                setattr(tarefa, key, value)
+            if dados_validados:
+                # UPDATE ... WHERE id AND user_id [AND versao] RETURNING
+                # (precedido do +1 no contador de mudanças do usuário, mesma transação)
+                db.session.execute(registrar_mudanca(filtro_usuario_logado()))
+                comando = (
+                    update(Tarefa)
+                    .where(*filtro)
+                    .values(**dados_validados, versao=Tarefa.versao + 1, seq=seq_do_dono())
+                    .returning(*COLUNAS_TAREFA, Tarefa.user_id)
+                    .execution_options(synchronize_session=False)
+                )
+            else:
+                # Nada para alterar: apenas devolve o estado atual
+                comando = select(*COLUNAS_TAREFA).where(*filtro)
+
+            tarefa = db.session.execute(comando).mappings().first()
+            if tarefa is None and dados_validados and desarquivar_tarefa(id):
+                # Tarefa arquivada: restaurada na mesma transação, aplica a alteração
+                tarefa = db.session.execute(comando).mappings().first()
+            if tarefa is None:
+                db.session.rollback()
+                abortar_tarefa_nao_encontrada(id, versoes)
 
             db.session.commit()
-            return tarefa
+            if dados_validados:
+                notificacoes.publicar(tarefa['user_id'])
+            return dict(tarefa), 200, etag_da_versao(tarefa['versao'])
 
         @ns_tarefas.response(204, 'Tarefa deletada com sucesso')
+        @ns_tarefas.response(412, 'A tarefa foi alterada por outra requisição (If-Match)')
         def delete(self, id):
-            """Deleta uma tarefa."""
-            tarefa = Tarefa.query.get_or_404(id)
-            db.session.delete(tarefa)
+            """Deleta uma tarefa (soft delete: a remoção física é feita pela purga)."""
+            versoes = versoes_if_match()
+            filtro = filtro_tarefa_do_usuario(id)
+            if versoes is not None:
+                escritas.descarregar()
+                filtro += (Tarefa.versao.in_(versoes),)
+
+            db.session.execute(registrar_mudanca(filtro_usuario_logado()))
+            comando = (
+                update(Tarefa)
+                .where(*filtro)
+                .values(deleted_at=agora_utc(), versao=Tarefa.versao + 1, seq=seq_do_dono())
+                .returning(Tarefa.user_id)
+                .execution_options(synchronize_session=False)
+            )
+            user_id = db.session.execute(comando).scalar()
+            if user_id is None and desarquivar_tarefa(id):
+                # Arquivada: volta para tarefa e segue o soft delete normal (purga, feed)
+                user_id = db.session.execute(comando).scalar()
+            if user_id is None:
+                db.session.rollback()
+                abortar_tarefa_nao_encontrada(id, versoes)
+
             db.session.commit()
+            escritas.descartar(user_id, id)  # PUTs coalescidos pendentes não valem mais
+            notificacoes.publicar(user_id)
+            return '', 204
+
+    @ns_tarefas.route('/changes')
+    @ns_tarefas.doc(security='jwt', params={
+        'since': 'Cursor devolvido pela chamada anterior (0 = carga inicial)',
+        'limit': 'Máximo de mudanças na resposta (padrão e teto: FEED_LIMITE; since=0 traz tudo)',
+    })
+    class MudancasResource(Resource):
+        # 🔄 SINCRONIZAÇÃO INCREMENTAL (DELTA SYNC)
+        # Antes: o frontend baixava a lista inteira a cada atualização (1.000 tarefas
+        # para descobrir que 1 mudou). Agora: cada escrita grava tarefa.seq com o
+        # contador do usuário; o cliente guarda o último cursor e pede só o que mudou:
+        #   GET /tarefas/changes?since=42
+        #   → {"mudancas": [{"op": "upsert", "seq": 43, "tarefa": {...}},
+        #                   {"op": "delete", "seq": 44, "id": 7}],
+        #      "cursor": 44, "tem_mais": false, "resync": false}
+        # Custo: índice (user_id, seq) → proporcional ao nº de mudanças, não ao da lista.
+
+        def get(self):
+            """Lista as mudanças (criações, alterações e exclusões) após o cursor."""
+            try:
+                since = max(0, int(request.args.get('since', 0)))
+                limite = int(request.args.get('limit', app.config['FEED_LIMITE']))
+            except ValueError:
+                return {'erro': 'since e limit devem ser inteiros'}, 400
+
+            pagina = ler_mudancas(filtro_usuario_logado(), since, limite)
+            if pagina is None:
+                return {'erro': 'Usuário não encontrado'}, 404
+            return pagina
+
+    @ns_tarefas.route('/stream')
+    @ns_tarefas.doc(security='jwt', params={
+        'since': 'Cursor a partir do qual enviar mudanças (padrão: só as novas)',
+    })
+    @ns_tarefas.response(503, 'Limite de streams do servidor atingido (tente de novo)')
+    class StreamDeMudancasResource(Resource):
+        # 📡 PUSH EM VEZ DE POLLING (Server-Sent Events)
+        # A conexão fica aberta; a cada escrita commitada do usuário o servidor envia:
+        #   id: 45
+        #   event: mudancas
+        #   data: {"mudancas": [...], "cursor": 45, "tem_mais": false, "resync": false}
+        # O "id" é o cursor do feed: ao reconectar, o navegador manda Last-Event-ID e o
+        # stream continua de onde parou. Sem mudanças: ": ping" a cada
+        # EVENTOS_HEARTBEAT_SEGUNDOS (mantém proxies e balanceadores com a conexão viva).
+
+        def get(self):
+            """Stream (text/event-stream) com as mudanças das tarefas do usuário."""
+            usuario = db.session.execute(
+                select(Usuario.id, Usuario.seq_mudancas)
+                .where(filtro_usuario_logado())
+            ).first()
+            if usuario is None:
+                return {'erro': 'Usuário não encontrado'}, 404
+            try:
+                since = int(request.headers.get('Last-Event-ID') or request.args.get('since', usuario.seq_mudancas))
+            except ValueError:
+                return {'erro': 'since deve ser inteiro'}, 400
+            db.session.close()  # Não segura conexão do pool enquanto o stream estiver aberto
+
+            assinatura = notificacoes.assinar(usuario.id)
+            if assinatura is None:
+                return {'erro': 'Muitas conexões de stream abertas, tente novamente'}, 503, {'Retry-After': '5'}
+
+            resposta = Response(
+                gerar_eventos(assinatura, max(0, since)),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+            )
+            # Cliente desconectou (ou o stream terminou): libera a vaga no limite do worker
+            resposta.call_on_close(lambda: notificacoes.cancelar(assinatura))
+            return resposta
+
+    def gerar_eventos(assinatura, cursor):
+        """Gerador do stream SSE: envia o delta a cada aviso, ping quando ocioso."""
+        heartbeat = app.config['EVENTOS_HEARTBEAT_SEGUNDOS']
+        yield f"retry: {app.config['EVENTOS_RETRY_MS']}\n\n"
+
+        while not notificacoes.encerrando:
+            # Uma página por vez: o yield só retorna quando o cliente leu a anterior
+            # (cliente lento = este gerador parado, sem fila crescendo em memória)
+            with app.app_context():
+                pagina = ler_mudancas(Usuario.id == assinatura.user_id, cursor)
+            if pagina is None:
+                return  # Usuário removido
+
+            if pagina['mudancas'] or pagina['resync']:
+                evento = 'resync' if pagina['resync'] else 'mudancas'
+                cursor = pagina['cursor']
+                yield f"id: {cursor}\nevent: {evento}\ndata: {json.dumps(pagina)}\n\n"
+                if pagina['tem_mais']:
+                    continue
+            cursor = pagina['cursor']
+
+            if not assinatura.esperar(heartbeat):
+                yield ': ping\n\n'
+
+    def ler_mudancas(filtro_usuario, since, limite=None):
+        """
+        Página do feed de mudanças após o cursor (usada por /changes e /stream).
+
+        Returns:
+            dict | None: {'mudancas', 'cursor', 'tem_mais', 'resync'} ou None se
+            o usuário não existir
+        """
+        limite = min(max(1, limite or app.config['FEED_LIMITE']), app.config['FEED_LIMITE'])
+
+        # PUTs coalescidos ainda não têm seq: grava antes de ler o feed
+        if escritas.ativo:
+            escritas.descarregar()
+
+        usuario = db.session.execute(
+            select(Usuario.id, Usuario.seq_mudancas, Usuario.seq_expurgo).where(filtro_usuario)
+        ).first()
+        if usuario is None:
+            return None
+
+        if 0 < since < usuario.seq_expurgo:
+            # Exclusões depois do cursor já foram purgadas: o delta ficaria incompleto
+            return {'mudancas': [], 'cursor': usuario.seq_mudancas,
+                    'tem_mais': False, 'resync': True}
+
+        consulta = (
+            select(*COLUNAS_TAREFA, Tarefa.seq, Tarefa.deleted_at)
+            .where(Tarefa.user_id == usuario.id)
+            .order_by(Tarefa.seq, Tarefa.id)
+        )
+        if since == 0:
+            # Carga inicial: todas as ativas de uma vez, sem tombstones. Sem limite
+            # porque tarefas anteriores ao feed têm seq=0 e não teriam cursor de página
+            consulta = consulta.where(Tarefa.deleted_at.is_(None))
+            limite = None
+        else:
+            consulta = consulta.where(Tarefa.seq > since).limit(limite + 1)
+        linhas = db.session.execute(consulta).mappings().all()
+
+        tem_mais = limite is not None and len(linhas) > limite
+        linhas = linhas[:limite]
+        mudancas = [
+            {'op': 'delete', 'seq': linha['seq'], 'id': linha['id']}
+            if linha['deleted_at'] is not None else
+            {'op': 'upsert', 'seq': linha['seq'],
+             'tarefa': marshal(dict(linha), modelo_tarefa_output)}
+            for linha in linhas
+        ]
+        # Última página: cursor = contador atual (pula seqs de tarefas purgadas)
+        ultimo = linhas[-1]['seq'] if linhas else since
+        cursor = ultimo if tem_mais else max(ultimo, usuario.seq_mudancas)
+        return {'mudancas': mudancas, 'cursor': cursor,
+                'tem_mais': tem_mais, 'resync': False}
+
+    def abortar_tarefa_nao_encontrada(id, versoes):
+        """
+        Nenhuma linha casou com o WHERE: 404 ou 412?
+
+        Só neste caminho (raro) fazemos uma consulta extra para descobrir se a
+        tarefa existe. Se existe, quem falhou foi a versão do If-Match → 412.
+        """
+        if versoes is not None:
+            existe = db.session.execute(
+                select(Tarefa.id).where(*filtro_tarefa_do_usuario(id))
+                .union_all(
+                    select(TarefaArquivada.id)
+                    .where(TarefaArquivada.id == id, TarefaArquivada.user_id == id_usuario_atual())
+                )
+            ).first()
+            if existe:
+                ns_tarefas.abort(412, 'A tarefa foi alterada por outra requisição')
+        ns_tarefas.abort(404, 'Tarefa não encontrada')
+
+    # ===================================================================================
+    # Rotas administrativas (só emails listados em ADMIN_EMAILS)
+    # ===================================================================================
+
+    def exigir_admin():
+        if get_jwt_identity().lower() not in app.config['ADMIN_EMAILS']:
+            ns_admin.abort(403, 'Acesso restrito a administradores')
+
+    @ns_admin.route('/consultas-lentas')
+    @ns_admin.doc(security='jwt')
+    class ConsultasLentasResource(Resource):
+        @ns_admin.response(200, 'Consultas lentas deste worker (mais recente primeiro)')
+        @ns_admin.response(403, 'Acesso restrito a administradores')
+        def get(self):
+            """Comandos SQL acima de CONSULTAS_LENTAS_LIMIAR_MS (ring buffer do worker)."""
+            exigir_admin()
+            return {
+                'limiar_ms': app.config['CONSULTAS_LENTAS_LIMIAR_MS'],
+                'explain': app.config['CONSULTAS_LENTAS_EXPLAIN'],
+                'consultas': app.extensions['consultas_lentas'].listar(),
+            }, 200
+
+        @ns_admin.response(204, 'Buffer esvaziado')
+        def delete(self):
+            """Esvazia o buffer de consultas lentas deste worker."""
+            exigir_admin()
+            app.extensions['consultas_lentas'].limpar()
             return '', 204
 
+    @ns_admin.route('/leituras')
+    @ns_admin.doc(security='jwt')
+    class LeiturasResource(Resource):
+        @ns_admin.response(200, 'Contadores de leitura única deste worker')
+        @ns_admin.response(403, 'Acesso restrito a administradores')
+        def get(self):
+            """GET /tarefas executados x coalescidos (esperaram a consulta de outra requisição)."""
+            exigir_admin()
+            return leituras.metricas, 200
+
+    # ===================================================================================
+    # Comandos CLI
+    # ===================================================================================
+
+    @app.cli.command('manutencao')
+    def executar_manutencao():
+        """Executa os jobs de manutenção agora (purga/arquivamento/compactação).
+
+        Útil em ambientes sem threads em segundo plano (Vercel) via cron:
+            flask manutencao
+        """
+        resultados = app.extensions['manutencao'].executar(deve_continuar=lambda: True)
+        for nome, quantidade in resultados.items():
+            print(f"🧹 {nome}: {quantidade}")
+
+    @app.cli.command('seed')
+    @click.option('--usuarios', default=1000, show_default=True, help='Quantidade de usuários')
+    @click.option('--tarefas', 'media_tarefas', default=20.0, show_default=True,
+                  help='Média de tarefas por usuário')
+    @click.option('--distribuicao', type=click.Choice(DISTRIBUICOES), default='exponencial',
+                  show_default=True, help='Como as tarefas se espalham entre os usuários')
+    @click.option('--prioridades', default='baixa=50,media=35,alta=15', show_default=True,
+                  help='Pesos do sorteio de prioridade')
+    @click.option('--concluidas', default=0.3, show_default=True, help='Fração de tarefas concluídas')
+    @click.option('--excluidas', default=0.0, show_default=True, help='Fração de tarefas excluídas (soft delete)')
+    @click.option('--dias', default=90, show_default=True, help='Idade máxima de concluida_em (dias)')
+    @click.option('--seed', default=42, show_default=True, help='Semente do gerador (mesma seed = mesmos dados)')
+    @click.option('--prefixo', default='seed', show_default=True, help='Prefixo dos emails gerados')
+    @click.option('--senha', default='senha123', show_default=True, help='Senha de todos os usuários')
+    @click.option('--lote', default=1000, show_default=True, help='Usuários por COPY/INSERT')
+    def semear_dados(usuarios, media_tarefas, distribuicao, prioridades, concluidas, excluidas,
+                     dias, seed, prefixo, senha, lote):
+        """Gera usuários e tarefas sintéticos em massa (benchmark/staging).
+
+            flask seed --usuarios 100000 --tarefas 30
+        """
+        try:
+            pesos = interpretar_prioridades(prioridades)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--prioridades')
+
+        # bcrypt UMA vez: todos os usuários gerados compartilham o mesmo hash
+        senha_hash = bcrypt.generate_password_hash(senha).decode('utf-8')
+        semeador = Semeador(db, Usuario.__table__, Tarefa.__table__, senha_hash, agora_utc())
+        print(f"🌱 Gerando {usuarios:,} usuários (seed={seed})...")
+        resultado = semeador.semear(
+            usuarios, media_tarefas, distribuicao=distribuicao, prioridades=pesos,
+            concluidas=concluidas, excluidas=excluidas, dias=dias, seed=seed,
+            prefixo=prefixo, lote=lote,
+        )
+        linhas = resultado['usuarios'] + resultado['tarefas']
+        segundos = resultado['segundos']
+        print(
+            f"✅ {resultado['usuarios']:,} usuários + {resultado['tarefas']:,} tarefas"
+            f" em {segundos:.1f}s ({linhas / segundos if segundos else 0:,.0f} linhas/s)"
+        )
+
+    # flask admin ... → consultas de operação que funcionam em tabela de produção:
+    # contagem/agrupamento feitos no banco (COUNT, GROUP BY) e listagens em
+    # stream (yield_per = lotes do cursor, memória constante). Usa o mesmo
+    # config da app carregada (FLASK_APP=run:app + FLASK_ENV).
+    admin = AppGroup('admin', help='Consultas administrativas (memória constante).')
+    app.cli.add_command(admin)
+
+    def transmitir(consulta, lote):
+        """Executa a consulta lendo o cursor em lotes (PostgreSQL: cursor no servidor)."""
+        return db.session.execute(consulta.execution_options(yield_per=lote))
+
+    def contagem_ativas():
+        return (
+            select(Tarefa.user_id, db.func.count().label('ativas'))
+            .where(Tarefa.deleted_at.is_(None))
+            .group_by(Tarefa.user_id)
+        )
+
+    @admin.command('contar-usuarios')
+    def contar_usuarios():
+        """Quantidade de usuários (SELECT COUNT(*), sem carregar linhas)."""
+        total = db.session.execute(select(db.func.count()).select_from(Usuario)).scalar()
+        print(f"👥 Usuários: {total:,}")
+
+    @admin.command('listar-usuarios')
+    @click.option('--lote', default=1000, show_default=True, help='Linhas lidas do cursor por vez')
+    @click.option('--limite', type=int, default=None, help='Máximo de usuários listados')
+    def listar_usuarios(lote, limite):
+        """Lista id e email de todos os usuários, em ordem de id (stream)."""
+        consulta = select(Usuario.id, Usuario.email).order_by(Usuario.id).limit(limite)
+        for id, email in transmitir(consulta, lote):
+            print(f"{id}\t{email}")
+
+    @admin.command('tarefas-por-usuario')
+    @click.option('--lote', default=1000, show_default=True, help='Linhas lidas do cursor por vez')
+    def tarefas_por_usuario(lote):
+        """Tarefas ativas de cada usuário (GROUP BY no banco, stream do resultado)."""
+        contagem = contagem_ativas().subquery()
+        consulta = (
+            select(Usuario.id, Usuario.email, db.func.coalesce(contagem.c.ativas, 0))
+            .outerjoin(contagem, contagem.c.user_id == Usuario.id)
+            .order_by(Usuario.id)
+        )
+        for id, email, ativas in transmitir(consulta, lote):
+            print(f"{id}\t{email}\t{ativas}")
+
+    @admin.command('top-usuarios')
+    @click.option('-n', '--quantidade', default=10, show_default=True, help='Tamanho do ranking')
+    def top_usuarios(quantidade):
+        """Usuários com mais tarefas ativas (ORDER BY ... LIMIT N no banco)."""
+        contagem = contagem_ativas().order_by(db.desc('ativas')).limit(quantidade).subquery()
+        consulta = (
+            select(Usuario.email, contagem.c.ativas)
+            .join(contagem, contagem.c.user_id == Usuario.id)
+            .order_by(contagem.c.ativas.desc(), Usuario.id)
+        )
+        for posicao, (email, ativas) in enumerate(db.session.execute(consulta), 1):
+            print(f"{posicao:>3}. {email}\t{ativas:,}")
+
     # 🗃️ INICIALIZAÇÃO DAS TABELAS NO BANCO
     # Simplificado para serverless - cria tabelas de forma rápida
     
@@ -527,39 +1734,54 @@ def create_app(config_class='config.DevelopmentConfig'):
         """Inicializa banco de dados de forma simples e rápida."""
         with app.app_context():
             try:
-                print("🔄 Conectando no banco de dados...")
+                logger.info("Conectando no banco de dados...")
                 
                 # Testa conexão (SQLAlchemy 2.0 syntax)
                 from sqlalchemy import text
                 with db.engine.connect() as connection:
                     connection.execute(text('SELECT 1'))
                     
-                print("✅ Conexão estabelecida!")
+                logger.info("Conexão com o banco estabelecida")
                 
                 # Cria tabelas
                 db.create_all()
-                print("✅ Tabelas criadas com sucesso!")
+                logger.info("Tabelas criadas")
                 return True
                     
             except Exception as e:
-                print(f"⚠️ Erro ao conectar no banco: {e}")
-                print("💡 App vai iniciar sem banco. Tabelas serão criadas na primeira requisição.")
+                logger.warning(
+                    "Erro ao conectar no banco: %s. App vai iniciar sem banco;"
+                    " tabelas serão criadas na primeira requisição.", e
+                )
                 return False
     
     # Tenta inicializar (não bloqueia se falhar)
     try:
         init_database()
     except Exception as e:
-        print(f"⚠️  Erro na inicialização do banco: {e}")
-        print("🚀 App vai iniciar mesmo assim - modo degradado.")
+        logger.warning("Erro na inicialização do banco: %s. Iniciando em modo degradado.", e)
     
     return app
 
 # ===================================================================================
 # 🌍 INSTANCIAR APP PARA USO DIRETO
 # ===================================================================================
-# Cria instância padrão da aplicação para uso fora do factory pattern
-app = create_app()
+# Instância padrão para uso fora do factory pattern (gunicorn app:app,
+# flask --app app), criada só no PRIMEIRO acesso a app.app (PEP 562).
+# Importar app.py (run.py, api/index.py, testes) não tem efeito colateral:
+# nenhuma conexão ao banco, create_all() ou extensão iniciada na importação, e
+# quem monta a própria app com create_app() não ganha uma segunda de brinde.
+_app_padrao = None
+
+
+def __getattr__(nome):
+    global _app_padrao
+    if nome != 'app':
+        raise AttributeError(f'module {__name__!r} has no attribute {nome!r}')
+    if _app_padrao is None:
+        _app_padrao = create_app()
+    return _app_padrao
+
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,119 @@
+# ===================================================================================
+# 🎟️ CACHE DE TOKENS JWT JÁ VERIFICADOS
+# ===================================================================================
+# Cada requisição de uma mesma aba manda o MESMO access token. Sem cache, toda
+# requisição refaz: base64 + json do payload, lookup da chave, HMAC da assinatura
+# e validação de exp/nbf/iat → trabalho idêntico repetido centenas de vezes.
+#
+# A SOLUÇÃO:
+# ----------
+# JWTManagerComCache sobrescreve o ponto onde o Flask-JWT-Extended decodifica o
+# token (_decode_jwt_from_config). Se o token já foi verificado neste worker,
+# devolve as claims guardadas; senão decodifica normalmente e guarda.
+#
+# - Chave do cache: SHA-256 do token (não guarda o token em si na memória)
+# - Validade da entrada: até o exp do token (depois disso o cache não responde)
+# - Tamanho limitado: LRU com JWT_CACHE_MAX_TOKENS entradas
+#
+# O QUE CONTINUA VALENDO:
+# -----------------------
+# - Revogação (logout): a blocklist é checada DEPOIS da decodificação, em toda
+#   requisição → token revogado é recusado mesmo estando no cache.
+# - Troca de chave: cada entrada lembra a chave que a verificou; se
+#   JWT_SECRET_KEY mudar, a entrada é descartada e o token é verificado de novo
+#   (e recusado, se foi assinado com a chave antiga).
+# - get_jwt_identity()/get_jwt() leem as claims que saíram daqui.
+#
+# Opt-in: JWT_CACHE_ATIVO=true (config.py). Desligado, é o JWTManager normal.
+#
+# 🎯 DESIGN PATTERN: CACHE (memoization de verificação)
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from flask_jwt_extended import JWTManager
+from flask_jwt_extended.config import config
+from flask_jwt_extended.default_callbacks import default_decode_key_callback
+
+
+class JWTManagerComCache(JWTManager):
+    """
+    JWTManager que reaproveita tokens já verificados (por worker, por app).
+
+    Tokens com CSRF, sem exp ou decodificados com allow_expired sempre passam
+    pelo caminho normal. Com decode_key_loader customizado (chave por token) o
+    cache fica desligado: não dá para saber a chave sem abrir o token.
+    """
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor)
+        app.extensions['cache_tokens'] = CacheDeTokens(app.config['JWT_CACHE_MAX_TOKENS'])
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        if (
+            csrf_value
+            or allow_expired
+            or not current_app.config['JWT_CACHE_ATIVO']
+            or self._decode_key_callback is not default_decode_key_callback
+        ):
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        cache = current_app.extensions['cache_tokens']
+        chave = config.decode_key
+        claims = cache.obter(encoded_token, chave)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            cache.guardar(encoded_token, chave, claims)
+        return claims
+
+
+class CacheDeTokens:
+    """LRU digest do token → (claims, chave de verificação, exp)."""
+
+    def __init__(self, max_tokens):
+        self.max_tokens = max_tokens
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    @staticmethod
+    def _digest(token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def obter(self, token, chave):
+        digest = self._digest(token)
+        with self._lock:
+            entrada = self._entradas.get(digest)
+            if entrada is not None:
+                claims, chave_usada, expira_em = entrada
+                if chave_usada == chave and time.time() < expira_em:
+                    self._entradas.move_to_end(digest)
+                    self.acertos += 1
+                    # Cópia rasa: quem usa as claims não altera o que está no cache
+                    return dict(claims)
+                del self._entradas[digest]  # Expirou ou a chave mudou
+            self.falhas += 1
+        return None
+
+    def guardar(self, token, chave, claims):
+        expira_em = claims.get('exp')
+        if not isinstance(expira_em, (int, float)) or self.max_tokens <= 0:
+            return  # Token sem exp: sem prazo para confiar na verificação antiga
+        digest = self._digest(token)
+        with self._lock:
+            self._entradas[digest] = (dict(claims), chave, expira_em)
+            self._entradas.move_to_end(digest)
+            while len(self._entradas) > self.max_tokens:
+                self._entradas.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    @property
+    def tamanho(self):
+        return len(self._entradas)
@@ -0,0 +1,292 @@
+# ===================================================================================
+# 🔀 COALESCÊNCIA DE ESCRITAS (PUT /tarefas/<id> em rajada)
+# ===================================================================================
+# Agrupa várias atualizações da MESMA tarefa feitas em sequência rápida e grava
+# tudo de uma vez, em uma única transação, por uma thread em segundo plano.
+#
+# O PROBLEMA:
+# -----------
+# Usuário clica no checkbox 6 vezes em 2 segundos:
+#   PUT {"concluida": true}  → UPDATE + COMMIT (fsync no disco do banco)
+#   PUT {"concluida": false} → UPDATE + COMMIT
+#   ... 6 commits para chegar no mesmo estado final.
+#
+# COM COALESCÊNCIA (COALESCENCIA_ATIVA=true):
+# -------------------------------------------
+#   PUT → valida, confere o dono (SELECT) e guarda o campo em memória → responde
+#   A cada COALESCENCIA_JANELA_MS, o flusher grava o ESTADO FINAL de todas as
+#   tarefas pendentes em UMA transação (executemany agrupado por campos).
+#
+# CONSISTÊNCIA:
+# -------------
+# ✅ Leitura após escrita no MESMO processo: GET e listagem aplicam as alterações
+#    pendentes por cima do que veio do banco (sobrepor()).
+# ⚠️ Outros workers enxergam a alteração só depois do flush (até 1 janela).
+# ✅ Shutdown: parar() drena o que estiver pendente antes de sair (atexit e
+#    hook worker_exit do Gunicorn).
+#
+# 🎯 DESIGN PATTERN: WRITE-BEHIND (WRITE-BACK) BUFFER
+
+import atexit
+import os
+import threading
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import DataError, IntegrityError
+
+
+class CoalescedorDeEscritas:
+    """
+    Extensão Flask: buffer de escrita por aplicação (ver comentário do módulo).
+
+    Args (init_app):
+        tabela: Tabela atualizada (precisa das colunas id, user_id e deleted_at)
+        valores_extras: função → dict de expressões SQL somadas a todo UPDATE
+            (ex: {'versao': tabela.c.versao + 1}). Cada linha do executemany
+            traz bindparam('b_recuo'): quantas tarefas do MESMO usuário vêm
+            depois dela no lote (0 na última)
+        antes_de_gravar: função({user_id: quantidade}) executada na MESMA
+            transação antes dos UPDATEs (ex: avançar o contador do usuário em
+            uma unidade por tarefa, para cada linha ganhar o próprio seq)
+        depois_de_gravar: função(user_ids) executada após o COMMIT
+            (ex: avisar os streams de eventos)
+    """
+
+    def init_app(self, app, db, tabela, valores_extras=None, antes_de_gravar=None,
+                 depois_de_gravar=None):
+        estado = _EstadoCoalescencia(
+            app, db, tabela, valores_extras, antes_de_gravar, depois_de_gravar
+        )
+        app.extensions['coalescencia'] = estado
+        atexit.register(estado.parar)
+
+
+class _EstadoCoalescencia:
+    """Alterações pendentes de uma aplicação e a thread que as grava."""
+
+    def __init__(self, app, db, tabela, valores_extras=None, antes_de_gravar=None,
+                 depois_de_gravar=None):
+        self.app = app
+        self.db = db
+        self.tabela = tabela
+        self.valores_extras = valores_extras or dict
+        self.antes_de_gravar = antes_de_gravar or (lambda user_ids: None)
+        self.depois_de_gravar = depois_de_gravar or (lambda user_ids: None)
+        # {user_id: {tarefa_id: {campo: valor}}} → busca por usuário é O(1) na listagem
+        self._pendentes = {}
+        # Lote sendo gravado agora: continua visível para leituras até o COMMIT
+        self._em_gravacao = {}
+        self._lock = threading.Lock()
+        # Um flush por vez: flusher, /changes e PUT/DELETE com If-Match chamam
+        # descarregar() em paralelo; sem isso um sobrescreveria (ou limparia) o
+        # _em_gravacao do outro e o lote dele sumiria das leituras até o COMMIT
+        self._lock_gravacao = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    @property
+    def ativo(self):
+        return bool(self.app.config.get('COALESCENCIA_ATIVA'))
+
+    # -------------------------------------------------------------------------
+    # API usada pelos endpoints
+    # -------------------------------------------------------------------------
+    def registrar(self, user_id, tarefa_id, campos):
+        """Mescla campos na alteração pendente da tarefa (o valor mais novo vence)."""
+        with self._lock:
+            self._pendentes.setdefault(user_id, {}).setdefault(tarefa_id, {}).update(campos)
+        self._iniciar_se_necessario()
+
+    def _pendentes_do_usuario(self, user_id):
+        """Alterações ainda não commitadas do usuário (em gravação + pendentes)."""
+        pendentes = {
+            tarefa_id: dict(campos)
+            for tarefa_id, campos in self._em_gravacao.get(user_id, {}).items()
+        }
+        for tarefa_id, campos in self._pendentes.get(user_id, {}).items():
+            pendentes.setdefault(tarefa_id, {}).update(campos)
+        return pendentes
+
+    def pendente(self, user_id, tarefa_id):
+        """True se a tarefa tem alterações ainda não commitadas."""
+        with self._lock:
+            return (
+                tarefa_id in self._pendentes.get(user_id, {})
+                or tarefa_id in self._em_gravacao.get(user_id, {})
+            )
+
+    def sobrepor(self, user_id, tarefa):
+        """Retorna a tarefa (dict) com as alterações pendentes aplicadas."""
+        return self.sobrepor_lista(user_id, [tarefa])[0]
+
+    def sobrepor_lista(self, user_id, tarefas):
+        """Aplica as alterações pendentes em uma lista de tarefas (dicts)."""
+        with self._lock:
+            pendentes = self._pendentes_do_usuario(user_id)
+        if not pendentes:
+            return tarefas
+        return [
+            {**tarefa, **pendentes[tarefa['id']]} if tarefa['id'] in pendentes else tarefa
+            for tarefa in tarefas
+        ]
+
+    def descartar(self, user_id, tarefa_id):
+        """Esquece alterações pendentes (tarefa excluída)."""
+        with self._lock:
+            self._pendentes.get(user_id, {}).pop(tarefa_id, None)
+            self._em_gravacao.get(user_id, {}).pop(tarefa_id, None)
+
+    # -------------------------------------------------------------------------
+    # Flush em lote
+    # -------------------------------------------------------------------------
+    def descarregar(self):
+        """
+        Grava todas as alterações pendentes em UMA transação.
+
+        Agrupa por conjunto de campos para usar executemany:
+            {concluida}            → 1 UPDATE com N linhas de parâmetros
+            {descricao, prioridade} → outro UPDATE com M linhas
+        Se o banco falhar, devolve o lote ao buffer (sem sobrescrever
+        alterações que chegaram durante a tentativa).
+
+        Chamadas simultâneas são serializadas: quem chega durante um flush
+        espera ele terminar (e então grava o que sobrou), então ao retornar
+        tudo que estava pendente na chamada já foi commitado.
+
+        Returns:
+            int: Quantidade de tarefas gravadas
+        """
+        with self._lock_gravacao:
+            return self._descarregar()
+
+    def _descarregar(self):
+        grupos = {}
+        with self._lock:
+            lote, self._pendentes = self._pendentes, {}
+            self._em_gravacao = lote
+            for user_id, tarefas in lote.items():
+                for recuo, (tarefa_id, campos) in enumerate(reversed(tarefas.items())):
+                    parametros = {'b_id': tarefa_id, 'b_user_id': user_id, 'b_recuo': recuo}
+                    parametros.update({f'v_{campo}': valor for campo, valor in campos.items()})
+                    grupos.setdefault(frozenset(campos), []).append(parametros)
+            if not grupos:
+                self._em_gravacao = {}
+                return 0
+
+        with self.app.app_context():
+            try:
+                self.antes_de_gravar({user_id: len(tarefas) for user_id, tarefas in lote.items()})
+                for campos, parametros in grupos.items():
+                    self.db.session.execute(self._comando(campos), parametros)
+                self.db.session.commit()
+                gravadas = sum(len(parametros) for parametros in grupos.values())
+            except (IntegrityError, DataError):
+                # Dado inválido em alguma tarefa: grava uma a uma e descarta só a ruim
+                self.db.session.rollback()
+                gravadas = self._gravar_individualmente(grupos, lote)
+            except Exception as e:
+                # Banco indisponível: devolve o lote para a próxima janela
+                self.db.session.rollback()
+                self._devolver(lote)
+                self.app.logger.warning('Falha ao gravar escritas coalescidas: %s', e)
+                return 0
+            finally:
+                with self._lock:
+                    self._em_gravacao = {}
+        self.depois_de_gravar(list(lote))
+        return gravadas
+
+    def _comando(self, campos):
+        """UPDATE parametrizado (executemany) para um conjunto de campos."""
+        t = self.tabela.c
+        return (
+            update(self.tabela)
+            .where(
+                t.id == bindparam('b_id'),
+                t.user_id == bindparam('b_user_id'),
+                t.deleted_at.is_(None),
+            )
+            .values({
+                **{campo: bindparam(f'v_{campo}') for campo in campos},
+                **self.valores_extras(),
+            })
+        )
+
+    def _gravar_individualmente(self, grupos, lote):
+        """
+        Uma transação por tarefa. Dado inválido descarta só aquela tarefa; se o
+        banco falhar no meio (ex: conexão caiu), o que ainda não foi gravado
+        volta para o buffer, como no flush em lote.
+
+        Returns:
+            int: Quantidade de tarefas gravadas
+        """
+        gravadas, resolvidas = 0, set()
+        for campos, parametros in grupos.items():
+            comando = self._comando(campos)
+            for linha in parametros:
+                try:
+                    self.antes_de_gravar({linha['b_user_id']: 1})
+                    self.db.session.execute(comando, {**linha, 'b_recuo': 0})
+                    self.db.session.commit()
+                    gravadas += 1
+                except (IntegrityError, DataError) as e:
+                    self.db.session.rollback()
+                    self.app.logger.warning('Escrita coalescida descartada (tarefa %s): %s', linha['b_id'], e)
+                except Exception as e:
+                    self.db.session.rollback()
+                    self._devolver({
+                        user_id: {
+                            tarefa_id: campos_pendentes
+                            for tarefa_id, campos_pendentes in tarefas.items()
+                            if (user_id, tarefa_id) not in resolvidas
+                        }
+                        for user_id, tarefas in lote.items()
+                    })
+                    self.app.logger.warning('Falha ao gravar escritas coalescidas: %s', e)
+                    return gravadas
+                resolvidas.add((linha['b_user_id'], linha['b_id']))
+        return gravadas
+
+    def _devolver(self, lote):
+        with self._lock:
+            self._em_gravacao = {}
+            for user_id, tarefas in lote.items():
+                if not tarefas:
+                    continue
+                pendentes_usuario = self._pendentes.setdefault(user_id, {})
+                for tarefa_id, campos in tarefas.items():
+                    pendentes_usuario[tarefa_id] = {**campos, **pendentes_usuario.get(tarefa_id, {})}
+
+    # -------------------------------------------------------------------------
+    # Ciclo de vida da thread (criada por worker, depois do fork)
+    # -------------------------------------------------------------------------
+    def _iniciar_se_necessario(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._parar.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name='coalescencia', daemon=True
+            )
+            self._thread.start()
+
+    def _loop(self):
+        janela = self.app.config['COALESCENCIA_JANELA_MS'] / 1000
+        while not self._parar.wait(janela):
+            try:
+                self.descarregar()
+            except Exception:
+                # Thread morta = PUTs parados no buffer até o shutdown: registra e segue
+                self.app.logger.exception('Erro no flush de escritas coalescidas')
+
+    def parar(self, timeout=5):
+        """Para o flusher e drena o que estiver pendente (shutdown limpo)."""
+        self._parar.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
+        self.descarregar()
@@ -0,0 +1,176 @@
+# ===================================================================================
+# 🗜️ COMPRESSÃO DE RESPOSTAS HTTP (gzip + brotli)
+# ===================================================================================
+# Comprime respostas grandes (listas de tarefas, Swagger, arquivos da documentação)
+# antes de enviá-las ao cliente.
+#
+# POR QUE COMPRIMIR?
+# ------------------
+# JSON é texto repetitivo: {"id": 1, "descricao": ..., "concluida": false, ...}
+# Uma lista com 1.000 tarefas (~80 KB) vira ~8 KB com gzip.
+# Em conexões móveis lentas, isso é a diferença entre 2s e 200ms.
+#
+# COMO FUNCIONA (NEGOCIAÇÃO DE CONTEÚDO):
+# ---------------------------------------
+# 1. Cliente envia: Accept-Encoding: gzip, deflate, br
+# 2. Servidor escolhe o melhor algoritmo suportado pelos dois (br > gzip)
+# 3. Servidor responde com: Content-Encoding: br  +  Vary: Accept-Encoding
+# 4. Navegador descomprime automaticamente (transparente para o JavaScript)
+#
+# QUANDO NÃO COMPRIMIR:
+# ---------------------
+# ❌ Respostas pequenas (< COMPRESS_MIN_SIZE): o cabeçalho gzip custa mais do que economiza
+# ❌ Respostas já comprimidas (Content-Encoding definido, imagens, zip)
+# ❌ Streams (SSE, downloads longos), a menos que COMPRESS_STREAMS=True
+# ❌ 204 No Content, 304 Not Modified, requisições HEAD e respostas parciais (Range)
+#
+# BROTLI É OPCIONAL:
+# ------------------
+# pip install brotli → habilita 'br' (~20% menor que gzip para JSON)
+# Sem a biblioteca, apenas gzip é oferecido (stdlib, sempre disponível).
+
+import gzip
+import zlib
+from collections import OrderedDict
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # Dependência opcional
+    brotli = None
+
+
+# Cache de arquivos estáticos já comprimidos (JS/CSS do Swagger UI).
+# Chave: (caminho, etag, codificação) → bytes comprimidos
+# Limitado para não crescer sem fim (LRU simples com OrderedDict).
+_cache_estaticos = OrderedDict()
+_CACHE_ESTATICOS_MAX = 64
+
+
+def codificacoes_suportadas():
+    """Retorna os algoritmos disponíveis em ordem de preferência."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def escolher_codificacao(accept_encodings):
+    """
+    Escolhe a melhor codificação aceita pelo cliente.
+
+    Usa os pesos (q-values) do Accept-Encoding; em caso de empate,
+    prefere brotli (comprime mais) a gzip.
+
+    EXEMPLOS:
+    ---------
+    'gzip, br'          → 'br' (se brotli instalado)
+    'gzip;q=1, br;q=0.5' → 'gzip'
+    'identity'          → None (sem compressão)
+    'br;q=0'            → None (cliente recusa explicitamente)
+    """
+    melhor, melhor_q = None, 0
+    for codificacao in codificacoes_suportadas():
+        q = accept_encodings.quality(codificacao)
+        if q > melhor_q:
+            melhor, melhor_q = codificacao, q
+    return melhor
+
+
+def comprimir(dados, codificacao, config):
+    """Comprime bytes com o algoritmo escolhido e o nível configurado."""
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=config['COMPRESS_BR_LEVEL'])
+    return gzip.compress(dados, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+
+def _comprimir_stream(iteravel, codificacao, config):
+    """
+    Comprime um stream pedaço por pedaço.
+
+    Cada pedaço é "descarregado" (flush) imediatamente para que o cliente
+    receba os eventos sem esperar o buffer do compressor encher (importante
+    para Server-Sent Events).
+    """
+    if codificacao == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BR_LEVEL'])
+        for pedaco in iteravel:
+            yield compressor.process(pedaco) + compressor.flush()
+        yield compressor.finish()
+    else:
+        # wbits=31 → formato gzip (16) + janela de 32 KB (15)
+        compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+        for pedaco in iteravel:
+            yield compressor.compress(pedaco) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+def _corpo_estatico_comprimido(response, codificacao, config):
+    """Comprime arquivo estático (send_file) usando o cache por ETag."""
+    etag, _ = response.get_etag()
+    chave = (request.path, etag, codificacao)
+    if etag and chave in _cache_estaticos:
+        _cache_estaticos.move_to_end(chave)
+        response.response.close()  # Não vamos ler o arquivo: libera o descritor
+        return _cache_estaticos[chave]
+
+    response.direct_passthrough = False  # Permite ler o arquivo com get_data()
+    comprimido = comprimir(response.get_data(), codificacao, config)
+
+    if etag:
+        _cache_estaticos[chave] = comprimido
+        if len(_cache_estaticos) > _CACHE_ESTATICOS_MAX:
+            _cache_estaticos.popitem(last=False)
+    return comprimido
+
+
+def comprimir_resposta(response):
+    """Hook after_request: comprime a resposta se valer a pena."""
+    config = current_app.config
+    if not config.get('COMPRESS_ENABLED', True):
+        return response
+
+    if response.mimetype not in config['COMPRESS_MIMETYPES']:
+        return response
+
+    # A resposta varia conforme Accept-Encoding → caches/CDNs precisam saber disso
+    response.vary.add('Accept-Encoding')
+
+    if (
+        request.method == 'HEAD'
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+
+    codificacao = escolher_codificacao(request.accept_encodings)
+    if codificacao is None:
+        return response
+
+    if response.direct_passthrough:
+        # Arquivos estáticos (send_file): tamanho conhecido pelo Content-Length
+        if (response.content_length or 0) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(_corpo_estatico_comprimido(response, codificacao, config))
+    elif response.is_streamed:
+        if not config['COMPRESS_STREAMS']:
+            return response
+        response.response = _comprimir_stream(response.response, codificacao, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        dados = response.get_data()
+        if len(dados) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(comprimir(dados, codificacao, config))
+
+    response.headers['Content-Encoding'] = codificacao
+
+    # O corpo mudou → um ETag forte não identifica mais os mesmos bytes
+    etag, fraco = response.get_etag()
+    if etag and not fraco:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compressao(app):
+    """Registra a compressão na aplicação (chamado em create_app)."""
+    app.after_request(comprimir_resposta)
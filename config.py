@@ -18,7 +18,6 @@
 #   └─ ProductionConfig (herda Config)
 
 import os
-import socket
 from dotenv import load_dotenv
 from urllib.parse import quote_plus, urlparse
 from sqlalchemy.pool import NullPool
@@ -77,6 +76,177 @@ class Config:
     # Desabilita tracking de modificações (economia de memória)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # COMPRESSÃO DE RESPOSTAS (ver compressao.py)
+    # COMPRESS_LEVEL: nível do gzip (1 = rápido, 9 = menor). 6 é o equilíbrio padrão.
+    # COMPRESS_BR_LEVEL: qualidade do brotli (0-11). 4 comprime mais que gzip-6 gastando menos CPU.
+    # COMPRESS_MIN_SIZE: bytes mínimos para valer a pena comprimir.
+    # COMPRESS_STREAMS: comprime respostas em stream (SSE) pedaço por pedaço.
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_STREAMS = os.getenv('COMPRESS_STREAMS', 'false').lower() == 'true'
+    COMPRESS_MIMETYPES = [
+        'application/json',
+        'text/html',
+        'text/css',
+        'text/plain',
+        'text/javascript',
+        'application/javascript',
+        'image/svg+xml',
+    ]
+
+    # MANUTENÇÃO EM SEGUNDO PLANO (ver manutencao.py)
+    # MANUTENCAO_ATIVA: liga a thread de manutenção em cada worker
+    # MANUTENCAO_OCIOSO_SEGUNDOS: tempo sem requisições para considerar o worker ocioso
+    MANUTENCAO_ATIVA = os.getenv('MANUTENCAO_ATIVA', 'false').lower() == 'true'
+    MANUTENCAO_INTERVALO_SEGUNDOS = float(os.getenv('MANUTENCAO_INTERVALO_SEGUNDOS', 30))
+    MANUTENCAO_OCIOSO_SEGUNDOS = float(os.getenv('MANUTENCAO_OCIOSO_SEGUNDOS', 5))
+
+    # PURGA DE TAREFAS EXCLUÍDAS (soft delete → remoção física)
+    # PURGA_RETENCAO_SEGUNDOS: quanto tempo a tarefa excluída fica guardada
+    # PURGA_TAMANHO_LOTE: máximo de linhas removidas por transação
+    # PURGA_LOTES_POR_SEGUNDO: taxa máxima de lotes (limita I/O do banco)
+    # PURGA_COMPACTAR_APOS: roda VACUUM se um ciclo remover pelo menos N linhas
+    PURGA_RETENCAO_SEGUNDOS = int(os.getenv('PURGA_RETENCAO_SEGUNDOS', 86400))
+    PURGA_TAMANHO_LOTE = int(os.getenv('PURGA_TAMANHO_LOTE', 500))
+    PURGA_LOTES_POR_SEGUNDO = float(os.getenv('PURGA_LOTES_POR_SEGUNDO', 2))
+    PURGA_COMPACTAR = os.getenv('PURGA_COMPACTAR', 'true').lower() == 'true'
+    PURGA_COMPACTAR_APOS = int(os.getenv('PURGA_COMPACTAR_APOS', 10000))
+
+    # ARQUIVAMENTO DE CONCLUÍDAS (tarefa → tarefa_arquivada, job de manutenção)
+    # ARQUIVO_APOS_DIAS: concluídas há mais que isso saem da tabela quente
+    # ARQUIVO_TAMANHO_LOTE / ARQUIVO_LOTES_POR_SEGUNDO: mesmo controle de ritmo da purga
+    ARQUIVO_APOS_DIAS = float(os.getenv('ARQUIVO_APOS_DIAS', 30))
+    ARQUIVO_TAMANHO_LOTE = int(os.getenv('ARQUIVO_TAMANHO_LOTE', 500))
+    ARQUIVO_LOTES_POR_SEGUNDO = float(os.getenv('ARQUIVO_LOTES_POR_SEGUNDO', 2))
+
+    # LEITURA ÚNICA (single-flight de GET /tarefas, ver leitura_unica.py)
+    # LEITURA_UNICA_ESPERA_SEGUNDOS: espera máxima de uma requisição pela consulta de outra
+    LEITURA_UNICA_ATIVA = os.getenv('LEITURA_UNICA_ATIVA', 'true').lower() == 'true'
+    LEITURA_UNICA_ESPERA_SEGUNDOS = float(os.getenv('LEITURA_UNICA_ESPERA_SEGUNDOS', 10))
+
+    # IDEMPOTÊNCIA (header Idempotency-Key, ver idempotencia.py)
+    # IDEMPOTENCIA_TTL_HORAS: por quanto tempo uma repetição devolve a 1ª resposta
+    IDEMPOTENCIA_TTL_HORAS = float(os.getenv('IDEMPOTENCIA_TTL_HORAS', 24))
+    IDEMPOTENCIA_CHAVE_MAX = 255  # Tamanho da coluna resposta_idempotente.chave
+    # IDEMPOTENCIA_ANDAMENTO_SEGUNDOS: reserva sem resposta mais velha que isso é
+    # de um worker que morreu no meio → a próxima tentativa assume a chave
+    IDEMPOTENCIA_ANDAMENTO_SEGUNDOS = float(os.getenv('IDEMPOTENCIA_ANDAMENTO_SEGUNDOS', 60))
+
+    # REVOGAÇÃO DE TOKENS (logout, ver revogacao.py)
+    # REVOGACAO_SINCRONIZAR_SEGUNDOS: atraso máximo para um logout valer nos outros workers
+    # REVOGACAO_MARGEM_SEGUNDOS: janela relida a cada sincronização (commits atrasados)
+    # REVOGACAO_BLOOM_BITS: tamanho do filtro (2^20 bits = 128 KB ≈ 1% de falso
+    #   positivo com ~100 mil tokens revogados ainda válidos)
+    REVOGACAO_SINCRONIZAR_SEGUNDOS = float(os.getenv('REVOGACAO_SINCRONIZAR_SEGUNDOS', 2))
+    REVOGACAO_MARGEM_SEGUNDOS = float(os.getenv('REVOGACAO_MARGEM_SEGUNDOS', 30))
+    REVOGACAO_LIMPEZA_SEGUNDOS = float(os.getenv('REVOGACAO_LIMPEZA_SEGUNDOS', 300))
+    REVOGACAO_BLOOM_BITS = int(os.getenv('REVOGACAO_BLOOM_BITS', 1 << 20))
+    REVOGACAO_BLOOM_FUNCOES = int(os.getenv('REVOGACAO_BLOOM_FUNCOES', 7))
+
+    # CACHE DE TOKENS VERIFICADOS (ver cache_tokens.py)
+    # JWT_CACHE_ATIVO: reaproveita a verificação de um token já visto até o exp dele
+    # JWT_CACHE_MAX_TOKENS: tamanho máximo do LRU por worker
+    JWT_CACHE_ATIVO = os.getenv('JWT_CACHE_ATIVO', 'false').lower() == 'true'
+    JWT_CACHE_MAX_TOKENS = int(os.getenv('JWT_CACHE_MAX_TOKENS', 10000))
+
+    # CONSULTAS LENTAS (ver consultas_lentas.py)
+    # CONSULTAS_LENTAS_LIMIAR_MS: comandos SQL acima disso vão para o log e para o buffer
+    # CONSULTAS_LENTAS_EXPLAIN: guarda o plano (EXPLAIN/QUERY PLAN) de cada lenta
+    # CONSULTAS_LENTAS_EXPLAIN_ANALYZE: PostgreSQL roda EXPLAIN ANALYZE (executa de
+    #   novo!) nos SELECTs sem FOR UPDATE/SHARE e sem funções com efeito colateral
+    # CONSULTAS_LENTAS_MAX: tamanho do ring buffer por worker (GET /admin/consultas-lentas)
+    CONSULTAS_LENTAS_ATIVO = os.getenv('CONSULTAS_LENTAS_ATIVO', 'true').lower() == 'true'
+    CONSULTAS_LENTAS_LIMIAR_MS = float(os.getenv('CONSULTAS_LENTAS_LIMIAR_MS', 200))
+    CONSULTAS_LENTAS_EXPLAIN = os.getenv('CONSULTAS_LENTAS_EXPLAIN', 'false').lower() == 'true'
+    CONSULTAS_LENTAS_EXPLAIN_ANALYZE = (
+        os.getenv('CONSULTAS_LENTAS_EXPLAIN_ANALYZE', 'false').lower() == 'true'
+    )
+    CONSULTAS_LENTAS_MAX = int(os.getenv('CONSULTAS_LENTAS_MAX', 100))
+
+    # RASTREAMENTO (ver rastreamento.py)
+    # RASTREAMENTO_AMOSTRAGEM: fração das requisições rastreadas (traceparent do chamador manda)
+    # RASTREAMENTO_ARQUIVO: JSON Lines com um trace OTLP por linha ('' = não grava)
+    # RASTREAMENTO_ENDPOINT: coletor OTLP/HTTP JSON, ex: http://localhost:4318/v1/traces
+    # RASTREAMENTO_FILA_MAX: traces aguardando exportação (acima disso são descartados)
+    RASTREAMENTO_ATIVO = os.getenv('RASTREAMENTO_ATIVO', 'false').lower() == 'true'
+    RASTREAMENTO_AMOSTRAGEM = float(os.getenv('RASTREAMENTO_AMOSTRAGEM', 0.1))
+    RASTREAMENTO_ARQUIVO = os.getenv('RASTREAMENTO_ARQUIVO', 'traces.jsonl')
+    RASTREAMENTO_ENDPOINT = os.getenv('RASTREAMENTO_ENDPOINT', '')
+    RASTREAMENTO_FILA_MAX = int(os.getenv('RASTREAMENTO_FILA_MAX', 1000))
+    RASTREAMENTO_SERVICO = os.getenv('RASTREAMENTO_SERVICO', 'api-tarefas')
+
+    # CORPO DAS REQUISIÇÕES
+    # MAX_CONTENT_LENGTH: bytes aceitos no corpo (acima disso: 413 sem ler/parsear).
+    # Tarefa tem descrição de até 200 caracteres → 16 KB sobra com folga
+    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024))
+
+    # LOGS (ver logs.py)
+    # LOG_FORMATO: 'json' (uma linha JSON por registro) ou 'texto' (terminal)
+    # LOG_FILA_MAX: registros aguardando a thread de escrita (acima disso são descartados)
+    # LOG_ACESSO_AMOSTRAGEM: fração das requisições com registro de acesso
+    # LOG_ACESSO_AMOSTRAGEM_ROTAS: taxa por rota, ex: "/health=0.01,/tarefas/changes=0.1"
+    # LOG_ACESSO_LENTO_MS: acima disso (ou status 5xx) o acesso é registrado sempre
+    LOG_NIVEL = os.getenv('LOG_NIVEL', 'INFO').upper()
+    LOG_FORMATO = os.getenv('LOG_FORMATO', 'json')
+    LOG_FILA_MAX = int(os.getenv('LOG_FILA_MAX', 10000))
+    LOG_ACESSO_ATIVO = os.getenv('LOG_ACESSO_ATIVO', 'true').lower() == 'true'
+    LOG_ACESSO_AMOSTRAGEM = float(os.getenv('LOG_ACESSO_AMOSTRAGEM', 1.0))
+    LOG_ACESSO_AMOSTRAGEM_ROTAS = {
+        rota.strip(): float(taxa)
+        for rota, _, taxa in (
+            parte.rpartition('=')
+            for parte in os.getenv('LOG_ACESSO_AMOSTRAGEM_ROTAS', '/health=0.01').split(',')
+            if parte.strip()
+        )
+    }
+    LOG_ACESSO_LENTO_MS = float(os.getenv('LOG_ACESSO_LENTO_MS', 1000))
+
+    # DNS (ver resolvedor_dns.py)
+    # DNS_HOSTADDR_ATIVO: passa o IPv4 resolvido como hostaddr ao PostgreSQL
+    # DNS_TTL_SEGUNDOS: idade máxima do IP em cache (depois renova em segundo plano)
+    # DNS_TIMEOUT_SEGUNDOS: espera máxima pela primeira resolução de um host
+    DNS_HOSTADDR_ATIVO = os.getenv('DNS_HOSTADDR_ATIVO', 'false').lower() == 'true'
+    DNS_TTL_SEGUNDOS = float(os.getenv('DNS_TTL_SEGUNDOS', 300))
+    DNS_TIMEOUT_SEGUNDOS = float(os.getenv('DNS_TIMEOUT_SEGUNDOS', 2))
+
+    # ADMINISTRAÇÃO
+    # ADMIN_EMAILS: emails (separados por vírgula) com acesso às rotas /admin
+    ADMIN_EMAILS = [
+        email.strip().lower() for email in os.getenv('ADMIN_EMAILS', '').split(',') if email.strip()
+    ]
+
+    # COALESCÊNCIA DE ESCRITAS (ver coalescencia.py)
+    # COALESCENCIA_ATIVA: PUTs viram alterações em memória gravadas em lote
+    # COALESCENCIA_JANELA_MS: intervalo entre gravações (PUTs na mesma janela viram 1 UPDATE)
+    COALESCENCIA_ATIVA = os.getenv('COALESCENCIA_ATIVA', 'false').lower() == 'true'
+    COALESCENCIA_JANELA_MS = int(os.getenv('COALESCENCIA_JANELA_MS', 250))
+
+    # FEED DE MUDANÇAS (GET /tarefas/changes?since=<cursor>)
+    # FEED_LIMITE: máximo de mudanças por página (cliente pede a próxima com o cursor)
+    # Exclusões ficam no feed até a purga (PURGA_RETENCAO_SEGUNDOS); cursor mais
+    # antigo que isso recebe resync=true e recarrega a lista inteira
+    FEED_LIMITE = int(os.getenv('FEED_LIMITE', 500))
+
+    # PARTICIONAMENTO (só PostgreSQL, migração 0005)
+    # TAREFA_PARTICOES: nº de partições HASH(user_id) da tabela tarefa.
+    #   Lido só quando a migração roda; mudar depois exige reescrever a tabela.
+    TAREFA_PARTICOES = int(os.getenv('TAREFA_PARTICOES', 8))
+
+    # EVENTOS EM TEMPO REAL (GET /tarefas/stream, ver eventos.py)
+    # EVENTOS_BACKEND: auto (NOTIFY no PostgreSQL, memória no resto) | postgres | memoria
+    # EVENTOS_MAX_CONEXOES: streams abertos por worker (acima disso → 503)
+    #   ⚠️ com worker gthread cada stream ocupa uma thread: sob o Gunicorn o
+    #   limite cai para threads - 1 (hook post_worker_init); use gevent para muitas abas
+    # EVENTOS_HEARTBEAT_SEGUNDOS: intervalo do ": ping" quando não há mudanças
+    # EVENTOS_RETRY_MS: espera sugerida ao navegador antes de reconectar
+    EVENTOS_BACKEND = os.getenv('EVENTOS_BACKEND', 'auto').lower()
+    EVENTOS_CANAL = os.getenv('EVENTOS_CANAL', 'tarefas_mudancas')
+    EVENTOS_MAX_CONEXOES = int(os.getenv('EVENTOS_MAX_CONEXOES', 100))
+    EVENTOS_HEARTBEAT_SEGUNDOS = float(os.getenv('EVENTOS_HEARTBEAT_SEGUNDOS', 15))
+    EVENTOS_RETRY_MS = int(os.getenv('EVENTOS_RETRY_MS', 3000))
+
 # ===================================================================================
 # 💻 DESENVOLVIMENTO - AMBIENTE LOCAL DO PROGRAMADOR
 # ===================================================================================
@@ -104,6 +274,9 @@ class DevelopmentConfig(Config):
     # Reduz rounds do Bcrypt para desenvolvimento (login instantâneo)
     # Padrão é 12 (lento para segurança). 4 é o mínimo (rápido para dev).
     BCRYPT_LOG_ROUNDS = 4
+
+    # Logs legíveis no terminal (produção usa JSON)
+    LOG_FORMATO = os.getenv('LOG_FORMATO', 'texto')
     
     # SQLite para desenvolvimento local
     # 'sqlite:///dev.db' cria arquivo dev.db na pasta do projeto
@@ -143,6 +316,9 @@ class TestingConfig(Config):
     # :memory: = especial do SQLite, não cria arquivo
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
 
+    # Só avisos/erros no stdout da suíte (testes de log usam caplog.at_level)
+    LOG_NIVEL = 'WARNING'
+
 # ===================================================================================
 # 🚀 PRODUÇÃO - AZURE CLOUD (PostgreSQL + Container Apps)
 # ===================================================================================
@@ -155,12 +331,13 @@ class ProductionConfig(Config):
     2. Variáveis individuais (POSTGRES_SERVER, POSTGRES_PASSWORD, etc.)
     """
     DEBUG = False
+
+    # Em produção a purga roda em segundo plano por padrão
+    MANUTENCAO_ATIVA = os.getenv('MANUTENCAO_ATIVA', 'true').lower() == 'true'
     
     # Tenta DATABASE_URL primeiro (padrão Vercel/Heroku/Railway)
     database_url = os.getenv('DATABASE_URL')
     
-    supabase_ipv4 = None
-
     if database_url:
         # Corrige postgres:// para postgresql:// se necessário
         if database_url.startswith("postgres://"):
@@ -171,13 +348,11 @@ class ProductionConfig(Config):
             separator = '&' if '?' in database_url else '?'
             database_url = f"{database_url}{separator}sslmode=require"
 
-        # Resolve IPv4 e usa hostaddr para evitar IPv6 em ambientes que não suportam
-        try:
-            parsed = urlparse(database_url)
-            if 'supabase.co' in (parsed.hostname or ''):
-                supabase_ipv4 = socket.gethostbyname(parsed.hostname)
-        except Exception:
-            supabase_ipv4 = None
+        # Supabase: força IPv4 via hostaddr (ambientes sem rota IPv6). O IP é
+        # resolvido só ao abrir conexões, com timeout e cache (resolvedor_dns.py)
+        DNS_HOSTADDR_ATIVO = os.getenv(
+            'DNS_HOSTADDR_ATIVO', str('supabase.co' in (urlparse(database_url).hostname or ''))
+        ).lower() == 'true'
 
         SQLALCHEMY_DATABASE_URI = database_url
     else:
@@ -227,9 +402,6 @@ class ProductionConfig(Config):
         'keepalives_count': 3,
     }
 
-    if supabase_ipv4:
-        connect_args['hostaddr'] = supabase_ipv4
-
     SQLALCHEMY_ENGINE_OPTIONS = {
         'poolclass': NullPool,
         'pool_pre_ping': True,
@@ -0,0 +1,211 @@
+# ===================================================================================
+# 🐢 LOG DE CONSULTAS LENTAS (COM PLANO DE EXECUÇÃO)
+# ===================================================================================
+# Sem medição, consulta lenta se acha no chute. Este módulo cronometra TODO
+# comando SQL que a app executa (eventos do engine do SQLAlchemy) e registra os
+# que passam de CONSULTAS_LENTAS_LIMIAR_MS:
+#
+# - SQL do comando e tempo em ms
+# - Rota que disparou (ex: "GET /tarefas"), ou o comando da CLI
+# - Parâmetros MASCARADOS: números/booleanos/None ficam (ajudam a reproduzir);
+#   textos viram "<str:N>" (emails, senhas e hashes nunca saem no log)
+# - Plano de execução, se CONSULTAS_LENTAS_EXPLAIN=true:
+#     PostgreSQL → EXPLAIN simples (só o plano estimado, o comando NÃO roda)
+#     SQLite     → EXPLAIN QUERY PLAN
+#   Com CONSULTAS_LENTAS_EXPLAIN_ANALYZE=true o PostgreSQL usa
+#   EXPLAIN (ANALYZE, BUFFERS), que EXECUTA o comando de novo — só para SELECT
+#   sem FOR UPDATE/SHARE (tomaria locks) e sem chamada de função fora de
+#   SEGURAS (uma função pode escrever, dar pg_notify, avançar sequence...)
+#
+# ONDE VER:
+# ---------
+# - Log da app (warning "Consulta lenta ...")
+# - GET /admin/consultas-lentas (só emails de ADMIN_EMAILS): últimas
+#   CONSULTAS_LENTAS_MAX entradas, em um ring buffer (deque com maxlen) →
+#   memória fixa, as mais antigas saem sozinhas.
+#
+# CUSTO:
+# ------
+# Duas leituras de relógio por comando. O EXPLAIN só roda para o que já foi
+# lento (e custa outra ida ao banco, por isso fica desligado por padrão).
+#
+# 🎯 DESIGN PATTERN: OBSERVER (eventos before/after_cursor_execute)
+
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+# Comandos que têm plano de execução (VACUUM, PRAGMA, BEGIN... não têm)
+COMANDOS_COM_PLANO = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+
+# Funções sem efeito colateral que não impedem o EXPLAIN ANALYZE
+SEGURAS = frozenset({'count', 'sum', 'min', 'max', 'avg', 'coalesce', 'lower', 'upper'})
+# Palavras do SQL que aparecem antes de "(" sem ser chamada de função
+_NAO_FUNCOES = frozenset({
+    'in', 'exists', 'any', 'all', 'some', 'values', 'and', 'or', 'not', 'on', 'as',
+    'from', 'join', 'where', 'select', 'over', 'filter', 'lateral', 'using', 'with',
+})
+_LOCK_DE_LINHA = re.compile(r'\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b', re.IGNORECASE)
+_CHAMADA = re.compile(r'"?([A-Za-z_][\w.]*)"?\s*\(')
+
+
+class RegistroDeConsultasLentas:
+    """
+    Extensão Flask: cronometra os comandos do engine e guarda os lentos.
+
+    Args (init_app):
+        db: Flask-SQLAlchemy (os eventos são ligados nos engines da app)
+    """
+
+    def init_app(self, app, db):
+        estado = _EstadoConsultasLentas(app)
+        app.extensions['consultas_lentas'] = estado
+        if not app.config['CONSULTAS_LENTAS_ATIVO']:
+            return
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', estado.antes)
+                event.listen(engine, 'after_cursor_execute', estado.depois)
+
+
+class _EstadoConsultasLentas:
+    """Ring buffer de consultas lentas de um worker."""
+
+    def __init__(self, app):
+        self.app = app
+        self._entradas = deque(maxlen=app.config['CONSULTAS_LENTAS_MAX'])
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # Eventos do engine
+    # -------------------------------------------------------------------------
+    def antes(self, conexao, cursor, sql, parametros, contexto, executemany):
+        conexao.info['inicio_consulta'] = time.perf_counter()
+
+    def depois(self, conexao, cursor, sql, parametros, contexto, executemany):
+        inicio = conexao.info.pop('inicio_consulta', None)
+        if inicio is None:
+            return
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        if duracao_ms < self.app.config['CONSULTAS_LENTAS_LIMIAR_MS']:
+            return
+
+        entrada = {
+            'em': datetime.now(timezone.utc).isoformat(),
+            'duracao_ms': round(duracao_ms, 2),
+            'origem': _origem(),
+            'sql': sql,
+            'parametros': _mascarar(parametros, executemany),
+            'plano': None,
+        }
+        if self.app.config['CONSULTAS_LENTAS_EXPLAIN'] and not executemany:
+            entrada['plano'] = _explicar(
+                conexao, sql, parametros, self.app.config['CONSULTAS_LENTAS_EXPLAIN_ANALYZE']
+            )
+
+        with self._lock:
+            self._entradas.append(entrada)
+        self.app.logger.warning(
+            'Consulta lenta (%.1f ms) em %s: %s', duracao_ms, entrada['origem'], ' '.join(sql.split())
+        )
+
+    # -------------------------------------------------------------------------
+    # Leitura (endpoint admin)
+    # -------------------------------------------------------------------------
+    def listar(self):
+        """Entradas da mais recente para a mais antiga."""
+        with self._lock:
+            return list(reversed(self._entradas))
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+
+def _origem():
+    if has_request_context():
+        regra = request.url_rule.rule if request.url_rule else request.path
+        return f'{request.method} {regra}'
+    return 'fora de requisição (CLI/segundo plano)'
+
+
+def _mascarar_valor(valor):
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return valor
+    if isinstance(valor, (str, bytes)):
+        return f'<{type(valor).__name__}:{len(valor)}>'
+    return f'<{type(valor).__name__}>'
+
+
+def _mascarar(parametros, executemany):
+    if executemany:
+        primeiro = _mascarar(parametros[0], False) if parametros else None
+        return {'conjuntos': len(parametros), 'primeiro': primeiro}
+    if isinstance(parametros, dict):
+        return {chave: _mascarar_valor(valor) for chave, valor in parametros.items()}
+    return [_mascarar_valor(valor) for valor in parametros or ()]
+
+
+def _pode_reexecutar(sql):
+    """True se o SELECT pode rodar de novo sob EXPLAIN ANALYZE sem efeito colateral."""
+    if _LOCK_DE_LINHA.search(sql):
+        return False
+    for nome in _CHAMADA.findall(sql):
+        nome = nome.rsplit('.', 1)[-1].lower()
+        if nome not in _NAO_FUNCOES and nome not in SEGURAS:
+            return False
+    return True
+
+
+def _explicar(conexao, sql, parametros, analyze=False):
+    """
+    Plano do comando lento, em um cursor novo da MESMA conexão (mesma transação
+    → enxerga os mesmos dados). Erro no EXPLAIN não derruba a requisição.
+
+    analyze=True só vale para SELECT que passe em _pode_reexecutar(); o resto
+    recebe o plano estimado.
+    """
+    comando = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+    if comando not in COMANDOS_COM_PLANO:
+        return None
+
+    dialeto = conexao.dialect.name
+    if dialeto == 'postgresql':
+        reexecutar = analyze and comando == 'SELECT' and _pode_reexecutar(sql)
+        prefixo = 'EXPLAIN (ANALYZE, BUFFERS) ' if reexecutar else 'EXPLAIN '
+    elif dialeto == 'sqlite':
+        prefixo = 'EXPLAIN QUERY PLAN '
+    else:
+        return None
+
+    # PostgreSQL: erro dentro da transação invalida a transação inteira →
+    # EXPLAIN isolado em um SAVEPOINT, desfeito se falhar
+    driver = conexao.connection.dbapi_connection
+    savepoint = dialeto == 'postgresql' and not getattr(driver, 'autocommit', False)
+    cursor = driver.cursor()
+    try:
+        if savepoint:
+            cursor.execute('SAVEPOINT consulta_lenta')
+        cursor.execute(prefixo + sql, parametros)
+        linhas = cursor.fetchall()
+        if savepoint:
+            cursor.execute('RELEASE SAVEPOINT consulta_lenta')
+    except Exception as e:
+        if savepoint:
+            try:
+                cursor.execute('ROLLBACK TO SAVEPOINT consulta_lenta')
+            except Exception:
+                pass
+        return f'(EXPLAIN falhou: {e})'
+    finally:
+        cursor.close()
+
+    if dialeto == 'sqlite':
+        # (id, parent, notused, detalhe) → detalhe de cada passo do plano
+        return '\n'.join(str(linha[-1]) for linha in linhas)
+    return '\n'.join(linha[0] for linha in linhas)
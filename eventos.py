@@ -0,0 +1,223 @@
+# ===================================================================================
+# 📡 EVENTOS EM TEMPO REAL (GET /tarefas/stream - Server-Sent Events)
+# ===================================================================================
+# Avisa as abas abertas quando as tarefas do usuário mudam, em vez de cada aba
+# perguntar "mudou alguma coisa?" a cada poucos segundos.
+#
+# O PROBLEMA:
+# -----------
+# 2.000 abas abertas fazendo polling a cada 5s = 400 requisições/s que quase
+# sempre respondem "nada mudou" (JWT, SELECT e JSON para nada).
+#
+# COM SSE:
+# --------
+# Cada aba abre UMA conexão HTTP longa. Quando uma escrita é commitada, o
+# endpoint chama publicar(user_id) e as conexões daquele usuário acordam,
+# leem o delta do feed de mudanças (seq > cursor) e enviam só isso.
+#
+# COMO O AVISO CHEGA EM TODOS OS WORKERS:
+# ---------------------------------------
+# PostgreSQL → NOTIFY no canal EVENTOS_CANAL; cada worker tem UMA thread com
+#              LISTEN que repassa o aviso às conexões locais.
+# SQLite/testes → pub/sub em memória (só o próprio processo é avisado).
+#
+# BACKPRESSURE:
+# -------------
+# O aviso não carrega dados, só "acorde": vários avisos seguidos viram UM
+# (threading.Event). Cliente lento nunca acumula fila em memória; quando ele
+# voltar a ler, recebe o delta atual a partir do SEU cursor (id do evento).
+#
+# ⚠️ Cada stream ocupa uma thread/greenlet do worker enquanto está aberto.
+# Com muitas abas use GUNICORN_WORKER_CLASS=gevent; EVENTOS_MAX_CONEXOES limita
+# quantos streams cada worker aceita (acima disso: 503 + Retry-After). Em
+# worker sync/gthread do Gunicorn o limite nunca passa de threads - 1 (hook
+# post_worker_init do gunicorn.conf.py): streams não podem ocupar todas as
+# threads e travar o resto da API.
+#
+# 🎯 DESIGN PATTERN: PUBLISH/SUBSCRIBE
+
+import atexit
+import os
+import select
+import threading
+
+from sqlalchemy import text
+
+
+class CanalDeEventos:
+    """Extensão Flask: pub/sub de "tarefas do usuário mudaram" (ver comentário do módulo)."""
+
+    def init_app(self, app, db):
+        estado = _EstadoEventos(app, db)
+        app.extensions['eventos'] = estado
+        atexit.register(estado.parar)
+
+
+class Assinatura:
+    """Uma conexão SSE aberta: sinal de "acorde" que agrupa avisos repetidos."""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._sinal = threading.Event()
+
+    def avisar(self):
+        self._sinal.set()
+
+    def esperar(self, timeout):
+        """Espera um aviso por até timeout segundos; False se ninguém avisou."""
+        avisado = self._sinal.wait(timeout)
+        self._sinal.clear()
+        return avisado
+
+
+class _EstadoEventos:
+    """Assinaturas de um worker e a thread de LISTEN (PostgreSQL)."""
+
+    def __init__(self, app, db):
+        self.app = app
+        self.db = db
+        # {user_id: {Assinatura, ...}} → publicar() só acorda as conexões do dono
+        self._assinaturas = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._usa_postgres = None
+
+    @property
+    def usa_postgres(self):
+        """EVENTOS_BACKEND: auto (NOTIFY se o banco for PostgreSQL) | postgres | memoria."""
+        if self._usa_postgres is None:
+            backend = self.app.config['EVENTOS_BACKEND']
+            if backend == 'auto':
+                with self.app.app_context():
+                    backend = self.db.engine.dialect.name
+            self._usa_postgres = backend in ('postgres', 'postgresql')
+        return self._usa_postgres
+
+    @property
+    def encerrando(self):
+        """True durante o shutdown: os streams devem terminar."""
+        return self._parar.is_set()
+
+    # -------------------------------------------------------------------------
+    # Assinantes (conexões SSE)
+    # -------------------------------------------------------------------------
+    def assinar(self, user_id):
+        """Registra uma conexão; None se o worker já atingiu EVENTOS_MAX_CONEXOES."""
+        with self._lock:
+            if self._total >= self.app.config['EVENTOS_MAX_CONEXOES']:
+                return None
+            assinatura = Assinatura(user_id)
+            self._assinaturas.setdefault(user_id, set()).add(assinatura)
+            self._total += 1
+        if self.usa_postgres:
+            self._iniciar_se_necessario()
+        return assinatura
+
+    def cancelar(self, assinatura):
+        """Remove a conexão (idempotente: pode ser chamado mais de uma vez)."""
+        with self._lock:
+            do_usuario = self._assinaturas.get(assinatura.user_id, set())
+            if assinatura in do_usuario:
+                do_usuario.discard(assinatura)
+                self._total -= 1
+                if not do_usuario:
+                    del self._assinaturas[assinatura.user_id]
+
+    @property
+    def conexoes(self):
+        with self._lock:
+            return self._total
+
+    # -------------------------------------------------------------------------
+    # Publicação (chamada DEPOIS do commit)
+    # -------------------------------------------------------------------------
+    def publicar(self, *user_ids):
+        """Avisa todos os workers que as tarefas desses usuários mudaram."""
+        if not user_ids:
+            return
+        if not self.usa_postgres:
+            self._despachar(user_ids)
+            return
+
+        try:
+            with self.app.app_context(), self.db.engine.connect() as conexao:
+                for user_id in set(user_ids):
+                    conexao.execute(
+                        text('SELECT pg_notify(:canal, :user_id)'),
+                        {'canal': self.app.config['EVENTOS_CANAL'], 'user_id': str(user_id)},
+                    )
+                conexao.commit()
+        except Exception as e:
+            # A escrita já foi commitada: o cliente recebe a mudança no próximo
+            # aviso ou ao reconectar (o cursor não perde nada)
+            self.app.logger.warning('Falha ao publicar evento de tarefas: %s', e)
+
+    def _despachar(self, user_ids):
+        with self._lock:
+            assinaturas = [a for u in user_ids for a in self._assinaturas.get(u, ())]
+        for assinatura in assinaturas:
+            assinatura.avisar()
+
+    def _despachar_todos(self):
+        with self._lock:
+            assinaturas = [a for do_usuario in self._assinaturas.values() for a in do_usuario]
+        for assinatura in assinaturas:
+            assinatura.avisar()
+
+    # -------------------------------------------------------------------------
+    # LISTEN (PostgreSQL): uma conexão dedicada por worker, criada após o fork
+    # -------------------------------------------------------------------------
+    def _iniciar_se_necessario(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._escutar, name='eventos', daemon=True)
+            self._thread.start()
+
+    def _escutar(self):
+        while not self._parar.is_set():
+            try:
+                self._escutar_conexao()
+            except Exception as e:
+                self.app.logger.warning('LISTEN de eventos caiu, reconectando: %s', e)
+                self._parar.wait(1)
+
+    def _escutar_conexao(self):
+        with self.app.app_context():
+            conexao = self.db.engine.raw_connection()
+        # Sai do pool: conexão em LISTEN não pode ser reutilizada por requisições
+        conexao.detach()
+        try:
+            driver = conexao.driver_connection
+            driver.autocommit = True
+            with driver.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.app.config['EVENTOS_CANAL']}")
+
+            # Avisos enviados enquanto estávamos desconectados se perderam:
+            # acorda todo mundo para reler o delta a partir do próprio cursor
+            self._despachar_todos()
+
+            while not self._parar.is_set():
+                if select.select([driver], [], [], 1.0) == ([], [], []):
+                    continue
+                driver.poll()
+                user_ids = set()
+                while driver.notifies:
+                    user_ids.add(int(driver.notifies.pop(0).payload))
+                self._despachar(user_ids)
+        finally:
+            conexao.close()
+
+    def parar(self, timeout=5):
+        """Encerra a thread de LISTEN e acorda os streams (shutdown limpo)."""
+        self._parar.set()
+        self._despachar_todos()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
@@ -62,6 +62,8 @@ export function AuthProvider({ children }) {
   };
 
   const logout = () => {
+    // Revoga o token no servidor (sem esperar: a saída local não depende da rede)
+    api.post('/auth/logout').catch(() => {});
     localStorage.removeItem('token');
     setUser(null);
     router.push('/login');
@@ -1,17 +1,60 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import api from '../lib/api';
 
 export function useTarefas(user) {
   const [tarefas, setTarefas] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  // Cursor do feed de mudanças: null = ainda sem carga inicial
+  const cursor = useRef(null);
+  // Criação que falhou/estourou o timeout: repetir a MESMA tarefa reusa a
+  // Idempotency-Key → o servidor devolve a 1ª resposta em vez de duplicar
+  const criacaoPendente = useRef(null);
+
+  const aplicarMudancas = useCallback((mudancas) => {
+    setTarefas(prev => {
+      const atual = new Map(prev.map(t => [t.id, t]));
+      mudancas.forEach(m =>
+        m.op === 'delete' ? atual.delete(m.id) : atual.set(m.tarefa.id, m.tarefa)
+      );
+      return [...atual.values()];
+    });
+  }, []);
+
+  // Delta sync: busca só o que mudou desde o último cursor (GET /tarefas/changes)
+  const sincronizar = useCallback(async () => {
+    if (!user) return;
+    let since = cursor.current ?? 0;
+    let lista = since === 0 ? new Map() : null;
+    let temMais = true;
+
+    while (temMais) {
+      const { data } = await api.get('/tarefas/changes', { params: { since } });
+      if (data.resync) {
+        // Cursor antigo demais (exclusões já purgadas): recomeça do zero
+        since = 0;
+        lista = new Map();
+        continue;
+      }
+      if (lista) {
+        data.mudancas.forEach(m => m.op === 'upsert' && lista.set(m.tarefa.id, m.tarefa));
+      } else {
+        aplicarMudancas(data.mudancas);
+      }
+      since = data.cursor;
+      temMais = data.tem_mais;
+    }
+
+    if (lista) setTarefas([...lista.values()]);
+    cursor.current = since;
+  }, [user, aplicarMudancas]);
 
   const fetchTarefas = useCallback(async () => {
     if (!user) return;
     try {
       setLoading(true);
-      const response = await api.get('/tarefas');
-      setTarefas(response.data);
+      cursor.current = null;
+      await sincronizar();
       setError(null);
     } catch (err) {
       console.error('Erro ao buscar tarefas:', err);
@@ -19,20 +62,85 @@ export function useTarefas(user) {
     } finally {
       setLoading(false);
     }
-  }, [user]);
+  }, [user, sincronizar]);
 
   useEffect(() => {
     fetchTarefas();
   }, [fetchTarefas]);
 
+  // Push de mudanças (GET /tarefas/stream, Server-Sent Events) em vez de polling.
+  // fetch + ReadableStream porque EventSource não envia o cabeçalho Authorization.
+  useEffect(() => {
+    if (!user || loading) return;
+    const controle = new AbortController();
+    let tentativa = null;
+
+    const conectar = async () => {
+      try {
+        const resposta = await fetch(
+          `${api.defaults.baseURL}/tarefas/stream?since=${cursor.current ?? 0}`,
+          {
+            headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+            signal: controle.signal,
+          }
+        );
+        if (!resposta.ok) throw new Error(`stream: HTTP ${resposta.status}`);
+
+        const leitor = resposta.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await leitor.read();
+          if (done) break;
+          buffer += value;
+          const blocos = buffer.split('\n\n');
+          buffer = blocos.pop();
+          for (const bloco of blocos) {
+            const campos = Object.fromEntries(
+              bloco.split('\n')
+                .filter(linha => linha && !linha.startsWith(':'))
+                .map(linha => [linha.slice(0, linha.indexOf(':')), linha.slice(linha.indexOf(':') + 1).trim()])
+            );
+            if (campos.event === 'mudancas') {
+              const dados = JSON.parse(campos.data);
+              aplicarMudancas(dados.mudancas);
+              cursor.current = dados.cursor;
+            } else if (campos.event === 'resync') {
+              fetchTarefas();
+              return;
+            }
+          }
+        }
+      } catch (err) {
+        if (controle.signal.aborted) return;
+        console.error('Stream de tarefas caiu, reconectando:', err);
+      }
+      // Reconecta continuando do último cursor (nada se perde no intervalo)
+      tentativa = setTimeout(conectar, 3000);
+    };
+
+    conectar();
+    return () => {
+      controle.abort();
+      clearTimeout(tentativa);
+    };
+  }, [user, loading, aplicarMudancas, fetchTarefas]);
+
   const addTarefa = async (descricao, prioridade = 'media') => {
     try {
       // Optimistic update (opcional, mas moderno)
       // const tempId = Date.now();
       // setTarefas([...tarefas, { id: tempId, descricao, prioridade, temp: true }]);
       
-      const response = await api.post('/tarefas', { descricao, prioridade });
-      setTarefas(prev => [...prev, response.data]);
+      const corpo = JSON.stringify({ descricao, prioridade });
+      if (criacaoPendente.current?.corpo !== corpo) {
+        criacaoPendente.current = { corpo, chave: crypto.randomUUID() };
+      }
+      const response = await api.post('/tarefas', { descricao, prioridade }, {
+        headers: { 'Idempotency-Key': criacaoPendente.current.chave },
+      });
+      criacaoPendente.current = null;
+      // Replay da 1ª tentativa: a tarefa pode já ter chegado pelo stream
+      setTarefas(prev => prev.some(t => t.id === response.data.id) ? prev : [...prev, response.data]);
       return { success: true };
     } catch (err) {
       console.error('Erro ao criar tarefa:', err);
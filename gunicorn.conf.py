@@ -0,0 +1,232 @@
+# ===================================================================================
+# 🦄 GUNICORN - CONFIGURAÇÃO DE PRODUÇÃO
+# ===================================================================================
+# Este arquivo é carregado automaticamente pelo Gunicorn (gunicorn.conf.py no
+# diretório atual) ou explicitamente com: gunicorn -c gunicorn.conf.py run:app
+#
+# POR QUE UM ARQUIVO DE CONFIGURAÇÃO?
+# -----------------------------------
+# Antes: gunicorn -w 4 run:app
+#   ❌ Número fixo de workers (ignora CPUs do container)
+#   ❌ Workers sync: 1 requisição por vez por processo
+#   ❌ Sem preload: cada worker importa e inicializa a app sozinho (memória x4)
+#   ❌ Sem reciclagem: vazamentos de memória crescem para sempre
+#
+# Agora (tudo configurável por variável de ambiente):
+#   ✅ Workers calculados a partir das CPUs disponíveis (respeita limites do cgroup)
+#   ✅ Modelo de worker selecionável: sync, gthread ou cooperativo (gevent/eventlet)
+#   ✅ preload_app com inicialização amigável ao copy-on-write
+#   ✅ max_requests + jitter (reciclagem escalonada, sem reiniciar todos juntos)
+#   ✅ Pool de conexões descartado com segurança após o fork (post_fork)
+#
+# VARIÁVEIS DE AMBIENTE:
+# ----------------------
+# GUNICORN_BIND                  → endereço (padrão: 0.0.0.0:$PORT ou 0.0.0.0:8000)
+# GUNICORN_WORKERS               → número de processos (padrão: 2 x CPUs + 1)
+# GUNICORN_WORKER_CLASS          → sync | gthread | gevent | eventlet (padrão: gthread)
+# GUNICORN_THREADS               → threads por worker no gthread (padrão: 4; streams SSE ≤ threads - 1)
+# GUNICORN_WORKER_CONNECTIONS    → conexões simultâneas por worker cooperativo (padrão: 1000)
+# GUNICORN_PRELOAD               → true/false (padrão: true)
+# GUNICORN_MAX_REQUESTS          → recicla worker após N requisições (padrão: 1000, 0 desliga)
+# GUNICORN_MAX_REQUESTS_JITTER   → variação aleatória do limite acima (padrão: 100)
+# GUNICORN_TIMEOUT               → segundos até matar worker travado (padrão: 30)
+# GUNICORN_GRACEFUL_TIMEOUT      → segundos para terminar requisições no shutdown (padrão: 30)
+# GUNICORN_KEEPALIVE             → segundos de keep-alive HTTP (padrão: 5)
+
+import gc
+import math
+import os
+
+
+# ===================================================================================
+# 🔧 FUNÇÕES AUXILIARES
+# ===================================================================================
+
+def _env_bool(nome, padrao):
+    """Lê variável de ambiente booleana ('1', 'true', 'yes', 'on' → True)."""
+    valor = os.getenv(nome)
+    if valor is None:
+        return padrao
+    return valor.strip().lower() in ('1', 'true', 'yes', 'on', 'sim')
+
+
+def _env_int(nome, padrao):
+    """Lê variável de ambiente inteira, usando o padrão se vazia ou inválida."""
+    try:
+        return int(os.getenv(nome, ''))
+    except ValueError:
+        return padrao
+
+
+def _cpus_disponiveis():
+    """
+    Retorna quantas CPUs o container pode realmente usar.
+
+    POR QUE NÃO os.cpu_count()?
+    ---------------------------
+    Dentro de um container, os.cpu_count() retorna as CPUs do HOST (ex: 64),
+    mesmo que o container tenha limite de 2 CPUs. Resultado: 129 workers
+    disputando 2 CPUs (troca de contexto e memória desperdiçada).
+
+    ORDEM DE VERIFICAÇÃO:
+    ---------------------
+    1. Cota do cgroup v2 (/sys/fs/cgroup/cpu.max) → limite do Docker/Kubernetes
+    2. Afinidade do processo (sched_getaffinity) → cpusets
+    3. os.cpu_count() → fallback
+    """
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as arquivo:
+            cota, periodo = arquivo.read().split()
+        if cota != 'max':
+            return max(1, math.ceil(int(cota) / int(periodo)))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        # sched_getaffinity não existe no macOS/Windows
+        return max(1, os.cpu_count() or 1)
+
+
+# ===================================================================================
+# 🌐 REDE
+# ===================================================================================
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+
+# ===================================================================================
+# 👷 MODELO DE WORKERS
+# ===================================================================================
+# sync     → 1 requisição por vez por processo (CPU-bound, simples)
+# gthread  → N threads por processo (bom para I/O: banco, bcrypt libera a GIL)
+# gevent / eventlet → cooperativo, milhares de conexões (SSE, long polling)
+#
+# Fórmula clássica de workers: (2 x CPUs) + 1
+# Um worker fica na CPU enquanto o outro espera I/O do banco.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = _env_int('GUNICORN_WORKERS', 0) or (_cpus_disponiveis() * 2 + 1)
+threads = _env_int('GUNICORN_THREADS', 4)
+worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS', 1000)
+
+WORKERS_COOPERATIVOS = ('gevent', 'eventlet')
+
+
+# ===================================================================================
+# ♻️ RECICLAGEM DE WORKERS
+# ===================================================================================
+# max_requests: reinicia o worker após N requisições (contém vazamentos de memória)
+# max_requests_jitter: soma aleatório [0, jitter] ao limite de cada worker
+#   → sem jitter, todos os workers reiniciam ao mesmo tempo (queda de throughput)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+
+# ===================================================================================
+# 🚀 PRELOAD (COPY-ON-WRITE)
+# ===================================================================================
+# preload_app=True → a app é importada UMA vez no processo master, antes do fork.
+# Os workers herdam a memória do master via copy-on-write (páginas compartilhadas
+# até alguém escrever nelas).
+#
+# PROBLEMA: o coletor de lixo do Python escreve no cabeçalho de TODOS os objetos
+# ao percorrê-los → cada worker acaba copiando as páginas do master.
+# SOLUÇÃO: gc.freeze() no master (when_ready) move os objetos já carregados para
+# uma geração permanente que o GC não visita mais.
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+
+# Workers cooperativos precisam do monkey patching ANTES de importar a app.
+# Com preload, a app é importada no master → aplicamos o patch aqui mesmo.
+if preload_app and worker_class in WORKERS_COOPERATIVOS:
+    try:
+        if worker_class == 'gevent':
+            from gevent import monkey
+            monkey.patch_all()
+        else:
+            import eventlet
+            eventlet.monkey_patch()
+    except ImportError:
+        pass  # Gunicorn mostrará o erro de worker class indisponível
+
+
+# ===================================================================================
+# 🪝 HOOKS DO CICLO DE VIDA
+# ===================================================================================
+
+def when_ready(server):
+    """Executado no master depois do preload e antes de criar os workers."""
+    if preload_app:
+        # Coleta lixo da inicialização e congela o que sobrou (ver seção PRELOAD)
+        gc.collect()
+        gc.freeze()
+    server.log.info(
+        "Gunicorn pronto: %s workers '%s' (threads=%s, preload=%s, max_requests=%s±%s)",
+        workers, worker_class, threads, preload_app, max_requests, max_requests_jitter,
+    )
+
+
+def post_fork(server, worker):
+    """
+    Executado em cada worker logo após o fork.
+
+    POR QUE DESCARTAR O ENGINE?
+    ---------------------------
+    Com preload, o master pode ter aberto conexões (init_database faz SELECT 1).
+    Um socket TCP herdado e usado por dois processos corrompe o protocolo do
+    PostgreSQL ("SSL error: decryption failed", respostas trocadas).
+
+    dispose(close=False) → o worker esquece as conexões herdadas SEM fechá-las
+    (fechar enviaria um "terminate" na conexão que ainda pertence ao master).
+    """
+    flask_app = getattr(server.app, 'callable', None)
+    if flask_app is None:
+        return  # Sem preload: a app ainda não foi carregada, nada a descartar
+
+    from app import db
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """
+    Executado em cada worker depois de carregar a app (com ou sem preload).
+
+    LIMITE DE STREAMS SSE EM WORKER COM THREADS:
+    --------------------------------------------
+    Em sync/gthread cada GET /tarefas/stream prende uma THREAD enquanto está
+    aberto. Com threads=4 e EVENTOS_MAX_CONEXOES=100, 4 abas ocupariam o worker
+    inteiro e o resto da API ficaria na fila. Aqui o limite cai para
+    threads - 1 (sempre sobra uma thread; sync com 1 thread → 0, stream
+    responde 503). Workers cooperativos (gevent/eventlet) mantêm o configurado.
+
+    Fica no hook (e não em config.py) porque só vale quando há worker do
+    Gunicorn: flask run / run.py usam EVENTOS_MAX_CONEXOES como está.
+    """
+    flask_app = getattr(worker, 'wsgi', None)
+    configuracao = getattr(flask_app, 'config', None)
+    if configuracao is None or worker.cfg.worker_class_str in WORKERS_COOPERATIVOS:
+        return
+    # sync com threads > 1 vira gthread no Gunicorn: threads é o que vale nos dois
+    limite = max(0, worker.cfg.threads - 1)
+    configuracao['EVENTOS_MAX_CONEXOES'] = min(configuracao['EVENTOS_MAX_CONEXOES'], limite)
+
+
+def worker_exit(server, worker):
+    """
+    Executado quando o worker termina (reciclagem por max_requests ou shutdown).
+
+    Drena o buffer de escritas coalescidas antes do processo sair, para que
+    nenhum PUT já respondido com 200 se perca, encerra os streams SSE,
+    exporta os traces que ainda estão na fila e escreve os logs pendentes.
+    """
+    flask_app = getattr(worker, 'wsgi', None)
+    extensoes = getattr(flask_app, 'extensions', {})
+    for nome in ('coalescencia', 'eventos', 'rastreamento', 'logs'):
+        estado = extensoes.get(nome)
+        if estado is not None:
+            estado.parar()
@@ -0,0 +1,164 @@
+# ===================================================================================
+# 🔁 IDEMPOTENCY-KEY: REPETIR UM POST NÃO CRIA DUPLICATA
+# ===================================================================================
+# O axios do frontend desiste depois de 30 s e o usuário clica de novo. Se o
+# primeiro POST /tarefas só estava lento (e não perdido), a tarefa sai DUPLICADA
+# e o servidor faz o trabalho duas vezes.
+#
+# A SOLUÇÃO (mesmo contrato de Stripe/IETF draft-ietf-httpapi-idempotency-key):
+# ------------------------------------------------------------------------------
+# O cliente manda "Idempotency-Key: <uuid>" (o mesmo em todas as tentativas).
+#
+#   1ª requisição  → reserva (user_id, chave) na tabela resposta_idempotente
+#                    (INSERT ... ON CONFLICT DO NOTHING), executa o handler e
+#                    guarda status + corpo da resposta
+#   Repetição      → devolve a resposta guardada SEM executar de novo
+#                    (header Idempotent-Replayed: true)
+#   Repetição enquanto a 1ª ainda roda → 409 + Retry-After
+#   Reserva sem resposta há IDEMPOTENCIA_ANDAMENTO_SEGUNDOS → o worker morreu
+#                    no meio (OOM, deploy): a repetição assume a chave e executa
+#   Mesma chave com OUTRO corpo         → 422 (erro do cliente, não replay)
+#
+# - Chaves são por usuário: a chave de um não colide com a de outro
+# - Só guarda respostas < 500: erro do servidor libera a chave para nova tentativa
+# - Cada resposta vale IDEMPOTENCIA_TTL_HORAS; depois a chave pode ser reusada e
+#   o job purgar_respostas_idempotentes apaga as linhas vencidas
+# - Sem o header, nada muda (uma linha a menos por requisição)
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import Response, current_app, request
+from flask_restx.utils import unpack
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+HEADER = 'Idempotency-Key'
+
+
+class ChavesDeIdempotencia:
+    """
+    Extensão Flask: decorator @idempotente para handlers de criação.
+
+    Args (init_app):
+        modelo: tabela com user_id, chave, hash_requisicao, status, corpo, expira_em
+        usuario_atual: função sem argumentos → id do usuário logado (ou None)
+    """
+
+    def init_app(self, app, db, modelo, usuario_atual):
+        app.extensions['idempotencia'] = _EstadoIdempotencia(app, db, modelo, usuario_atual)
+
+    @staticmethod
+    def idempotente(funcao):
+        """Aplica por fora dos marshal_with: guarda a resposta já serializada."""
+        @wraps(funcao)
+        def executar(*args, **kwargs):
+            chave = request.headers.get(HEADER)
+            if chave is None:
+                return funcao(*args, **kwargs)
+            return current_app.extensions['idempotencia'].executar(chave, funcao, args, kwargs)
+        return executar
+
+
+class _EstadoIdempotencia:
+    def __init__(self, app, db, modelo, usuario_atual):
+        self.app = app
+        self.db = db
+        self.modelo = modelo
+        self.usuario_atual = usuario_atual
+
+    def executar(self, chave, funcao, args, kwargs):
+        chave, maximo = chave.strip(), self.app.config['IDEMPOTENCIA_CHAVE_MAX']
+        if not chave or len(chave) > maximo:
+            return {'erro': f'{HEADER} deve ter de 1 a {maximo} caracteres'}, 400
+        user_id = self.usuario_atual()
+        if user_id is None:
+            return funcao(*args, **kwargs)  # O próprio handler responde (ex: 404)
+
+        digest = hashlib.sha256(
+            b'\n'.join((request.method.encode(), request.path.encode(), request.get_data()))
+        ).hexdigest()
+        reserva = self._reservar(user_id, chave, digest)
+        if reserva is None:
+            return self._repetir(user_id, chave, digest)
+
+        try:
+            resposta = funcao(*args, **kwargs)
+        except Exception:
+            self._liberar(user_id, chave, reserva)
+            raise
+
+        corpo, status, _ = unpack(resposta)
+        if isinstance(corpo, Response) or status >= 500:
+            self._liberar(user_id, chave, reserva)
+        else:
+            self._guardar(user_id, chave, reserva, status, corpo)
+        return resposta
+
+    # -------------------------------------------------------------------------
+    # Tabela
+    # -------------------------------------------------------------------------
+    def _chave(self, user_id, chave, reserva=None):
+        filtro = (self.modelo.user_id == user_id, self.modelo.chave == chave)
+        if reserva is not None:
+            # Só a reserva desta requisição: se outra assumiu a chave, não mexe
+            filtro += (self.modelo.criada_em == reserva,)
+        return filtro
+
+    def _reservar(self, user_id, chave, digest):
+        """criada_em da reserva (status NULL = em andamento), ou None se a chave já tem dono."""
+        sessao, agora = self.db.session, _agora_utc()
+        abandonada = agora - timedelta(seconds=self.app.config['IDEMPOTENCIA_ANDAMENTO_SEGUNDOS'])
+        # Resposta vencida e reserva abandonada não contam: somem antes da reserva
+        sessao.execute(
+            delete(self.modelo).where(
+                *self._chave(user_id, chave),
+                or_(
+                    self.modelo.expira_em <= agora,
+                    and_(self.modelo.status.is_(None), self.modelo.criada_em <= abandonada),
+                ),
+            )
+        )
+        inserir = postgresql_insert if sessao.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        reservada = sessao.execute(
+            inserir(self.modelo)
+            .values(
+                user_id=user_id, chave=chave, hash_requisicao=digest, criada_em=agora,
+                expira_em=agora + timedelta(hours=self.app.config['IDEMPOTENCIA_TTL_HORAS']),
+            )
+            .on_conflict_do_nothing()
+            .returning(self.modelo.user_id)
+        ).scalar()
+        sessao.commit()
+        return agora if reservada is not None else None
+
+    def _repetir(self, user_id, chave, digest):
+        linha = self.db.session.execute(
+            select(self.modelo.hash_requisicao, self.modelo.status, self.modelo.corpo)
+            .where(*self._chave(user_id, chave))
+        ).first()
+        if linha is not None and linha.hash_requisicao != digest:
+            return {'erro': f'{HEADER} já usada em outra requisição'}, 422
+        if linha is None or linha.status is None:  # Em andamento (ou liberada agora há pouco)
+            return {'erro': 'Requisição com esta chave ainda em andamento'}, 409, {'Retry-After': '1'}
+        return json.loads(linha.corpo), linha.status, {'Idempotent-Replayed': 'true'}
+
+    def _guardar(self, user_id, chave, reserva, status, corpo):
+        self.db.session.execute(
+            update(self.modelo)
+            .where(*self._chave(user_id, chave, reserva))
+            .values(status=status, corpo=json.dumps(corpo, separators=(',', ':'), default=str))
+        )
+        self.db.session.commit()
+
+    def _liberar(self, user_id, chave, reserva):
+        self.db.session.rollback()
+        self.db.session.execute(delete(self.modelo).where(*self._chave(user_id, chave, reserva)))
+        self.db.session.commit()
+
+
+def _agora_utc():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
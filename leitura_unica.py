@@ -0,0 +1,98 @@
+# ===================================================================================
+# 🛬 LEITURA ÚNICA (SINGLE-FLIGHT): GETs IGUAIS E SIMULTÂNEOS VIRAM UMA CONSULTA
+# ===================================================================================
+# Várias abas abertas, ou o frontend disparando GET /tarefas duas vezes no mount,
+# fazem o MESMO worker rodar a MESMA consulta várias vezes ao mesmo tempo.
+#
+# A SOLUÇÃO (por worker):
+# -----------------------
+# A primeira requisição de uma chave vira a LÍDER e executa a consulta; as que
+# chegam com a mesma chave enquanto ela roda ESPERAM e recebem o mesmo
+# resultado, tratado como imutável por quem recebe. A consulta deve devolver o
+# corpo JÁ SERIALIZADO (ex: lista após marshal): assim as seguidoras pulam
+# também o marshalling, que em listas grandes custa mais CPU que o SELECT.
+#
+#   t=0 ms  aba 1 ── consulta ─────────────┐
+#   t=3 ms  aba 2 ── espera ───────────────┤→ mesmo resultado, 1 ida ao banco
+#   t=5 ms  aba 3 ── espera ───────────────┘
+#
+# CHAVE = usuário + GERAÇÃO + parâmetros da consulta. A geração é o
+# usuario.seq_mudancas (toda escrita incrementa): requisição que chega depois
+# de uma escrita tem geração nova e NUNCA pega carona em consulta anterior a ela
+# (lê a própria escrita). Escritas não passam por aqui.
+#
+# - Nada fica em cache: terminou a consulta, a chave sai do mapa
+# - Erro da líder não é repassado: cada seguidora tenta sozinha
+# - Seguidora espera no máximo LEITURA_UNICA_ESPERA_SEGUNDOS; depois consulta sozinha
+# - Métricas: executadas (líderes) e coalescidas (seguidoras) em GET /admin/leituras
+#
+# Faz diferença com workers gthread/gevent (várias requisições por processo);
+# no worker sync cada processo atende uma requisição por vez.
+#
+# 🎯 DESIGN PATTERN: SINGLE-FLIGHT (golang.org/x/sync/singleflight)
+
+import threading
+
+
+class LeituraUnica:
+    """Extensão Flask: coalescência de leituras idênticas dentro do worker."""
+
+    def init_app(self, app):
+        app.extensions['leitura_unica'] = _EstadoLeituraUnica(app)
+
+
+class _Voo:
+    """Uma consulta em andamento e quem está esperando por ela."""
+
+    __slots__ = ('pronto', 'resultado', 'ok')
+
+    def __init__(self):
+        self.pronto = threading.Event()
+        self.resultado = None
+        self.ok = False
+
+
+class _EstadoLeituraUnica:
+    def __init__(self, app):
+        self.app = app
+        self._voos = {}   # chave → _Voo
+        self._lock = threading.Lock()
+        self.executadas = 0
+        self.coalescidas = 0
+
+    def executar(self, chave, consulta):
+        """Resultado de consulta(), compartilhado entre chamadas simultâneas da mesma chave."""
+        if not self.app.config['LEITURA_UNICA_ATIVA']:
+            return consulta()
+
+        with self._lock:
+            voo = self._voos.get(chave)
+            lider = voo is None
+            if lider:
+                voo = self._voos[chave] = _Voo()
+                self.executadas += 1
+            else:
+                self.coalescidas += 1
+
+        if not lider:
+            if voo.pronto.wait(self.app.config['LEITURA_UNICA_ESPERA_SEGUNDOS']) and voo.ok:
+                return voo.resultado
+            return consulta()  # Líder falhou ou demorou demais: consulta própria
+
+        try:
+            voo.resultado = consulta()
+            voo.ok = True
+            return voo.resultado
+        finally:
+            with self._lock:
+                del self._voos[chave]
+            voo.pronto.set()
+
+    @property
+    def metricas(self):
+        with self._lock:
+            return {
+                'executadas': self.executadas,
+                'coalescidas': self.coalescidas,
+                'em_andamento': len(self._voos),
+            }
@@ -0,0 +1,202 @@
+# ===================================================================================
+# 📝 LOGS ESTRUTURADOS (JSON) SEM BLOQUEAR AS REQUISIÇÕES
+# ===================================================================================
+# print() escreve no stdout NA HORA, dentro da thread da requisição: se o
+# coletor de logs (Docker, Azure, Vercel) atrasar, a requisição espera junto.
+# E texto livre ("✅ Conexão estabelecida!") não dá para filtrar nem agregar.
+#
+# A SOLUÇÃO:
+# ----------
+# 1. Toda mensagem vira um registro do módulo logging
+# 2. O handler do root só coloca o registro em uma FILA (QueueHandler: O(1))
+# 3. Uma thread do worker tira da fila e escreve no stdout (QueueListener)
+# 4. Formato JSON, uma linha por registro:
+#      {"ts": "...", "nivel": "INFO", "logger": "tarefas.acesso", "mensagem": "...", ...campos}
+#    LOG_FORMATO=texto deixa legível no terminal de desenvolvimento.
+#
+# Fila cheia (LOG_FILA_MAX) → o registro é descartado e contado, nunca espera.
+#
+# LOG DE ACESSO (LogDeAcesso):
+# ----------------------------
+# Um registro por requisição em "tarefas.acesso": método, rota, status,
+# duração, usuario_id (claim uid do token), quantidade de comandos SQL e o
+# trace_id quando a requisição foi rastreada (ver rastreamento.py).
+# Amostragem por rota (LOG_ACESSO_AMOSTRAGEM_ROTAS, ex: /health=0.01): rotas de
+# alto volume não afogam o log. Erros (5xx) e requisições lentas
+# (LOG_ACESSO_LENTO_MS) são registrados SEMPRE, independente da amostragem.
+#
+# FORK-SAFE: a thread de escrita nasce no primeiro log de cada processo (PID).
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import g, has_app_context, request
+from flask_jwt_extended import get_jwt
+from sqlalchemy import event
+
+# Atributos padrão de LogRecord: tudo que não estiver aqui veio de extra={...}
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro; campos de extra={...} entram no objeto."""
+
+    def format(self, registro):
+        dados = {
+            'ts': datetime.fromtimestamp(registro.created, timezone.utc).isoformat(),
+            'nivel': registro.levelname,
+            'logger': registro.name,
+            'mensagem': registro.getMessage(),
+        }
+        for chave, valor in vars(registro).items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith('_'):
+                dados[chave] = valor
+        if registro.exc_info:
+            dados['excecao'] = self.formatException(registro.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FilaDeLogs(logging.handlers.QueueHandler):
+    """
+    QueueHandler que nunca bloqueia e inicia a thread de escrita após o fork.
+
+    Args:
+        destino: handler que escreve de fato (roda na thread do listener)
+        tamanho: máximo de registros esperando escrita
+    """
+
+    def __init__(self, destino, tamanho):
+        super().__init__(queue.Queue(maxsize=tamanho))
+        self.destino = destino
+        self.descartados = 0
+        self._pid = None
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, registro):
+        self._iniciar_se_necessario()
+        try:
+            self.queue.put_nowait(registro)
+        except queue.Full:
+            self.descartados += 1
+
+    def _iniciar_se_necessario(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._listener = logging.handlers.QueueListener(self.queue, self.destino)
+            self._listener.start()
+
+    def parar(self):
+        """Escreve o que ainda está na fila (atexit/worker_exit)."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._pid, self._listener = None, None
+
+
+class _SaidaPadrao(logging.StreamHandler):
+    """StreamHandler que usa o sys.stdout da hora da escrita (pytest/gunicorn trocam o objeto)."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, valor):
+        pass
+
+
+def configurar_logs(config):
+    """
+    Instala (ou reconfigura) a fila de logs no root logger.
+
+    Idempotente: create_app() roda várias vezes (testes, CLI) sem duplicar handlers.
+    """
+    raiz = logging.getLogger()
+    raiz.setLevel(config['LOG_NIVEL'])
+    fila = next((h for h in raiz.handlers if isinstance(h, FilaDeLogs)), None)
+    if fila is None:
+        fila = FilaDeLogs(_SaidaPadrao(), config['LOG_FILA_MAX'])
+        raiz.addHandler(fila)
+        atexit.register(fila.parar)
+
+    if config['LOG_FORMATO'] == 'json':
+        fila.destino.setFormatter(FormatadorJSON())
+    else:
+        fila.destino.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    return fila
+
+
+class LogDeAcesso:
+    """
+    Extensão Flask: um registro estruturado por requisição.
+
+    Args (init_app):
+        db: Flask-SQLAlchemy (conta os comandos SQL de cada requisição)
+    """
+
+    def init_app(self, app, db):
+        self.app = app
+        self.logger = logging.getLogger('tarefas.acesso')
+        app.before_request(self._iniciar)
+        app.after_request(self._registrar)
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'after_cursor_execute', self._contar_sql)
+        app.extensions['log_acesso'] = self
+
+    def _iniciar(self):
+        g._acesso_inicio = time.perf_counter()
+        g._acesso_sql = 0
+
+    @staticmethod
+    def _contar_sql(conexao, cursor, sql, parametros, contexto, executemany):
+        if has_app_context() and '_acesso_sql' in g:
+            g._acesso_sql += 1
+
+    def _taxa(self, rota):
+        config = self.app.config
+        return config['LOG_ACESSO_AMOSTRAGEM_ROTAS'].get(rota, config['LOG_ACESSO_AMOSTRAGEM'])
+
+    def _registrar(self, resposta):
+        inicio = g.pop('_acesso_inicio', None)
+        if inicio is None or not self.app.config['LOG_ACESSO_ATIVO']:
+            return resposta
+
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        rota = request.url_rule.rule if request.url_rule else request.path
+        taxa = self._taxa(rota)
+        sempre = resposta.status_code >= 500 or duracao_ms >= self.app.config['LOG_ACESSO_LENTO_MS']
+        if not sempre and random.random() >= taxa:
+            return resposta
+
+        try:
+            usuario_id = get_jwt().get('uid')
+        except RuntimeError:  # Rota sem @jwt_required
+            usuario_id = None
+        trace = g.get('_trace')
+
+        self.logger.info('%s %s %s', request.method, rota, resposta.status_code, extra={
+            'metodo': request.method,
+            'rota': rota,
+            'caminho': request.path,
+            'status': resposta.status_code,
+            'duracao_ms': round(duracao_ms, 2),
+            'usuario_id': usuario_id,
+            'sql': g.get('_acesso_sql', 0),
+            'trace_id': trace.trace_id if trace is not None else None,
+            'amostragem': 1.0 if sempre else taxa,
+        })
+        return resposta
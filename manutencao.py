@@ -0,0 +1,156 @@
+# ===================================================================================
+# 🧹 MANUTENÇÃO EM SEGUNDO PLANO (PERÍODOS OCIOSOS)
+# ===================================================================================
+# Executa tarefas pesadas de banco FORA do ciclo da requisição:
+# - Purga de tarefas excluídas (soft delete → hard delete em lotes)
+# - Compactação (VACUUM) depois de purgas grandes
+# - Arquivamento de concluídas antigas (tarefa → tarefa_arquivada)
+#
+# POR QUE NÃO FAZER DENTRO DA REQUISIÇÃO?
+# ---------------------------------------
+# ❌ Usuário limpa 2.000 tarefas → 2.000 DELETEs na hora → locks, WAL, índices
+#    reescritos, e as OUTRAS requisições esperando na fila.
+# ✅ Requisição só marca deleted_at (UPDATE barato). Um trabalhador em segundo
+#    plano apaga de verdade depois, em lotes pequenos e com taxa limitada.
+#
+# O QUE É "PERÍODO OCIOSO"?
+# -------------------------
+# Cada worker conta quantas requisições estão em andamento e quando foi a última.
+# O trabalhador só roda quando o worker está sem requisições há
+# MANUTENCAO_OCIOSO_SEGUNDOS, e para no meio (entre lotes) se chegar tráfego.
+#
+# 🎯 DESIGN PATTERN: OBSERVER + BACKGROUND WORKER
+# As rotinas (jobs) se registram no trabalhador; ele decide QUANDO rodar.
+# Cada job recebe deve_continuar() e deve verificar entre um lote e outro.
+#
+# FORK-SAFE:
+# ----------
+# Threads não sobrevivem ao fork do Gunicorn. A thread é criada na primeira
+# requisição de CADA worker (verificando o PID), nunca no processo master.
+
+import atexit
+import os
+import threading
+import time
+
+
+class TrabalhadorDeManutencao:
+    """
+    Executa jobs de manutenção registrados quando o worker está ocioso.
+
+    USO:
+    ----
+    manutencao = TrabalhadorDeManutencao()
+
+    def purgar(app, deve_continuar):
+        ...  # processa em lotes enquanto deve_continuar() for True
+        return linhas_processadas
+
+    manutencao.registrar(purgar)
+    manutencao.init_app(app)
+    """
+
+    def __init__(self):
+        self.jobs = []
+
+    def registrar(self, job):
+        """Registra um job: função (app, deve_continuar) → nº de itens processados."""
+        if job not in self.jobs:
+            self.jobs.append(job)
+        return job
+
+    def init_app(self, app):
+        """Conecta o trabalhador ao ciclo de requisições da aplicação."""
+        estado = _EstadoManutencao(app, self.jobs)
+        app.extensions['manutencao'] = estado
+
+        app.before_request(estado.inicio_requisicao)
+        app.teardown_request(estado.fim_requisicao)
+        atexit.register(estado.parar)
+
+
+class _EstadoManutencao:
+    """Estado por aplicação: contador de requisições e thread do trabalhador."""
+
+    def __init__(self, app, jobs):
+        self.app = app
+        self.jobs = jobs
+        self._lock = threading.Lock()
+        self._em_andamento = 0
+        self._ultima_atividade = time.monotonic()
+        self._parar = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    # -------------------------------------------------------------------------
+    # Contagem de requisições (define o que é "ocioso")
+    # -------------------------------------------------------------------------
+    def inicio_requisicao(self):
+        with self._lock:
+            self._em_andamento += 1
+            self._ultima_atividade = time.monotonic()
+        self._iniciar_se_necessario()
+
+    def fim_requisicao(self, exc=None):
+        with self._lock:
+            self._em_andamento = max(0, self._em_andamento - 1)
+            self._ultima_atividade = time.monotonic()
+
+    def ocioso(self):
+        """True se não há requisições há MANUTENCAO_OCIOSO_SEGUNDOS."""
+        espera = self.app.config['MANUTENCAO_OCIOSO_SEGUNDOS']
+        with self._lock:
+            return (
+                self._em_andamento == 0
+                and time.monotonic() - self._ultima_atividade >= espera
+            )
+
+    def deve_continuar(self):
+        """Passado aos jobs: para entre lotes se chegar tráfego ou no shutdown."""
+        return not self._parar.is_set() and self.ocioso()
+
+    # -------------------------------------------------------------------------
+    # Ciclo de vida da thread
+    # -------------------------------------------------------------------------
+    def _iniciar_se_necessario(self):
+        if not self.app.config.get('MANUTENCAO_ATIVA') or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._parar.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name='manutencao', daemon=True
+            )
+            self._thread.start()
+
+    def _loop(self):
+        intervalo = self.app.config['MANUTENCAO_INTERVALO_SEGUNDOS']
+        while not self._parar.wait(intervalo):
+            if self.ocioso():
+                self.executar()
+
+    def executar(self, deve_continuar=None):
+        """
+        Roda todos os jobs uma vez.
+
+        O comando CLI passa deve_continuar=lambda: True (roda até o fim,
+        sem esperar período ocioso).
+        """
+        deve_continuar = deve_continuar or self.deve_continuar
+        resultados = {}
+        for job in self.jobs:
+            with self.app.app_context():
+                try:
+                    resultados[job.__name__] = job(self.app, deve_continuar)
+                except Exception as e:
+                    # Manutenção nunca pode derrubar o worker: tenta de novo no próximo ciclo
+                    self.app.logger.warning('Falha no job de manutenção %s: %s', job.__name__, e)
+        return resultados
+
+    def parar(self, timeout=5):
+        """Sinaliza parada e espera o lote atual terminar (shutdown limpo)."""
+        self._parar.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout)
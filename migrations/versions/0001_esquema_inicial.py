@@ -0,0 +1,52 @@
+"""esquema inicial: tabelas usuario e tarefa
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-19 09:00:00
+
+Bancos já existentes foram criados por db.create_all() (sem histórico de
+migrações). Esta revisão só cria o que ainda não existe, então pode ser
+aplicada tanto em banco vazio quanto em banco antigo:
+
+    flask db upgrade
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tabelas = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'usuario' not in tabelas:
+        op.create_table(
+            'usuario',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('senha', sa.String(length=200), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+        )
+
+    if 'tarefa' not in tabelas:
+        op.create_table(
+            'tarefa',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('descricao', sa.String(length=200), nullable=False),
+            sa.Column('concluida', sa.Boolean(), nullable=True),
+            sa.Column('prioridade', sa.String(length=50), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['usuario.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade():
+    op.drop_table('tarefa')
+    op.drop_table('usuario')
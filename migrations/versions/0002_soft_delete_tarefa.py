@@ -0,0 +1,51 @@
+"""soft delete: coluna tarefa.deleted_at e índices parciais
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:00:00
+
+- deleted_at NULL = tarefa ativa; preenchida = excluída, aguardando purga
+- ix_tarefa_user_ativas: (user_id, id) só das ativas → listagem por usuário
+- ix_tarefa_excluidas: (deleted_at) só das excluídas → purga em lotes
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() (init_database) pode ter criado a coluna/índices antes
+    # da migração rodar → cada passo só acontece se ainda não existe
+    inspetor = sa.inspect(op.get_bind())
+    colunas = {c['name'] for c in inspetor.get_columns('tarefa')}
+    indices = {i['name'] for i in inspetor.get_indexes('tarefa')}
+
+    if 'deleted_at' not in colunas:
+        with op.batch_alter_table('tarefa') as batch_op:
+            batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    if 'ix_tarefa_user_ativas' not in indices:
+        op.create_index(
+            'ix_tarefa_user_ativas', 'tarefa', ['user_id', 'id'],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            sqlite_where=sa.text('deleted_at IS NULL'),
+        )
+    if 'ix_tarefa_excluidas' not in indices:
+        op.create_index(
+            'ix_tarefa_excluidas', 'tarefa', ['deleted_at'],
+            postgresql_where=sa.text('deleted_at IS NOT NULL'),
+            sqlite_where=sa.text('deleted_at IS NOT NULL'),
+        )
+
+
+def downgrade():
+    op.drop_index('ix_tarefa_excluidas', table_name='tarefa')
+    op.drop_index('ix_tarefa_user_ativas', table_name='tarefa')
+    with op.batch_alter_table('tarefa') as batch_op:
+        batch_op.drop_column('deleted_at')
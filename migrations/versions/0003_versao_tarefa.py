@@ -0,0 +1,34 @@
+"""concorrência otimista: coluna tarefa.versao
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 11:00:00
+
+Cada escrita faz versao = versao + 1. A API expõe a versão como ETag e
+aceita If-Match em PUT/DELETE (UPDATE ... WHERE versao = :v).
+server_default='1' preenche as linhas existentes sem reescrever a tabela
+no PostgreSQL 11+ (default constante é só metadado).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    colunas = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('tarefa')}
+    if 'versao' not in colunas:
+        with op.batch_alter_table('tarefa') as batch_op:
+            batch_op.add_column(
+                sa.Column('versao', sa.Integer(), nullable=False, server_default='1')
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('tarefa') as batch_op:
+        batch_op.drop_column('versao')
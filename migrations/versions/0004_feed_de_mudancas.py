@@ -0,0 +1,60 @@
+"""feed de mudanças: tarefa.seq, contadores em usuario e índice (user_id, seq)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 12:00:00
+
+usuario.seq_mudancas: contador de escritas por usuário (cada escrita faz +1 e
+copia o valor para tarefa.seq, na mesma transação).
+usuario.seq_expurgo: maior seq de exclusão já removida pela purga; cursores
+mais antigos recebem resync=true em GET /tarefas/changes.
+Linhas existentes ficam com seq=0: aparecem na carga inicial (since=0).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def _colunas(tabela):
+    return {c['name'] for c in sa.inspect(op.get_bind()).get_columns(tabela)}
+
+
+def _indices(tabela):
+    return {i['name'] for i in sa.inspect(op.get_bind()).get_indexes(tabela)}
+
+
+def upgrade():
+    # create_all() da aplicação pode ter criado as colunas antes: só adiciona o que falta
+    novas = [
+        nome for nome in ('seq_mudancas', 'seq_expurgo') if nome not in _colunas('usuario')
+    ]
+    if novas:
+        with op.batch_alter_table('usuario') as batch_op:
+            for nome in novas:
+                batch_op.add_column(
+                    sa.Column(nome, sa.BigInteger(), nullable=False, server_default='0')
+                )
+
+    if 'seq' not in _colunas('tarefa'):
+        with op.batch_alter_table('tarefa') as batch_op:
+            batch_op.add_column(
+                sa.Column('seq', sa.BigInteger(), nullable=False, server_default='0')
+            )
+
+    if 'ix_tarefa_user_seq' not in _indices('tarefa'):
+        op.create_index('ix_tarefa_user_seq', 'tarefa', ['user_id', 'seq'])
+
+
+def downgrade():
+    op.drop_index('ix_tarefa_user_seq', table_name='tarefa')
+    with op.batch_alter_table('tarefa') as batch_op:
+        batch_op.drop_column('seq')
+    with op.batch_alter_table('usuario') as batch_op:
+        batch_op.drop_column('seq_expurgo')
+        batch_op.drop_column('seq_mudancas')
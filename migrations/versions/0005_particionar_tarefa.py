@@ -0,0 +1,104 @@
+"""particionamento: tarefa vira tabela particionada por HASH (user_id) no PostgreSQL
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 13:00:00
+
+Toda consulta em tarefa filtra por user_id → o planner lê só 1 partição
+(partition pruning). Cada partição tem índices e VACUUM próprios: o autovacuum
+trabalha em tabelas de 1/N do tamanho e o inchaço de índice fica contido.
+
+Número de partições: TAREFA_PARTICOES (config.py, padrão 8). Hash não permite
+mudar o número depois sem reescrever a tabela: escolha com folga.
+
+O QUE MUDA NO ESQUEMA:
+- Chave primária vira (id, user_id): no PostgreSQL toda constraint UNIQUE de
+  tabela particionada precisa conter a chave de partição. O id continua vindo
+  da mesma sequence (tarefa_id_seq), então segue único; o modelo em app.py não muda.
+- Índices existentes são recriados na tabela pai (propagam para as partições).
+
+⚠️ A cópia dos dados roda dentro da transação da migração (tabela bloqueada
+durante a cópia). Em tabelas grandes, rode em janela de manutenção.
+
+SQLite: não tem particionamento → migração não faz nada.
+"""
+from alembic import op
+from flask import current_app
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def _particionada(conexao):
+    return conexao.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'tarefa'::regclass)"
+    )).scalar()
+
+
+def _indices_secundarios(conexao):
+    """CREATE INDEX de cada índice de tarefa, exceto a chave primária."""
+    return conexao.execute(sa.text(
+        "SELECT indexdef FROM pg_indexes"
+        " WHERE schemaname = current_schema() AND tablename = 'tarefa'"
+        " AND indexname <> 'tarefa_pkey'"
+    )).scalars().all()
+
+
+def _recriar_tarefa(conexao, particoes):
+    """
+    Copia tarefa para uma tabela nova com o mesmo formato.
+
+    particoes=None → tabela comum (downgrade); N → particionada em N por HASH.
+    """
+    indices = _indices_secundarios(conexao)
+    sequencia = conexao.execute(sa.text("SELECT pg_get_serial_sequence('tarefa', 'id')")).scalar()
+
+    op.execute('ALTER TABLE tarefa RENAME TO tarefa_antiga')
+    # A sequence pertence à coluna antiga: sem isso o DROP TABLE apagaria ela junto
+    op.execute(f'ALTER SEQUENCE {sequencia} OWNED BY NONE')
+
+    particionamento = 'PARTITION BY HASH (user_id)' if particoes else ''
+    chave = 'PRIMARY KEY (id, user_id)' if particoes else 'PRIMARY KEY (id)'
+    # LIKE copia colunas, tipos, NOT NULL e defaults (inclusive nextval da sequence)
+    op.execute(f'''
+        CREATE TABLE tarefa (
+            LIKE tarefa_antiga INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            CONSTRAINT tarefa_pkey_nova {chave},
+            CONSTRAINT tarefa_user_id_fkey_nova FOREIGN KEY (user_id) REFERENCES usuario (id)
+        ) {particionamento}
+    ''')
+    for resto in range(particoes or 0):
+        op.execute(
+            f'CREATE TABLE tarefa_p{resto} PARTITION OF tarefa'
+            f' FOR VALUES WITH (MODULUS {particoes}, REMAINDER {resto})'
+        )
+
+    op.execute('INSERT INTO tarefa SELECT * FROM tarefa_antiga')
+    op.execute('DROP TABLE tarefa_antiga')
+
+    # Nomes originais de volta (agora que a tabela antiga não existe mais)
+    op.execute('ALTER TABLE tarefa RENAME CONSTRAINT tarefa_pkey_nova TO tarefa_pkey')
+    op.execute('ALTER TABLE tarefa RENAME CONSTRAINT tarefa_user_id_fkey_nova TO tarefa_user_id_fkey')
+    op.execute(f'ALTER SEQUENCE {sequencia} OWNED BY tarefa.id')
+    for definicao in indices:
+        op.execute(definicao)
+    op.execute('ANALYZE tarefa')
+
+
+def upgrade():
+    conexao = op.get_bind()
+    if conexao.dialect.name != 'postgresql' or _particionada(conexao):
+        return
+    _recriar_tarefa(conexao, current_app.config['TAREFA_PARTICOES'])
+
+
+def downgrade():
+    conexao = op.get_bind()
+    if conexao.dialect.name != 'postgresql' or not _particionada(conexao):
+        return
+    _recriar_tarefa(conexao, None)
@@ -0,0 +1,127 @@
+"""índices das consultas quentes, criados sem bloquear escritas (CONCURRENTLY)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 14:00:00
+
+- ix_tarefa_pendentes_prioridade: (user_id, prioridade) só das pendentes
+  (NOT concluida e não excluídas) → "o que falta fazer, por prioridade"
+
+(user_id, id) NÃO ganha índice próprio aqui: a listagem e a busca por id das
+ativas usam o parcial ix_tarefa_user_ativas (user_id, id) WHERE deleted_at IS
+NULL, e o dono incluindo excluídas (feed, purga) e a FK tarefa.user_id usam
+ix_tarefa_user_seq (user_id, seq). Um índice completo repetido só custaria
+escrita em todo INSERT/UPDATE/DELETE de tarefa.
+
+POR QUE CONCURRENTLY?
+---------------------
+CREATE INDEX comum trava INSERT/UPDATE/DELETE na tabela até terminar (minutos
+em tabela grande = API fora do ar). CONCURRENTLY lê a tabela duas vezes sem
+bloquear escritas, mas NÃO pode rodar dentro de transação → autocommit_block().
+
+Se um CONCURRENTLY falhar no meio, sobra um índice INVÁLIDO com o nome: ele é
+removido e recriado na próxima execução.
+
+TABELA PARTICIONADA (migração 0005):
+CONCURRENTLY não existe na tabela pai. Cria o índice pai vazio com ON ONLY,
+cada partição ganha o seu com CONCURRENTLY e é anexada (ATTACH PARTITION);
+o índice pai fica válido quando todas as partições estiverem anexadas.
+
+SQLite: CREATE INDEX IF NOT EXISTS comum (sem concorrência para se preocupar).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+# nome → (colunas, WHERE do índice parcial ou None)
+INDICES = {
+    'ix_tarefa_pendentes_prioridade': (
+        'user_id, prioridade', 'NOT concluida AND deleted_at IS NULL'
+    ),
+}
+
+
+def _where(condicao):
+    return f' WHERE {condicao}' if condicao else ''
+
+
+def _estado_indice(conexao, nome):
+    """None se não existe; True/False = válido/inválido."""
+    return conexao.execute(sa.text(
+        'SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid'
+        ' WHERE c.relname = :nome AND c.relnamespace = current_schema()::regnamespace'
+    ), {'nome': nome}).scalar()
+
+
+def _particoes(conexao):
+    return conexao.execute(sa.text(
+        "SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'tarefa'::regclass"
+    )).scalars().all()
+
+
+def _criar_concorrente(conexao, nome, tabela, colunas, condicao):
+    estado = _estado_indice(conexao, nome)
+    if estado is False:
+        conexao.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {nome}'))
+    if estado is not True:
+        conexao.execute(sa.text(
+            f'CREATE INDEX CONCURRENTLY {nome} ON {tabela} ({colunas}){_where(condicao)}'
+        ))
+
+
+def _criar_postgres(conexao, nome, colunas, condicao):
+    particoes = _particoes(conexao)
+    if not particoes:
+        _criar_concorrente(conexao, nome, 'tarefa', colunas, condicao)
+        return
+
+    if _estado_indice(conexao, nome) is True:
+        return
+    # Índice pai "vazio" (inválido até todas as partições serem anexadas)
+    conexao.execute(sa.text(
+        f'CREATE INDEX IF NOT EXISTS {nome} ON ONLY tarefa ({colunas}){_where(condicao)}'
+    ))
+    anexados = set(conexao.execute(sa.text(
+        'SELECT c.relname FROM pg_inherits h JOIN pg_class c ON c.oid = h.inhrelid'
+        ' WHERE h.inhparent = CAST(:nome AS regclass)'
+    ), {'nome': nome}).scalars())
+    for particao in particoes:
+        nome_particao = f'{particao}_{nome[3:]}'  # ex: tarefa_p0_tarefa_pendentes_prioridade
+        if nome_particao in anexados:
+            continue
+        _criar_concorrente(conexao, nome_particao, particao, colunas, condicao)
+        conexao.execute(sa.text(f'ALTER INDEX {nome} ATTACH PARTITION {nome_particao}'))
+
+
+def upgrade():
+    conexao = op.get_bind()
+    if conexao.dialect.name != 'postgresql':
+        for nome, (colunas, condicao) in INDICES.items():
+            op.execute(f'CREATE INDEX IF NOT EXISTS {nome} ON tarefa ({colunas}){_where(condicao)}')
+        return
+
+    with op.get_context().autocommit_block():
+        for nome, (colunas, condicao) in INDICES.items():
+            _criar_postgres(conexao, nome, colunas, condicao)
+
+
+def downgrade():
+    conexao = op.get_bind()
+    if conexao.dialect.name != 'postgresql':
+        for nome in INDICES:
+            op.execute(f'DROP INDEX IF EXISTS {nome}')
+        return
+
+    # Índice de tabela particionada não aceita DROP ... CONCURRENTLY
+    particionada = bool(_particoes(conexao))
+    with op.get_context().autocommit_block():
+        for nome in INDICES:
+            concorrente = '' if particionada else ' CONCURRENTLY'
+            conexao.execute(sa.text(f'DROP INDEX{concorrente} IF EXISTS {nome}'))
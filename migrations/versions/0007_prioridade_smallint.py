@@ -0,0 +1,80 @@
+"""prioridade: VARCHAR → SMALLINT (1=baixa, 2=media, 3=alta) + índice por prioridade
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 15:00:00
+
+- Códigos fixos em schemas.CODIGOS_PRIORIDADE; a API continua recebendo e
+  devolvendo 'baixa'/'media'/'alta' (app.PrioridadeTipo converte).
+- ix_tarefa_user_prioridade: (user_id, prioridade DESC, id) das ativas →
+  GET /tarefas?ordem=prioridade lê o índice já na ordem, sem sort.
+
+⚠️ PostgreSQL: ALTER COLUMN ... TYPE reescreve a tabela (e os índices que usam
+a coluna) com lock exclusivo. Em tabela grande, rode em janela de manutenção.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+PARA_CODIGO = (
+    "CASE prioridade WHEN 'baixa' THEN 1 WHEN 'media' THEN 2 WHEN 'alta' THEN 3 ELSE 1 END"
+)
+PARA_TEXTO = (
+    "CASE prioridade WHEN 1 THEN 'baixa' WHEN 2 THEN 'media' WHEN 3 THEN 'alta' ELSE 'baixa' END"
+)
+
+
+def _prioridade_inteira(conexao):
+    coluna = next(
+        c for c in sa.inspect(conexao).get_columns('tarefa') if c['name'] == 'prioridade'
+    )
+    return isinstance(coluna['type'], sa.Integer)
+
+
+def upgrade():
+    conexao = op.get_bind()
+
+    # create_all() em banco novo já cria a coluna SMALLINT: nada para converter
+    if not _prioridade_inteira(conexao):
+        if conexao.dialect.name == 'postgresql':
+            # ::text também cobre bancos em que a coluna virou ENUM nativo
+            op.execute(
+                'ALTER TABLE tarefa ALTER COLUMN prioridade TYPE smallint USING '
+                + PARA_CODIGO.replace('CASE prioridade', 'CASE prioridade::text')
+            )
+        else:
+            # SQLite não altera tipo: converte os valores e recria a tabela (batch)
+            op.execute(f'UPDATE tarefa SET prioridade = {PARA_CODIGO}')
+            with op.batch_alter_table('tarefa') as batch_op:
+                batch_op.alter_column(
+                    'prioridade', type_=sa.SmallInteger(),
+                    existing_type=sa.String(length=50), existing_nullable=False,
+                )
+
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_tarefa_user_prioridade'
+        ' ON tarefa (user_id, prioridade DESC, id) WHERE deleted_at IS NULL'
+    )
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_tarefa_user_prioridade')
+    conexao = op.get_bind()
+    if conexao.dialect.name == 'postgresql':
+        op.execute(
+            f'ALTER TABLE tarefa ALTER COLUMN prioridade TYPE varchar(50) USING {PARA_TEXTO}'
+        )
+    else:
+        with op.batch_alter_table('tarefa') as batch_op:
+            batch_op.alter_column(
+                'prioridade', type_=sa.String(length=50),
+                existing_type=sa.SmallInteger(), existing_nullable=False,
+            )
+        op.execute(f'UPDATE tarefa SET prioridade = {PARA_TEXTO}')
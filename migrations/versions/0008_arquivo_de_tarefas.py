@@ -0,0 +1,64 @@
+"""arquivo de concluídas: tarefa.concluida_em e tabela tarefa_arquivada
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 16:00:00
+
+- tarefa.concluida_em: quando a tarefa foi concluída (PUT concluida=true)
+- tarefa_arquivada: concluídas há mais de ARQUIVO_APOS_DIAS, movidas em lotes
+  pelo job arquivar_tarefas_concluidas (fora dos índices da tabela quente)
+
+Concluídas que já existiam recebem concluida_em = agora: o prazo de
+arquivamento começa a contar a partir desta migração.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspetor = sa.inspect(op.get_bind())
+
+    if 'concluida_em' not in {c['name'] for c in inspetor.get_columns('tarefa')}:
+        # ADD COLUMN direto (sem batch): no SQLite não recria a tabela e no
+        # PostgreSQL propaga para as partições
+        op.add_column('tarefa', sa.Column('concluida_em', sa.DateTime(), nullable=True))
+        op.execute(
+            'UPDATE tarefa SET concluida_em = CURRENT_TIMESTAMP'
+            ' WHERE concluida AND concluida_em IS NULL'
+        )
+
+    if 'tarefa_arquivada' not in inspetor.get_table_names():
+        op.create_table(
+            'tarefa_arquivada',
+            sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('descricao', sa.String(length=200), nullable=False),
+            sa.Column('concluida', sa.Boolean(), nullable=True),
+            sa.Column('prioridade', sa.SmallInteger(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('versao', sa.Integer(), server_default='1', nullable=False),
+            sa.Column('seq', sa.BigInteger(), server_default='0', nullable=False),
+            sa.Column('concluida_em', sa.DateTime(), nullable=True),
+            sa.Column('arquivada_em', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['usuario.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_tarefa_arquivada_user', 'tarefa_arquivada', ['user_id', 'id'])
+
+
+def downgrade():
+    # Devolve as arquivadas para a tabela quente antes de apagar o arquivo
+    op.execute(
+        'INSERT INTO tarefa (id, descricao, concluida, prioridade, user_id, versao, seq, concluida_em)'
+        ' SELECT id, descricao, concluida, prioridade, user_id, versao, seq, concluida_em'
+        ' FROM tarefa_arquivada'
+    )
+    op.drop_index('ix_tarefa_arquivada_user', table_name='tarefa_arquivada')
+    op.drop_table('tarefa_arquivada')
+    op.drop_column('tarefa', 'concluida_em')
@@ -0,0 +1,39 @@
+"""revogação de tokens: tabela token_revogado (logout)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 17:00:00
+
+Fonte durável da blocklist de JWT. Os workers leem de forma incremental
+(revogado_em > cursor) e checam em memória (revogacao.py); o job
+purgar_tokens_expirados apaga linhas cujo token já expirou (expira_em).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'token_revogado' in sa.inspect(op.get_bind()).get_table_names():
+        return  # create_all() da aplicação já criou
+    op.create_table(
+        'token_revogado',
+        sa.Column('jti', sa.String(length=36), nullable=False),
+        sa.Column('expira_em', sa.DateTime(), nullable=False),
+        sa.Column('revogado_em', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('jti'),
+    )
+    op.create_index('ix_token_revogado_expira_em', 'token_revogado', ['expira_em'])
+    op.create_index('ix_token_revogado_revogado_em', 'token_revogado', ['revogado_em'])
+
+
+def downgrade():
+    op.drop_index('ix_token_revogado_revogado_em', table_name='token_revogado')
+    op.drop_index('ix_token_revogado_expira_em', table_name='token_revogado')
+    op.drop_table('token_revogado')
@@ -0,0 +1,69 @@
+"""email sem diferenciar maiúsculas: índice único em lower(email)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 18:00:00
+
+- ix_usuario_email_lower: UNIQUE (lower(email)) → 'A@x.com' e 'a@x.com' não
+  podem mais virar dois usuários; login e /auth/me buscam por lower(email)
+  e o registro vira INSERT ... ON CONFLICT DO NOTHING RETURNING id.
+
+Se já existirem emails que só diferem na caixa, o índice não pode ser criado:
+a migração para e lista os emails (decidir qual conta fica é manual).
+
+PostgreSQL: CREATE UNIQUE INDEX CONCURRENTLY (não bloqueia novos registros),
+mesmo cuidado da migração 0006 com índice inválido de tentativa anterior.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+INDICE = 'ix_usuario_email_lower'
+
+
+def _emails_em_conflito(conexao):
+    return conexao.execute(sa.text(
+        'SELECT lower(email) FROM usuario GROUP BY lower(email) HAVING count(*) > 1'
+    )).scalars().all()
+
+
+def upgrade():
+    conexao = op.get_bind()
+    conflitos = _emails_em_conflito(conexao)
+    if conflitos:
+        raise RuntimeError(
+            'Emails cadastrados mais de uma vez (só muda maiúscula/minúscula): '
+            + ', '.join(conflitos) + '. Resolva antes de aplicar a migração 0010.'
+        )
+
+    if conexao.dialect.name != 'postgresql':
+        op.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {INDICE} ON usuario (lower(email))')
+        return
+
+    with op.get_context().autocommit_block():
+        valido = conexao.execute(sa.text(
+            'SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid'
+            ' WHERE c.relname = :nome AND c.relnamespace = current_schema()::regnamespace'
+        ), {'nome': INDICE}).scalar()
+        if valido is False:
+            conexao.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {INDICE}'))
+        if valido is not True:
+            conexao.execute(sa.text(
+                f'CREATE UNIQUE INDEX CONCURRENTLY {INDICE} ON usuario (lower(email))'
+            ))
+
+
+def downgrade():
+    conexao = op.get_bind()
+    if conexao.dialect.name != 'postgresql':
+        op.execute(f'DROP INDEX IF EXISTS {INDICE}')
+        return
+    with op.get_context().autocommit_block():
+        conexao.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {INDICE}'))
@@ -0,0 +1,42 @@
+"""idempotência: tabela resposta_idempotente (header Idempotency-Key)
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 21:00:00
+
+Primeira resposta de cada (user_id, chave) para repetir POSTs sem executar de
+novo (idempotencia.py); o job purgar_respostas_idempotentes apaga linhas
+cujo expira_em já passou.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'resposta_idempotente' in sa.inspect(op.get_bind()).get_table_names():
+        return  # create_all() da aplicação já criou
+    op.create_table(
+        'resposta_idempotente',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('chave', sa.String(length=255), nullable=False),
+        sa.Column('hash_requisicao', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.SmallInteger(), nullable=True),
+        sa.Column('corpo', sa.Text(), nullable=True),
+        sa.Column('criada_em', sa.DateTime(), nullable=False),
+        sa.Column('expira_em', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['usuario.id']),
+        sa.PrimaryKeyConstraint('user_id', 'chave'),
+    )
+    op.create_index('ix_resposta_idempotente_expira_em', 'resposta_idempotente', ['expira_em'])
+
+
+def downgrade():
+    op.drop_index('ix_resposta_idempotente_expira_em', table_name='resposta_idempotente')
+    op.drop_table('resposta_idempotente')
@@ -0,0 +1,344 @@
+# ===================================================================================
+# 🔭 RASTREAMENTO (TRACING) DE REQUISIÇÕES: HTTP → SQL → BCRYPT → VALIDAÇÃO
+# ===================================================================================
+# Um /auth/login lento é CPU (bcrypt) ou banco? Sem rastreamento só dá para
+# chutar. Cada requisição amostrada vira um TRACE com spans filhos:
+#
+#   POST /auth/login                  ████████████████████  262 ms (span SERVER)
+#     db.query SELECT usuario ...     █                       1 ms (span CLIENT)
+#     bcrypt.verificar                  ██████████████████  258 ms
+#
+# FORMATO: OTLP/JSON (o mesmo do OpenTelemetry Collector, POST /v1/traces):
+#   {"resourceSpans": [{"resource": ..., "scopeSpans": [{"spans": [...]}]}]}
+# Um trace por linha em RASTREAMENTO_ARQUIVO (JSON Lines) e/ou enviado para
+# RASTREAMENTO_ENDPOINT (ex: http://localhost:4318/v1/traces) → qualquer
+# ferramenta compatível com OTLP (Jaeger, Tempo, Collector) lê sem adaptação.
+#
+# AMOSTRAGEM:
+# -----------
+# RASTREAMENTO_AMOSTRAGEM = fração das requisições rastreadas (0.0 a 1.0).
+# Requisição com header traceparent (W3C) segue a decisão de quem chamou e
+# continua o mesmo trace_id. Não amostrada = custo zero (nenhum span criado).
+#
+# EXPORTAÇÃO FORA DA REQUISIÇÃO:
+# ------------------------------
+# O trace pronto entra em uma fila limitada; uma thread do worker grava/envia
+# em segundo plano. Fila cheia → trace descartado (contado em descartados),
+# nunca atrasa a resposta. Thread criada após o fork (PID), drenada no atexit.
+#
+# 🎯 DESIGN PATTERN: OBSERVER (hooks do Flask + eventos do SQLAlchemy)
+
+import atexit
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+
+SERVER, CLIENT, INTERNAL = 2, 3, 1  # SpanKind do OTLP
+STATUS_ERRO = 2
+
+TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+
+class Rastreador:
+    """
+    Extensão Flask: abre um trace por requisição amostrada.
+
+    Args (init_app):
+        db: Flask-SQLAlchemy (cada comando SQL vira um span filho)
+    """
+
+    def init_app(self, app, db):
+        estado = _EstadoRastreamento(app)
+        app.extensions['rastreamento'] = estado
+
+        # Hooks sempre ligados; com RASTREAMENTO_ATIVO=false nenhum trace é aberto
+        # e cada hook sai na primeira linha
+        app.before_request(estado.abrir)
+        app.after_request(estado.registrar_resposta)
+        app.teardown_request(estado.fechar)
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', estado.antes_sql)
+                event.listen(engine, 'after_cursor_execute', estado.depois_sql)
+                event.listen(engine, 'handle_error', estado.erro_sql)
+        atexit.register(estado.parar)
+
+
+class _Trace:
+    """Spans de uma requisição (vive em flask.g)."""
+
+    def __init__(self, trace_id, pai_remoto):
+        self.trace_id = trace_id
+        self.spans = []
+        self.pilha = [pai_remoto] if pai_remoto else []
+
+    def iniciar(self, nome, tipo, atributos):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': os.urandom(8).hex(),
+            'name': nome,
+            'kind': tipo,
+            'startTimeUnixNano': time.time_ns(),
+            'attributes': dict(atributos),
+        }
+        if self.pilha:
+            span['parentSpanId'] = self.pilha[-1]
+        self.pilha.append(span['spanId'])
+        return span
+
+    def encerrar(self, span, erro=None):
+        span['endTimeUnixNano'] = time.time_ns()
+        if erro is not None:
+            span['status'] = {'code': STATUS_ERRO, 'message': f'{type(erro).__name__}: {erro}'}
+        if self.pilha and self.pilha[-1] == span['spanId']:
+            self.pilha.pop()
+        self.spans.append(span)
+
+
+class _EstadoRastreamento:
+    """Amostragem, spans da requisição atual e fila de exportação do worker."""
+
+    def __init__(self, app):
+        self.app = app
+        self._fila = queue.Queue(maxsize=app.config['RASTREAMENTO_FILA_MAX'])
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+        self.descartados = 0
+
+    # -------------------------------------------------------------------------
+    # API para o código da app
+    # -------------------------------------------------------------------------
+    @property
+    def trace_atual(self):
+        return g.get('_trace') if has_app_context() else None
+
+    @contextmanager
+    def span(self, nome, **atributos):
+        """
+        Span filho do span atual. Sem trace (não amostrado, fora de requisição)
+        não faz nada. Exceção dentro do bloco marca o span com erro e segue.
+        """
+        trace = self.trace_atual
+        if trace is None:
+            yield
+            return
+        span = trace.iniciar(nome, INTERNAL, atributos)
+        try:
+            yield
+        except Exception as e:
+            trace.encerrar(span, erro=e)
+            raise
+        trace.encerrar(span)
+
+    def marshal_rastreado(self, decorador):
+        """
+        Aplica um marshal_with/marshal_list_with do flask-restx e mede SÓ o
+        marshalling (span restx.marshal): começa quando o handler devolve.
+
+            @rastros.marshal_rastreado(ns.marshal_with(modelo))
+        """
+        def aplicar(funcao):
+            @wraps(funcao)
+            def handler(*args, **kwargs):
+                try:
+                    return funcao(*args, **kwargs)
+                finally:
+                    if self.trace_atual is not None:
+                        g._fim_handler = time.time_ns()
+
+            com_marshal = decorador(handler)
+
+            @wraps(com_marshal)
+            def medido(*args, **kwargs):
+                resposta = com_marshal(*args, **kwargs)
+                trace, inicio = self.trace_atual, g.pop('_fim_handler', None)
+                if trace is not None and inicio is not None:
+                    span = trace.iniciar('restx.marshal', INTERNAL, {})
+                    span['startTimeUnixNano'] = inicio
+                    trace.encerrar(span)
+                return resposta
+            return medido
+        return aplicar
+
+    # -------------------------------------------------------------------------
+    # Hooks do Flask
+    # -------------------------------------------------------------------------
+    def abrir(self):
+        if not self.app.config['RASTREAMENTO_ATIVO']:
+            return
+        pai = TRACEPARENT.match(request.headers.get('traceparent', ''))
+        if pai:
+            amostrado = int(pai.group(3), 16) & 1
+            trace_id, pai_remoto = pai.group(1), pai.group(2)
+        else:
+            amostrado = random.random() < self.app.config['RASTREAMENTO_AMOSTRAGEM']
+            trace_id, pai_remoto = os.urandom(16).hex(), None
+        if not amostrado:
+            return
+
+        trace = _Trace(trace_id, pai_remoto)
+        g._trace = trace
+        g._span_requisicao = trace.iniciar(f'{request.method} {request.path}', SERVER, {
+            'http.request.method': request.method,
+            'url.path': request.path,
+        })
+
+    def registrar_resposta(self, resposta):
+        span = g.get('_span_requisicao')
+        if span is not None:
+            span['attributes']['http.response.status_code'] = resposta.status_code
+            if request.url_rule is not None:
+                span['attributes']['http.route'] = request.url_rule.rule
+                span['name'] = f'{request.method} {request.url_rule.rule}'
+        return resposta
+
+    def fechar(self, erro=None):
+        trace, span = g.pop('_trace', None), g.pop('_span_requisicao', None)
+        if trace is None:
+            return
+        trace.pilha = [span['spanId']]  # Spans abertos por engano não prendem o trace
+        trace.encerrar(span, erro=erro)
+        self._enfileirar(trace)
+
+    # -------------------------------------------------------------------------
+    # Eventos do SQLAlchemy
+    # -------------------------------------------------------------------------
+    def antes_sql(self, conexao, cursor, sql, parametros, contexto, executemany):
+        trace = self.trace_atual
+        if trace is not None:
+            conexao.info['span_sql'] = trace.iniciar(f'db.query {sql.split(None, 1)[0]}', CLIENT, {
+                'db.system': conexao.dialect.name,
+                'db.statement': sql[:1000],  # Só o SQL: parâmetros nunca vão para o trace
+            })
+
+    def depois_sql(self, conexao, cursor, sql, parametros, contexto, executemany):
+        span = conexao.info.pop('span_sql', None)
+        trace = self.trace_atual
+        if span is not None and trace is not None:
+            trace.encerrar(span)
+
+    def erro_sql(self, contexto):
+        conexao = contexto.connection
+        span = conexao.info.pop('span_sql', None) if conexao is not None else None
+        trace = self.trace_atual
+        if span is not None and trace is not None:
+            trace.encerrar(span, erro=contexto.original_exception)
+
+    # -------------------------------------------------------------------------
+    # Exportação (thread do worker)
+    # -------------------------------------------------------------------------
+    def _enfileirar(self, trace):
+        try:
+            self._fila.put_nowait(trace.spans)
+        except queue.Full:
+            self.descartados += 1
+            return
+        self._iniciar_se_necessario()
+
+    def _iniciar_se_necessario(self):
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._exportar_sempre, name='rastreamento', daemon=True)
+            self._thread.start()
+
+    def _exportar_sempre(self):
+        while True:
+            spans = self._fila.get()
+            try:
+                if spans is None:
+                    return
+                self._exportar([spans])
+            finally:
+                self._fila.task_done()
+
+    def exportar_pendentes(self):
+        """
+        Exporta agora o que estiver na fila e espera o trace que a thread já
+        pegou terminar de ser gravado (testes e encerramento).
+        """
+        lote = []
+        while True:
+            try:
+                spans = self._fila.get_nowait()
+            except queue.Empty:
+                break
+            self._fila.task_done()
+            if spans is not None:
+                lote.append(spans)
+        if lote:
+            self._exportar(lote)
+        if self._thread is not None and self._thread.is_alive():
+            self._fila.join()
+
+    def parar(self):
+        self.exportar_pendentes()
+        if self._thread is not None and self._pid == os.getpid():
+            self._fila.put(None)
+
+    def _exportar(self, traces):
+        config = self.app.config
+        for spans in traces:
+            corpo = json.dumps(self._otlp(spans), separators=(',', ':'))
+            try:
+                if config['RASTREAMENTO_ARQUIVO']:
+                    with self._lock, open(config['RASTREAMENTO_ARQUIVO'], 'a', encoding='utf-8') as arquivo:
+                        arquivo.write(corpo + '\n')
+                if config['RASTREAMENTO_ENDPOINT']:
+                    envio = urllib.request.Request(
+                        config['RASTREAMENTO_ENDPOINT'], data=corpo.encode(),
+                        headers={'Content-Type': 'application/json'}, method='POST',
+                    )
+                    urllib.request.urlopen(envio, timeout=5).close()
+            except Exception as e:
+                self.app.logger.warning('Falha ao exportar trace: %s', e)
+
+    def _otlp(self, spans):
+        """ExportTraceServiceRequest em JSON (ids em hex, int64 como string)."""
+        return {'resourceSpans': [{
+            'resource': {'attributes': _atributos({
+                'service.name': self.app.config['RASTREAMENTO_SERVICO'],
+                'process.pid': os.getpid(),
+            })},
+            'scopeSpans': [{
+                'scope': {'name': 'rastreamento'},
+                'spans': [
+                    {
+                        **span,
+                        'startTimeUnixNano': str(span['startTimeUnixNano']),
+                        'endTimeUnixNano': str(span['endTimeUnixNano']),
+                        'attributes': _atributos(span['attributes']),
+                    }
+                    for span in spans
+                ],
+            }],
+        }]}
+
+
+def _atributos(valores):
+    convertidos = []
+    for chave, valor in valores.items():
+        if isinstance(valor, bool):
+            convertido = {'boolValue': valor}
+        elif isinstance(valor, int):
+            convertido = {'intValue': str(valor)}
+        elif isinstance(valor, float):
+            convertido = {'doubleValue': valor}
+        else:
+            convertido = {'stringValue': str(valor)}
+        convertidos.append({'key': chave, 'value': convertido})
+    return convertidos
@@ -0,0 +1,127 @@
+# ===================================================================================
+# 🧭 RESOLUÇÃO DE DNS PREGUIÇOSA, COM TIMEOUT E CACHE (hostaddr do PostgreSQL)
+# ===================================================================================
+# O Supabase publica AAAA (IPv6) e alguns ambientes (Vercel, containers) não têm
+# rota IPv6 → forçamos IPv4 passando hostaddr ao libpq. Antes isso era feito com
+# socket.gethostbyname() DENTRO da classe ProductionConfig:
+#   ❌ Importar config.py travava no DNS, sem timeout (inclusive nos testes/CLI)
+#   ❌ O IP ficava congelado pelo resto da vida do processo: se o banco mudasse
+#      de endereço (failover, manutenção), o worker conectava no IP antigo
+#
+# AGORA:
+# ------
+# - Resolve só quando uma conexão é criada (evento do_connect do SQLAlchemy)
+# - Tempo máximo de DNS_TIMEOUT_SEGUNDOS: estourou → conecta sem hostaddr
+#   (o libpq resolve o host sozinho, como sem a otimização)
+# - Cache por DNS_TTL_SEGUNDOS; vencido → devolve o IP antigo NA HORA e
+#   renova em segundo plano (stale-while-revalidate) → conexões nunca esperam
+#   a renovação, e workers de vida longa acompanham a troca de IP
+# - Falha na renovação mantém o último IP bom (DNS instável não derruba a app)
+#
+# FORK-SAFE: a thread de resolução pertence ao processo que a criou (PID); o
+# cache herdado do master continua válido nos workers.
+
+import os
+import socket
+import threading
+import time
+
+from sqlalchemy import event
+
+
+class ResolvedorDNS:
+    """
+    Extensão Flask: injeta hostaddr (IPv4 em cache) nas conexões PostgreSQL.
+
+    Args (init_app):
+        db: Flask-SQLAlchemy (o evento do_connect é ligado nos engines da app)
+    """
+
+    def init_app(self, app, db):
+        cache = CacheDNS(app.config['DNS_TTL_SEGUNDOS'], app.config['DNS_TIMEOUT_SEGUNDOS'])
+        app.extensions['resolvedor_dns'] = cache
+        if not app.config['DNS_HOSTADDR_ATIVO']:
+            return
+
+        def injetar_hostaddr(dialeto, registro, cargs, cparams):
+            host = cparams.get('host')
+            if dialeto.name != 'postgresql' or not host or 'hostaddr' in cparams or _eh_ip(host):
+                return
+            ip = cache.resolver(host)
+            if ip is not None:
+                cparams['hostaddr'] = ip
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'do_connect', injetar_hostaddr)
+
+
+class CacheDNS:
+    """
+    Cache de host → IPv4 com timeout na primeira resolução e renovação em
+    segundo plano depois que o TTL vence.
+
+    Args:
+        ttl: segundos até uma resposta ser renovada
+        timeout: máximo de segundos que resolver() espera quando não há cache
+    """
+
+    def __init__(self, ttl, timeout):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._entradas = {}    # host → (ip, resolvido_em)
+        self._pendentes = {}   # host → (thread, pid)
+        self._lock = threading.Lock()
+
+    def resolver(self, host):
+        """IPv4 do host, ou None se ainda não foi possível resolver a tempo."""
+        entrada = self._entradas.get(host)
+        if entrada is not None:
+            ip, resolvido_em = entrada
+            if time.monotonic() - resolvido_em >= self.ttl:
+                self._renovar(host)  # Devolve o IP antigo; o novo fica para a próxima
+            return ip
+
+        thread = self._renovar(host)
+        thread.join(self.timeout)
+        entrada = self._entradas.get(host)
+        return entrada[0] if entrada is not None else None
+
+    def _renovar(self, host):
+        """Inicia (ou reaproveita) a resolução do host em uma thread daemon."""
+        with self._lock:
+            pendente = self._pendentes.get(host)
+            if pendente is not None:
+                thread, pid = pendente
+                if thread.is_alive() and pid == os.getpid():
+                    return thread
+            thread = threading.Thread(
+                target=self._resolver_agora, args=(host,), name=f'dns-{host}', daemon=True
+            )
+            self._pendentes[host] = (thread, os.getpid())
+            thread.start()
+            return thread
+
+    def _resolver_agora(self, host):
+        try:
+            enderecos = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)
+            if enderecos:
+                self._entradas[host] = (enderecos[0][4][0], time.monotonic())
+        except OSError:
+            pass  # Mantém o último IP bom (se houver)
+        finally:
+            with self._lock:
+                self._pendentes.pop(host, None)
+
+    def limpar(self):
+        self._entradas.clear()
+
+
+def _eh_ip(host):
+    for familia in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(familia, host)
+            return True
+        except OSError:
+            pass
+    return False
@@ -0,0 +1,207 @@
+# ===================================================================================
+# 🚫 REVOGAÇÃO DE TOKENS JWT (LOGOUT) COM CHECAGEM EM MEMÓRIA
+# ===================================================================================
+# JWT é stateless: depois de emitido, o token vale até expirar. Para o logout
+# funcionar de verdade, o servidor precisa saber quais tokens (jti) foram revogados.
+#
+# O PROBLEMA:
+# -----------
+# Consultar a tabela token_revogado em TODA requisição com @jwt_required
+# = +1 ida ao banco por requisição só para responder "não" 99,99% das vezes.
+#
+# A SOLUÇÃO (por worker):
+# -----------------------
+# 1. Filtro de Bloom: bits em um bytearray. "Não está" é resposta definitiva →
+#    tokens válidos (quase todos) saem daqui sem tocar em mais nada.
+# 2. Conjunto exato {jti: expira_em}: só consultado quando o Bloom diz "talvez"
+#    (token revogado de verdade ou falso positivo raro).
+# 3. Sincronização incremental: a cada REVOGACAO_SINCRONIZAR_SEGUNDOS, UMA
+#    requisição do worker busca só as revogações novas (revogado_em > cursor).
+#    O logout feito no próprio worker entra na hora.
+#
+# EXPIRAÇÃO:
+# ----------
+# Token expirado já é recusado pela assinatura (exp) → a revogação dele não
+# precisa mais ser lembrada. Entradas vencidas saem do conjunto exato e o Bloom
+# (que não permite remoção) é reconstruído só com as que sobraram.
+#
+# 🎯 DESIGN PATTERN: CACHE + FILTRO PROBABILÍSTICO
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+
+class FiltroDeBloom:
+    """
+    Conjunto probabilístico: sem falso negativo, poucos falsos positivos.
+
+    Usa o hash() nativo da string (calculado em C e guardado na própria string)
+    com double hashing para gerar as k posições.
+    """
+
+    def __init__(self, bits, funcoes):
+        # Tamanho potência de 2 → posição com "& mascara" em vez de módulo
+        self.mascara = (1 << max(bits - 1, 1).bit_length()) - 1
+        self.funcoes = funcoes
+        self.bits = bytearray((self.mascara + 1) // 8 or 1)
+
+    def _posicoes(self, chave):
+        h = hash(chave)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) & self.mascara for i in range(self.funcoes)]
+
+    def adicionar(self, chave):
+        for posicao in self._posicoes(chave):
+            self.bits[posicao >> 3] |= 1 << (posicao & 7)
+
+    def talvez_contem(self, chave):
+        bits = self.bits
+        for posicao in self._posicoes(chave):
+            if not bits[posicao >> 3] & (1 << (posicao & 7)):
+                return False
+        return True
+
+
+class ListaDeRevogacao:
+    """
+    Extensão Flask: blocklist de tokens para o Flask-JWT-Extended.
+
+    Args (init_app):
+        jwt: JWTManager da aplicação (registra token_in_blocklist_loader)
+        modelo: tabela durável com colunas jti, expira_em e revogado_em
+    """
+
+    def init_app(self, app, db, jwt, modelo):
+        estado = _EstadoRevogacao(app, db, modelo)
+        app.extensions['revogacao'] = estado
+
+        @jwt.token_in_blocklist_loader
+        def token_revogado(jwt_header, jwt_payload):
+            return estado.revogado(jwt_payload['jti'])
+
+
+class _EstadoRevogacao:
+    """Bloom + conjunto exato de um worker e o cursor da sincronização."""
+
+    def __init__(self, app, db, modelo):
+        self.app = app
+        self.db = db
+        self.modelo = modelo
+        self._lock = threading.Lock()
+        self._sincronizando = threading.Lock()
+        self._reiniciar()
+
+    def _reiniciar(self):
+        config = self.app.config
+        self._bloom = FiltroDeBloom(config['REVOGACAO_BLOOM_BITS'], config['REVOGACAO_BLOOM_FUNCOES'])
+        self._exatos = {}        # jti → expira_em (datetime UTC sem tzinfo)
+        self._cursor = None      # maior revogado_em já lido do banco
+        self._proxima_sincronizacao = 0.0
+        self._proxima_limpeza = 0.0
+
+    # -------------------------------------------------------------------------
+    # Caminho quente (toda requisição autenticada)
+    # -------------------------------------------------------------------------
+    def revogado(self, jti):
+        agora = time.monotonic()
+        if agora >= self._proxima_sincronizacao:
+            self.sincronizar()
+        if not self._bloom.talvez_contem(jti):
+            return False
+        return jti in self._exatos
+
+    # -------------------------------------------------------------------------
+    # Escrita (logout)
+    # -------------------------------------------------------------------------
+    def revogar(self, jti, expira_em):
+        """
+        Grava a revogação no banco (durável, vale para todos os workers) e já
+        aplica neste worker. Idempotente: revogar o mesmo token duas vezes é ok.
+        """
+        expira_em = _utc_sem_tz(expira_em)
+        if self.db.session.get(self.modelo, jti) is None:
+            self.db.session.add(self.modelo(jti=jti, expira_em=expira_em, revogado_em=_agora()))
+            self.db.session.commit()
+        self._adicionar(jti, expira_em)
+
+    def _adicionar(self, jti, expira_em):
+        with self._lock:
+            if jti not in self._exatos:
+                self._exatos[jti] = expira_em
+                self._bloom.adicionar(jti)
+
+    # -------------------------------------------------------------------------
+    # Sincronização incremental com o banco
+    # -------------------------------------------------------------------------
+    def sincronizar(self):
+        """
+        Lê as revogações novas desde o último cursor.
+
+        Só uma thread por worker sincroniza; as outras seguem com o estado atual
+        (no máximo REVOGACAO_SINCRONIZAR_SEGUNDOS de atraso entre workers).
+        """
+        if not self._sincronizando.acquire(blocking=False):
+            return
+        try:
+            config = self.app.config
+            m = self.modelo
+            agora = _agora()
+            consulta = select(m.jti, m.expira_em, m.revogado_em).where(m.expira_em > agora)
+            if self._cursor is not None:
+                # Margem: uma transação que começou antes do cursor pode commitar depois
+                margem = timedelta(seconds=config['REVOGACAO_MARGEM_SEGUNDOS'])
+                consulta = consulta.where(m.revogado_em > self._cursor - margem)
+
+            try:
+                linhas = self.db.session.execute(consulta).all()
+            except Exception as e:
+                # Banco fora: mantém o que já está em memória e tenta na próxima janela
+                self.db.session.rollback()
+                self.app.logger.warning('Falha ao sincronizar tokens revogados: %s', e)
+                linhas = []
+
+            for jti, expira_em, revogado_em in linhas:
+                self._adicionar(jti, expira_em)
+                if self._cursor is None or revogado_em > self._cursor:
+                    self._cursor = revogado_em
+            if self._cursor is None:
+                self._cursor = agora
+
+            if time.monotonic() >= self._proxima_limpeza:
+                self._remover_expirados(agora)
+                self._proxima_limpeza = time.monotonic() + config['REVOGACAO_LIMPEZA_SEGUNDOS']
+            self._proxima_sincronizacao = time.monotonic() + config['REVOGACAO_SINCRONIZAR_SEGUNDOS']
+        finally:
+            self._sincronizando.release()
+
+    def _remover_expirados(self, agora):
+        """Esquece revogações de tokens já expirados e reconstrói o Bloom."""
+        with self._lock:
+            validos = {jti: exp for jti, exp in self._exatos.items() if exp > agora}
+            if len(validos) == len(self._exatos):
+                return
+            config = self.app.config
+            bloom = FiltroDeBloom(config['REVOGACAO_BLOOM_BITS'], config['REVOGACAO_BLOOM_FUNCOES'])
+            for jti in validos:
+                bloom.adicionar(jti)
+            self._exatos, self._bloom = validos, bloom
+
+    @property
+    def tamanho(self):
+        return len(self._exatos)
+
+
+def _agora():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _utc_sem_tz(momento):
+    """Colunas DateTime do projeto guardam UTC sem fuso (igual a agora_utc())."""
+    if isinstance(momento, (int, float)):
+        momento = datetime.fromtimestamp(momento, timezone.utc)
+    if momento.tzinfo is not None:
+        momento = momento.astimezone(timezone.utc).replace(tzinfo=None)
+    return momento
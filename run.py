@@ -23,7 +23,7 @@
 # run.py instancia app e roda servidor
 # Separação de responsabilidades (boas práticas)
 
-from app import create_app, db
+from app import create_app, db, logger
 import os
 
 # ===================================================================================
@@ -47,7 +47,6 @@ elif config_name == 'testing':
 else:
     config_class = 'config.DevelopmentConfig'  # Padrão
 
-print(f"🌍 Ambiente detectado: {config_class}")
 
 
 # ===================================================================================
@@ -61,7 +60,7 @@ print(f"🌍 Ambiente detectado: {config_class}")
 # - Evita imports circulares
 app = create_app(config_class)
 
-print(f"✅ Aplicação criada: {app.name}")
+logger.info("Aplicação criada: %s (%s)", app.name, config_class)
 
 
 # ===================================================================================
@@ -97,11 +96,9 @@ if __name__ == '__main__':
         # - Aplicar em produção sem downtime
         try:
             db.create_all()
-            print("✅ Banco de dados inicializado!")
-            print("📊 Tabelas disponíveis: usuario, tarefa")
+            logger.info("Banco de dados inicializado")
         except Exception as e:
-            print(f"⚠️  Erro ao inicializar banco: {e}")
-            print("💡 Verifique configuração do banco em config.py")
+            logger.warning("Erro ao inicializar banco: %s (verifique config.py)", e)
         
         # ===================================================================================
         # 📝 INFORMAÇÕES ÚTEIS NO TERMINAL
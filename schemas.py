@@ -22,11 +22,12 @@
 #
 # PADRÃO:
 # -------
-# 1. Cliente envia JSON
-# 2. Flask recebe em request.get_json()
-# 3. Pydantic valida: TarefaCreateSchema(**dados)
-# 4. Se inválido: levanta ValidationError → retorna 400
-# 5. Se válido: continua para banco de dados
+# 1. Cliente envia JSON (corpo limitado a MAX_CONTENT_LENGTH → 413 sem ler)
+# 2. Pydantic faz parse + validação dos BYTES em uma passada:
+#      TarefaCreateSchema.model_validate_json(request.get_data())
+#    (sem json.loads → dict → TarefaCreateSchema(**dados): o corpo era lido duas vezes)
+# 3. Se inválido (JSON quebrado ou regra violada): ValidationError → retorna 400
+# 4. Se válido: continua para banco de dados
 
 # ===================================================================================
 # 📦 IMPORTAÇÕES
@@ -84,6 +85,28 @@ class PrioridadeEnum(str, Enum):
     media = 'media'   # Importante mas não urgente (ex: estudar React)
     alta = 'alta'     # Urgente e importante (ex: bug em produção)
 
+    # CÓDIGO NO BANCO (coluna SMALLINT): 2 bytes em vez de 'media' (6+ bytes) por
+    # linha e por índice, e ORDER BY prioridade vira ordem de importância
+    # (alfabético seria alta < baixa < media).
+    @property
+    def codigo(self):
+        """PrioridadeEnum.alta.codigo → 3"""
+        return CODIGOS_PRIORIDADE[self]
+
+    @classmethod
+    def de_codigo(cls, codigo):
+        """PrioridadeEnum.de_codigo(3) → PrioridadeEnum.alta"""
+        return PRIORIDADES_POR_CODIGO[codigo]
+
+
+# Valores gravados no banco: NUNCA renumerar (os dados existentes usam estes códigos)
+CODIGOS_PRIORIDADE = {
+    PrioridadeEnum.baixa: 1,
+    PrioridadeEnum.media: 2,
+    PrioridadeEnum.alta: 3,
+}
+PRIORIDADES_POR_CODIGO = {codigo: p for p, codigo in CODIGOS_PRIORIDADE.items()}
+
 
 # ===================================================================================
 # ➕ SCHEMA DE CRIAÇÃO - POST /tarefas
@@ -220,6 +243,33 @@ class TarefaUpdateSchema(BaseModel):
     prioridade: Optional[PrioridadeEnum] = None
 
 
+# ===================================================================================
+# 🔐 SCHEMAS DE AUTENTICAÇÃO - POST /auth/register e /auth/login
+# ===================================================================================
+class RegistroSchema(BaseModel):
+    """
+    Schema do registro (POST /auth/register).
+
+    Antes: dados.get('email') sem checagem → corpo sem senha virava erro 500
+    no bcrypt. max_length do email = tamanho da coluna usuario.email.
+    """
+
+    email: constr(min_length=3, max_length=120, pattern=r'^[^@\s]+@[^@\s]+$')
+    senha: constr(min_length=1, max_length=200)
+
+
+class LoginSchema(BaseModel):
+    """
+    Schema do login (POST /auth/login).
+
+    Sem regra de formato (só compara com o banco), mas com limite de tamanho:
+    uma senha enorme não chega ao bcrypt.
+    """
+
+    email: constr(min_length=1, max_length=120)
+    senha: constr(min_length=1, max_length=200)
+
+
 # ===================================================================================
 # 📚 NOTAS ADICIONAIS
 # ===================================================================================
@@ -0,0 +1,108 @@
+# ===================================================================================
+# 📊 BENCHMARK: rotas de ns_tarefas com e sem cache de tokens verificados
+# ===================================================================================
+# Mede a latência das rotas autenticadas de /tarefas com o MESMO token (como uma
+# aba do navegador faz) duas vezes: JWT_CACHE_ATIVO desligado e ligado. A
+# diferença entre as duas é o custo de reverificar o token a cada requisição.
+#
+# USO (banco SQLite em memória, não precisa de nada rodando):
+#   python scripts/benchmark_cache_tokens.py --repeticoes 5000
+#
+# O QUE É MEDIDO:
+#   verificação → só decode_token() (o trabalho que o cache evita)
+#   GET /tarefas, GET /tarefas/<id>, GET /tarefas/changes → requisição inteira
+#   pelo test client (sem rede), para ver o ganho relativo ao total da rota.
+# Para cada um: p50, p95 e p99 em microssegundos e a economia média por requisição.
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import decode_token  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+
+class BenchmarkConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    COMPRESS_ENABLED = False
+
+
+def medir(funcao, repeticoes):
+    """Executa N vezes e devolve as latências em microssegundos."""
+    for _ in range(min(repeticoes, 200)):  # Aquecimento (caches do SQLAlchemy, imports)
+        funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1_000_000)
+    return tempos
+
+
+def percentis(tempos):
+    quantis = statistics.quantiles(tempos, n=100)
+    return quantis[49], quantis[94], quantis[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Latência das rotas de /tarefas com e sem JWT_CACHE_ATIVO'
+    )
+    parser.add_argument('--repeticoes', type=int, default=3_000)
+    parser.add_argument('--tarefas', type=int, default=20, help='tarefas do usuário do benchmark')
+    args = parser.parse_args()
+
+    app = create_app(BenchmarkConfig)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+
+    credenciais = {'email': 'benchmark@email.com', 'senha': 'senha123'}
+    client.post('/auth/register', json=credenciais)
+    token = client.post('/auth/login', json=credenciais).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    ids = [
+        client.post('/tarefas', json={'descricao': f'Tarefa {n}'}, headers=headers).get_json()['id']
+        for n in range(args.tarefas)
+    ]
+
+    def verificar():
+        with app.app_context():
+            decode_token(token)
+
+    cenarios = {
+        'verificação': verificar,
+        'GET /tarefas': lambda: client.get('/tarefas', headers=headers),
+        'GET /tarefas/<id>': lambda: client.get(f'/tarefas/{ids[0]}', headers=headers),
+        'GET /tarefas/changes': lambda: client.get('/tarefas/changes?since=0', headers=headers),
+    }
+
+    resultados = {}
+    for ativo in (False, True):
+        app.config['JWT_CACHE_ATIVO'] = ativo
+        app.extensions['cache_tokens'].limpar()
+        for nome, funcao in cenarios.items():
+            resultados[nome, ativo] = medir(funcao, args.repeticoes)
+
+    cache = app.extensions['cache_tokens']
+    print(f'\n{"cenário":<22} {"cache":<5} {"p50 µs":>9} {"p95 µs":>9} {"p99 µs":>9}')
+    for nome in cenarios:
+        for ativo in (False, True):
+            p50, p95, p99 = percentis(resultados[nome, ativo])
+            print(f'{nome:<22} {"on" if ativo else "off":<5} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f}')
+
+    print(f'\n{"cenário":<22} {"economia média por requisição":>30}')
+    for nome in cenarios:
+        sem, com = statistics.mean(resultados[nome, False]), statistics.mean(resultados[nome, True])
+        print(f'{nome:<22} {sem - com:>20.1f} µs ({(sem - com) / sem:>5.1%})')
+    print(f'\ncache: {cache.acertos} acertos, {cache.falhas} falhas, {cache.tamanho} token(s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+# ===================================================================================
+# 🌱 SEMEADOR: DADOS SINTÉTICOS EM VOLUME DE PRODUÇÃO (flask seed)
+# ===================================================================================
+# Problemas de desempenho (índice que não é usado, sort em memória, purga lenta)
+# só aparecem com milhões de linhas. Este módulo gera usuários e tarefas em massa
+# para benchmark e staging.
+#
+# POR QUE NÃO USAR A API OU O ORM?
+# --------------------------------
+# ❌ POST /auth/register: 1 bcrypt (~250 ms) + 1 INSERT por usuário → horas
+# ❌ db.session.add(): objeto Python + unit of work por linha
+# ✅ Hash da senha calculado UMA vez e repetido em todos os usuários
+# ✅ PostgreSQL: COPY ... FROM STDIN (CSV em lotes, o caminho mais rápido de carga)
+# ✅ Outros bancos: INSERT do Core em executemany (um comando por lote)
+#
+# DETERMINISTA:
+# -------------
+# Tudo sai de random.Random(seed): mesma seed + mesmo banco de partida = mesmos
+# dados (emails, quantidade de tarefas, prioridades, datas relativas ao início).
+#
+# FORMATO DOS DADOS:
+# ------------------
+# - Emails: {prefixo}{id}@seed.local (ids continuam depois do maior existente)
+# - Tarefas por usuário: 'fixa' (= média), 'uniforme' (0..2×média) ou
+#   'exponencial' (cauda longa: poucos usuários com muitas tarefas, como em produção)
+# - Prioridades sorteadas com os pesos de --prioridades (ex: baixa=60,media=30,alta=10)
+# - Frações de concluídas (com concluida_em no passado) e excluídas (soft delete)
+# - seq de cada tarefa e usuario.seq_mudancas coerentes com o feed de mudanças
+
+import csv
+import io
+import random
+import time
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from schemas import CODIGOS_PRIORIDADE
+
+DISTRIBUICOES = ('fixa', 'uniforme', 'exponencial')
+
+VERBOS = ('Revisar', 'Estudar', 'Comprar', 'Enviar', 'Organizar', 'Ligar para', 'Pagar', 'Agendar')
+OBJETOS = ('relatório', 'orçamento', 'consulta', 'documentação', 'reunião', 'contas', 'backup', 'proposta')
+
+COLUNAS_USUARIO = ('id', 'email', 'senha', 'seq_mudancas', 'seq_expurgo')
+COLUNAS_TAREFA = (
+    'descricao', 'concluida', 'prioridade', 'user_id', 'deleted_at', 'versao', 'seq', 'concluida_em'
+)
+
+
+def interpretar_prioridades(texto):
+    """'baixa=60,media=30,alta=10' → {'baixa': 60.0, ...} (pesos relativos)."""
+    pesos = {}
+    for parte in texto.split(','):
+        nome, _, peso = parte.partition('=')
+        nome = nome.strip()
+        if nome not in CODIGOS_PRIORIDADE:
+            raise ValueError(f"Prioridade desconhecida: '{nome}'")
+        pesos[nome] = float(peso or 1)
+    if not any(pesos.values()):
+        raise ValueError('Informe ao menos uma prioridade com peso maior que zero')
+    return pesos
+
+
+class Semeador:
+    """
+    Gera e grava os dados em lotes de usuários (cada lote = 1 COPY/INSERT por tabela).
+
+    Args:
+        db: Flask-SQLAlchemy (usa db.engine, fora da sessão do ORM)
+        tabela_usuario / tabela_tarefa: Table do Core (Usuario.__table__, Tarefa.__table__)
+        senha_hash: hash bcrypt já calculado, igual para todos os usuários
+        agora: referência das datas (concluida_em/deleted_at ficam no passado dela)
+    """
+
+    def __init__(self, db, tabela_usuario, tabela_tarefa, senha_hash, agora):
+        self.db = db
+        self.tabela_usuario = tabela_usuario
+        self.tabela_tarefa = tabela_tarefa
+        self.senha_hash = senha_hash
+        self.agora = agora
+
+    def semear(self, usuarios, media_tarefas, distribuicao='exponencial', prioridades=None,
+               concluidas=0.3, excluidas=0.0, dias=90, seed=42, prefixo='seed', lote=1000,
+               relatar=print):
+        """
+        Insere os dados e devolve {'usuarios': n, 'tarefas': n, 'segundos': s}.
+
+        relatar(mensagem) recebe o progresso a cada lote.
+        """
+        if distribuicao not in DISTRIBUICOES:
+            raise ValueError(f"Distribuição deve ser uma de {', '.join(DISTRIBUICOES)}")
+        pesos = prioridades or {'baixa': 50, 'media': 35, 'alta': 15}
+        rng = random.Random(seed)
+        nomes_prioridade, pesos_prioridade = list(pesos), list(pesos.values())
+
+        inicio = time.perf_counter()
+        total_tarefas = 0
+        with self.db.engine.begin() as conexao:
+            postgres = conexao.dialect.name == 'postgresql'
+            primeiro_id = conexao.execute(
+                select(func.coalesce(func.max(self.tabela_usuario.c.id), 0))
+            ).scalar() + 1
+
+            for bloco_inicio in range(0, usuarios, lote):
+                ids = range(primeiro_id + bloco_inicio, primeiro_id + min(bloco_inicio + lote, usuarios))
+                linhas_usuario, linhas_tarefa = [], []
+                for user_id in ids:
+                    quantidade = self._quantidade(rng, distribuicao, media_tarefas)
+                    linhas_usuario.append(
+                        (user_id, f'{prefixo}{user_id}@seed.local', self.senha_hash, quantidade, 0)
+                    )
+                    sorteadas = rng.choices(nomes_prioridade, pesos_prioridade, k=quantidade)
+                    for seq, prioridade in enumerate(sorteadas, 1):
+                        linhas_tarefa.append(
+                            self._tarefa(rng, user_id, seq, prioridade, concluidas, excluidas, dias)
+                        )
+
+                escrever = self._copiar if postgres else self._inserir
+                escrever(conexao, self.tabela_usuario, COLUNAS_USUARIO, linhas_usuario)
+                escrever(conexao, self.tabela_tarefa, COLUNAS_TAREFA, linhas_tarefa)
+                total_tarefas += len(linhas_tarefa)
+
+                feitos = bloco_inicio + len(ids)
+                decorrido = time.perf_counter() - inicio
+                relatar(
+                    f'   {feitos:,}/{usuarios:,} usuários, {total_tarefas:,} tarefas'
+                    f' ({(feitos + total_tarefas) / decorrido:,.0f} linhas/s)'
+                )
+
+            if postgres:
+                # ids de usuario vieram prontos: a sequence precisa pular para depois deles
+                usuario, tarefa = self.tabela_usuario.name, self.tabela_tarefa.name
+                conexao.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{usuario}', 'id'),"
+                    f" (SELECT max(id) FROM {usuario}))"
+                )
+                conexao.exec_driver_sql(f'ANALYZE {usuario}')
+                conexao.exec_driver_sql(f'ANALYZE {tarefa}')
+
+        return {'usuarios': usuarios, 'tarefas': total_tarefas, 'segundos': time.perf_counter() - inicio}
+
+    # -------------------------------------------------------------------------
+    # Geração
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _quantidade(rng, distribuicao, media):
+        if distribuicao == 'fixa' or media <= 0:
+            return max(int(media), 0)
+        if distribuicao == 'uniforme':
+            return rng.randint(0, 2 * int(media))
+        return int(rng.expovariate(1 / media))
+
+    def _tarefa(self, rng, user_id, seq, prioridade, concluidas, excluidas, dias):
+        descricao = f'{rng.choice(VERBOS)} {rng.choice(OBJETOS)} #{seq}'
+        concluida = rng.random() < concluidas
+        concluida_em = None
+        if concluida:
+            concluida_em = self.agora - timedelta(seconds=rng.uniform(0, dias * 86400))
+        deleted_at = None
+        if rng.random() < excluidas:
+            deleted_at = self.agora - timedelta(seconds=rng.uniform(0, 86400))
+        return (descricao, concluida, prioridade, user_id, deleted_at, 1, seq, concluida_em)
+
+    # -------------------------------------------------------------------------
+    # Escrita
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _copiar(conexao, tabela, colunas, linhas):
+        """
+        PostgreSQL: COPY FROM STDIN em CSV (campo vazio sem aspas = NULL).
+
+        Os valores passam pelo bind_processor de cada coluna (ex: PrioridadeTipo
+        'alta' → 3), o mesmo que um INSERT comum aplicaria.
+        """
+        if not linhas:
+            return
+        processadores = [
+            tabela.c[coluna].type.bind_processor(conexao.dialect) or (lambda valor: valor)
+            for coluna in colunas
+        ]
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for linha in linhas:
+            valores = (processar(valor) for processar, valor in zip(processadores, linha))
+            escritor.writerow(
+                '' if valor is None else ('t' if valor is True else 'f' if valor is False else valor)
+                for valor in valores
+            )
+        buffer.seek(0)
+        with conexao.connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {tabela.name} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+
+    @staticmethod
+    def _inserir(conexao, tabela, colunas, linhas):
+        """Demais bancos: INSERT do Core em executemany (um comando por lote)."""
+        if linhas:
+            conexao.execute(tabela.insert(), [dict(zip(colunas, linha)) for linha in linhas])
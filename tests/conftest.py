@@ -1,29 +1,123 @@
-import pytest
-from app import create_app, db
-from config import TestingConfig
-
-@pytest.fixture(scope='module')
-def app():
-    """Cria e configura uma instância da aplicação Flask para os testes."""
-    # Usa a factory para criar a app com a configuração de teste
-    flask_app = create_app(TestingConfig)
-
-    # Cria as tabelas do banco de dados antes de cada sessão de teste
-    with flask_app.app_context():
-        db.create_all()
-        yield flask_app # Disponibiliza a app para os testes
-        # Limpa o banco de dados depois de cada sessão de teste
-        db.session.remove()
-        db.drop_all()
-
-@pytest.fixture(scope='module')
-def client(app):
-    """Cria um cliente de teste para fazer requisições à API."""
-    return app.test_client()
-
-@pytest.fixture(scope='function')
-def init_database(app):
-    """Limpa e recria o banco de dados para cada teste."""
-    with app.app_context():
-        db.drop_all()
-        db.create_all()
\ No newline at end of file
+import os
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from app import create_app, db
+from config import TestingConfig
+
+
+# ===================================================================================
+# Banco por worker (suíte em processos paralelos: pytest -n 4 com pytest-xdist)
+# ===================================================================================
+# Sem TEST_DATABASE_URL: SQLite em memória → cada processo já tem o seu banco.
+# Com TEST_DATABASE_URL (ex: PostgreSQL de CI): cada worker usa um banco próprio
+# com o nome do worker como sufixo (tarefas_test_gw0, tarefas_test_gw1, ...),
+# criado na hora se não existir → workers não pisam nos dados uns dos outros.
+
+def url_do_banco_do_worker():
+    base = os.getenv('TEST_DATABASE_URL')
+    if not base:
+        return TestingConfig.SQLALCHEMY_DATABASE_URI
+
+    worker = os.getenv('PYTEST_XDIST_WORKER', 'gw0')
+    url = make_url(base)
+    if url.get_backend_name() == 'sqlite':
+        raiz, extensao = os.path.splitext(url.database)
+        return url.set(database=f'{raiz}_{worker}{extensao}').render_as_string(hide_password=False)
+
+    nome = f'{url.database}_{worker}'
+    administrativo = create_engine(url.set(database='postgres'), isolation_level='AUTOCOMMIT')
+    with administrativo.connect() as conexao:
+        existe = conexao.execute(
+            text('SELECT 1 FROM pg_database WHERE datname = :nome'), {'nome': nome}
+        ).scalar()
+        if not existe:
+            conexao.execute(text(f'CREATE DATABASE "{nome}"'))
+    administrativo.dispose()
+    return url.set(database=nome).render_as_string(hide_password=False)
+
+
+@pytest.fixture(scope='session')
+def config_de_teste():
+    """TestingConfig apontando para o banco deste worker."""
+    return type('TestingConfigDoWorker', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': url_do_banco_do_worker(),
+    })
+
+
+@pytest.fixture(scope='module')
+def app(config_de_teste):
+    """Cria e configura uma instância da aplicação Flask para os testes."""
+    # Usa a factory para criar a app com a configuração de teste
+    flask_app = create_app(config_de_teste)
+
+    # Cria as tabelas do banco de dados antes de cada sessão de teste
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app # Disponibiliza a app para os testes
+        # Limpa o banco de dados depois de cada sessão de teste
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture(scope='module')
+def client(app):
+    """Cria um cliente de teste para fazer requisições à API."""
+    return app.test_client()
+
+
+# ===================================================================================
+# Isolamento transacional por teste
+# ===================================================================================
+# Em vez de drop_all()/create_all() a cada teste (recria tabelas e índices),
+# o teste roda dentro de UMA transação da conexão, desfeita no final:
+#
+#   BEGIN                          ← aberta pela fixture
+#     SAVEPOINT / RELEASE ...      ← cada db.session.commit() da app vira um savepoint
+#   ROLLBACK                       ← nada do teste chega ao banco
+#
+# Limitação: só enxerga o que passa por db.session. Código que abre conexão
+# própria (db.engine.begin(): flask seed, VACUUM, threads em segundo plano)
+# grava fora da transação → testes desses caminhos usam o banco do módulo.
+
+@pytest.fixture(scope='function')
+def sessao_transacional(app):
+    """db.session presa a uma transação desfeita ao final do teste."""
+    with app.app_context():
+        conexao = db.engine.connect()
+        sqlite = conexao.dialect.name == 'sqlite'
+        if sqlite:
+            # pysqlite abre/fecha transações por conta própria e quebra SAVEPOINT:
+            # desliga esse controle e deixa o SQLAlchemy emitir o BEGIN
+            driver = conexao.connection.dbapi_connection
+            isolamento_original = driver.isolation_level
+            driver.isolation_level = None
+            event.listen(conexao, 'begin', lambda c: c.exec_driver_sql('BEGIN'))
+
+        transacao = conexao.begin()
+        sessao_original = db.session
+        # Mesmo escopo do Flask-SQLAlchemy (por app context): um app_context()
+        # aninhado (ex: eventos.py) ganha sessão própria e o teardown dele não
+        # fecha a sessão do teste
+        db.session = scoped_session(sessionmaker(
+            bind=conexao,
+            join_transaction_mode='create_savepoint',
+            query_cls=db.Query,
+        ), scopefunc=sessao_original.registry.scopefunc)
+        try:
+            yield db.session
+        finally:
+            db.session.remove()
+            db.session = sessao_original
+            transacao.rollback()
+            if sqlite:
+                driver.isolation_level = isolamento_original
+            conexao.close()
+
+
+@pytest.fixture(scope='function')
+def init_database(sessao_transacional):
+    """Banco limpo para o teste: tudo que ele gravar é desfeito no final."""
+    return sessao_transacional
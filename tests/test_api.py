@@ -238,4 +238,966 @@ def test_deletar_tarefa(client):
 
     # Verifica que a tarefa não existe mais
     get_response = client.get(f'/tarefas/{tarefa_id}', headers=headers)
-    assert get_response.status_code == 404
\ No newline at end of file
+    assert get_response.status_code == 404
+
+
+def test_usuario_nao_altera_nem_deleta_tarefa_de_outro(client, init_database):
+    """Testa se PUT/DELETE/GET em tarefa de outro usuário retornam 404."""
+    client.post('/auth/register', json={"email": "dono@email.com", "senha": "senha123"})
+    login_dono = client.post('/auth/login', json={"email": "dono@email.com", "senha": "senha123"})
+    headers_dono = {'Authorization': f"Bearer {login_dono.get_json()['access_token']}"}
+
+    client.post('/auth/register', json={"email": "intruso@email.com", "senha": "senha123"})
+    login_intruso = client.post('/auth/login', json={"email": "intruso@email.com", "senha": "senha123"})
+    headers_intruso = {'Authorization': f"Bearer {login_intruso.get_json()['access_token']}"}
+
+    tarefa_id = client.post('/tarefas', headers=headers_dono, json={
+        "descricao": "Tarefa privada",
+        "prioridade": "baixa"
+    }).get_json()['id']
+
+    assert client.get(f'/tarefas/{tarefa_id}', headers=headers_intruso).status_code == 404
+    assert client.put(f'/tarefas/{tarefa_id}', headers=headers_intruso, json={"concluida": True}).status_code == 404
+    assert client.delete(f'/tarefas/{tarefa_id}', headers=headers_intruso).status_code == 404
+
+    # A tarefa continua intacta para o dono
+    tarefa = client.get(f'/tarefas/{tarefa_id}', headers=headers_dono).get_json()
+    assert tarefa['concluida'] == False
+
+
+def test_if_match_com_versao_antiga_retorna_412(client, init_database):
+    """Testa a concorrência otimista: ETag no GET e If-Match no PUT/DELETE."""
+    client.post('/auth/register', json={"email": "etag@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "etag@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    tarefa_id = client.post('/tarefas', headers=headers, json={
+        "descricao": "Tarefa disputada",
+        "prioridade": "baixa"
+    }).get_json()['id']
+
+    etag = client.get(f'/tarefas/{tarefa_id}', headers=headers).headers['ETag']
+    assert etag == '"1"'
+
+    # Aba 1 salva com a versão atual → sucesso e nova versão
+    aba1 = client.put(f'/tarefas/{tarefa_id}', headers={**headers, 'If-Match': etag},
+                      json={"descricao": "Editada na aba 1"})
+    assert aba1.status_code == 200
+    assert aba1.headers['ETag'] == '"2"'
+    assert aba1.get_json()['versao'] == 2
+
+    # Aba 2 ainda tem a versão antiga → 412 e nada é sobrescrito
+    aba2 = client.put(f'/tarefas/{tarefa_id}', headers={**headers, 'If-Match': etag},
+                      json={"descricao": "Editada na aba 2"})
+    assert aba2.status_code == 412
+    assert client.delete(f'/tarefas/{tarefa_id}', headers={**headers, 'If-Match': etag}).status_code == 412
+    assert client.get(f'/tarefas/{tarefa_id}', headers=headers).get_json()['descricao'] == "Editada na aba 1"
+
+    # Sem If-Match continua funcionando (última escrita vence)
+    assert client.delete(f'/tarefas/{tarefa_id}', headers=headers).status_code == 204
+
+
+def test_deletar_tarefa_e_soft_delete_ate_a_purga(client, app, init_database, monkeypatch):
+    """Testa se DELETE só marca deleted_at e a purga remove a linha depois."""
+    from app import Tarefa, db
+
+    client.post('/auth/register', json={"email": "purga@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "purga@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    tarefa_id = client.post('/tarefas', headers=headers, json={
+        "descricao": "Tarefa para purgar",
+        "prioridade": "baixa"
+    }).get_json()['id']
+    assert client.delete(f'/tarefas/{tarefa_id}', headers=headers).status_code == 204
+
+    # Some da API, mas a linha continua no banco com deleted_at preenchido
+    assert client.get('/tarefas', headers=headers).get_json() == []
+    assert client.delete(f'/tarefas/{tarefa_id}', headers=headers).status_code == 404
+    with app.app_context():
+        assert db.session.get(Tarefa, tarefa_id).deleted_at is not None
+
+    # Purga com retenção zero remove fisicamente
+    monkeypatch.setitem(app.config, 'PURGA_RETENCAO_SEGUNDOS', 0)
+    resultados = app.extensions['manutencao'].executar(deve_continuar=lambda: True)
+    assert resultados['purgar_tarefas_excluidas'] >= 1
+    with app.app_context():
+        assert db.session.get(Tarefa, tarefa_id) is None
+
+
+# ===================================================================================
+# Testes de Compressão
+# ===================================================================================
+
+def test_resposta_grande_e_comprimida_com_gzip(client, init_database):
+    """Testa se respostas grandes saem comprimidas quando o cliente aceita gzip."""
+    import gzip
+    import json
+
+    response = client.get('/swagger.json', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    spec = json.loads(gzip.decompress(response.data))
+    assert '/tarefas' in spec['paths']
+
+
+def test_resposta_pequena_ou_sem_accept_encoding_nao_e_comprimida(client, init_database):
+    """Testa o limite mínimo de tamanho e a negociação via Accept-Encoding."""
+    pequena = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in pequena.headers
+
+    sem_negociacao = client.get('/swagger.json')
+    assert 'Content-Encoding' not in sem_negociacao.headers
+    assert sem_negociacao.get_json()['paths']
+
+
+# ===================================================================================
+# Testes de Coalescência de Escritas
+# ===================================================================================
+
+def test_puts_coalescidos_sao_lidos_antes_e_gravados_depois_do_flush(client, app, init_database, monkeypatch):
+    """Testa leitura após escrita com PUTs em memória e o flush em lote."""
+    from app import Tarefa, db
+
+    client.post('/auth/register', json={"email": "coalesce@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "coalesce@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    tarefa_id = client.post('/tarefas', headers=headers, json={
+        "descricao": "Tarefa alternada",
+        "prioridade": "baixa"
+    }).get_json()['id']
+
+    escritas = app.extensions['coalescencia']
+    monkeypatch.setitem(app.config, 'COALESCENCIA_ATIVA', True)
+    monkeypatch.setitem(app.config, 'COALESCENCIA_JANELA_MS', 60_000)  # flush só manual
+
+    for concluida in (True, False, True):
+        response = client.put(f'/tarefas/{tarefa_id}', headers=headers, json={"concluida": concluida})
+        assert response.status_code == 200
+    client.put(f'/tarefas/{tarefa_id}', headers=headers, json={"prioridade": "alta"})
+
+    # Ainda não gravado no banco, mas visível para o mesmo processo
+    with app.app_context():
+        assert db.session.get(Tarefa, tarefa_id).concluida == False
+    tarefa = client.get(f'/tarefas/{tarefa_id}', headers=headers).get_json()
+    assert tarefa['concluida'] == True
+    assert tarefa['prioridade'] == 'alta'
+    assert client.get('/tarefas', headers=headers).get_json()[0]['concluida'] == True
+
+    # parar() drena o buffer (mesmo caminho do shutdown)
+    escritas.parar()
+    with app.app_context():
+        gravada = db.session.get(Tarefa, tarefa_id)
+        assert gravada.concluida == True
+        assert gravada.prioridade == 'alta'
+        assert gravada.versao == 2  # 4 PUTs → 1 UPDATE gravado
+
+
+def test_flushes_simultaneos_nao_escondem_o_lote_em_gravacao(app, monkeypatch):
+    """Testa que um segundo descarregar() espera o primeiro em vez de sobrescrever o lote em gravação."""
+    import threading
+
+    escritas = app.extensions['coalescencia']
+    dentro_do_flush, liberar = threading.Event(), threading.Event()
+
+    def antes_de_gravar_lento(quantidades):
+        dentro_do_flush.set()
+        liberar.wait(5)
+
+    monkeypatch.setattr(escritas, 'antes_de_gravar', antes_de_gravar_lento)
+    monkeypatch.setattr(escritas, 'depois_de_gravar', lambda user_ids: None)
+
+    escritas.registrar(999_001, 999_001, {'concluida': True})
+    primeiro = threading.Thread(target=escritas.descarregar)
+    primeiro.start()
+    assert dentro_do_flush.wait(5)
+
+    escritas.registrar(999_002, 999_002, {'concluida': True})
+    segundo = threading.Thread(target=escritas.descarregar)
+    segundo.start()
+    segundo.join(0.2)
+
+    # O segundo flush espera: o lote do primeiro continua visível até o COMMIT
+    assert segundo.is_alive()
+    assert escritas.pendente(999_001, 999_001)
+    assert escritas.pendente(999_002, 999_002)
+
+    liberar.set()
+    primeiro.join(5)
+    segundo.join(5)
+    assert not escritas.pendente(999_001, 999_001)
+    assert not escritas.pendente(999_002, 999_002)
+
+
+def test_queda_do_banco_na_regravacao_individual_devolve_o_lote(app, monkeypatch):
+    """Testa que um OperationalError no fallback uma-a-uma não perde PUTs nem mata o flusher."""
+    import threading
+    from sqlalchemy.exc import IntegrityError, OperationalError
+
+    escritas = app.extensions['coalescencia']
+    falhas = [
+        IntegrityError('UPDATE tarefa', {}, Exception('lote com dado inválido')),
+        OperationalError('UPDATE tarefa', {}, Exception('conexão perdida')),
+    ]
+
+    def antes_de_gravar(quantidades):
+        if falhas:
+            raise falhas.pop(0)
+
+    monkeypatch.setattr(escritas, 'antes_de_gravar', antes_de_gravar)
+    monkeypatch.setattr(escritas, 'depois_de_gravar', lambda user_ids: None)
+
+    escritas.registrar(999_101, 999_101, {'concluida': True})
+    escritas.registrar(999_101, 999_102, {'concluida': True})
+    assert escritas.descarregar() == 0
+    # Já respondidos com 200: continuam pendentes para a próxima janela
+    assert escritas.pendente(999_101, 999_101)
+    assert escritas.pendente(999_101, 999_102)
+    assert escritas.descarregar() == 2
+    assert not escritas.pendente(999_101, 999_102)
+
+    # Erro inesperado no flush não derruba a thread
+    chamadas = []
+    segunda = threading.Event()
+
+    def descarregar_instavel():
+        chamadas.append(1)
+        if len(chamadas) == 1:
+            raise RuntimeError('falha inesperada')
+        segunda.set()
+        return 0
+
+    monkeypatch.setattr(escritas, 'descarregar', descarregar_instavel)
+    monkeypatch.setitem(app.config, 'COALESCENCIA_JANELA_MS', 1)
+    monkeypatch.setattr(escritas, '_parar', threading.Event())
+    fluxo = threading.Thread(target=escritas._loop)
+    fluxo.start()
+    assert segunda.wait(5)
+    escritas._parar.set()
+    fluxo.join(5)
+
+
+# ===================================================================================
+# Testes do Feed de Mudanças (Delta Sync)
+# ===================================================================================
+
+def test_feed_de_mudancas_devolve_so_o_que_mudou_apos_o_cursor(client, app, init_database, monkeypatch):
+    """Testa carga inicial, delta com upsert/delete e resync após a purga."""
+    client.post('/auth/register', json={"email": "feed@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "feed@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    ids = [
+        client.post('/tarefas', headers=headers, json={"descricao": f"Tarefa {n}"}).get_json()['id']
+        for n in range(3)
+    ]
+
+    # Carga inicial: todas as tarefas, cursor = última mudança
+    inicial = client.get('/tarefas/changes?since=0', headers=headers).get_json()
+    assert [m['tarefa']['id'] for m in inicial['mudancas']] == ids
+    assert inicial['resync'] is False
+    cursor = inicial['cursor']
+
+    # Nada mudou → delta vazio e mesmo cursor
+    vazio = client.get(f'/tarefas/changes?since={cursor}', headers=headers).get_json()
+    assert vazio['mudancas'] == [] and vazio['cursor'] == cursor
+
+    client.put(f'/tarefas/{ids[0]}', headers=headers, json={"concluida": True})
+    client.delete(f'/tarefas/{ids[1]}', headers=headers)
+    delta = client.get(f'/tarefas/changes?since={cursor}', headers=headers).get_json()
+    assert [(m['op'], m.get('id') or m['tarefa']['id']) for m in delta['mudancas']] == [
+        ('upsert', ids[0]), ('delete', ids[1]),
+    ]
+    assert delta['mudancas'][0]['tarefa']['concluida'] is True
+
+    # Paginação com limit
+    pagina = client.get(f'/tarefas/changes?since={cursor}&limit=1', headers=headers).get_json()
+    assert pagina['tem_mais'] is True and len(pagina['mudancas']) == 1
+
+    # Purga remove o tombstone → cursor antigo precisa recarregar tudo
+    monkeypatch.setitem(app.config, 'PURGA_RETENCAO_SEGUNDOS', 0)
+    app.extensions['manutencao'].executar(deve_continuar=lambda: True)
+    resync = client.get(f'/tarefas/changes?since={cursor}', headers=headers).get_json()
+    assert resync['resync'] is True
+    atual = client.get(f"/tarefas/changes?since={delta['cursor']}", headers=headers).get_json()
+    assert atual['resync'] is False and atual['mudancas'] == []
+
+
+def test_feed_pagina_lote_coalescido_sem_pular_mudancas(client, app, init_database, monkeypatch):
+    """Testa que cada tarefa de um flush coalescido ganha o próprio seq e a paginação não perde nenhuma."""
+    client.post('/auth/register', json={"email": "feedlote@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "feedlote@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    ids = [
+        client.post('/tarefas', headers=headers, json={"descricao": f"Tarefa {n}"}).get_json()['id']
+        for n in range(3)
+    ]
+    cursor = client.get('/tarefas/changes?since=0', headers=headers).get_json()['cursor']
+
+    monkeypatch.setitem(app.config, 'COALESCENCIA_ATIVA', True)
+    monkeypatch.setitem(app.config, 'COALESCENCIA_JANELA_MS', 60_000)  # flush só manual
+    for tarefa_id in ids:
+        client.put(f'/tarefas/{tarefa_id}', headers=headers, json={"concluida": True})
+
+    # O feed descarrega o lote (1 transação) e pagina de 1 em 1
+    vistas = []
+    while True:
+        pagina = client.get(f'/tarefas/changes?since={cursor}&limit=1', headers=headers).get_json()
+        vistas += [m['tarefa']['id'] for m in pagina['mudancas']]
+        cursor = pagina['cursor']
+        if not pagina['tem_mais']:
+            break
+    assert sorted(vistas) == ids
+
+
+# ===================================================================================
+# Testes de Eventos em Tempo Real (SSE)
+# ===================================================================================
+
+def test_stream_envia_mudancas_e_respeita_limite_de_conexoes(client, app, init_database, monkeypatch):
+    """Testa o push de mudanças via SSE, o heartbeat e o 503 acima do limite."""
+    import json
+
+    monkeypatch.setitem(app.config, 'EVENTOS_HEARTBEAT_SEGUNDOS', 0.05)
+    monkeypatch.setitem(app.config, 'EVENTOS_MAX_CONEXOES', 1)
+
+    client.post('/auth/register', json={"email": "stream@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "stream@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    stream = client.get('/tarefas/stream', headers=headers, buffered=False)
+    assert stream.status_code == 200
+    assert stream.mimetype == 'text/event-stream'
+    eventos = iter(stream.response)
+    assert next(eventos).startswith(b'retry:')
+    assert next(eventos) == b': ping\n\n'  # Sem mudanças → heartbeat
+
+    # Segundo stream no mesmo worker passa do limite
+    recusado = client.get('/tarefas/stream', headers=headers)
+    assert recusado.status_code == 503
+    assert recusado.headers['Retry-After']
+
+    tarefa_id = client.post('/tarefas', headers=headers, json={"descricao": "Vai pelo stream"}).get_json()['id']
+    evento = next(eventos).decode()
+    while evento.startswith(':'):
+        evento = next(eventos).decode()
+    linhas = dict(linha.split(': ', 1) for linha in evento.strip().split('\n'))
+    assert linhas['event'] == 'mudancas'
+    dados = json.loads(linhas['data'])
+    assert [m['tarefa']['id'] for m in dados['mudancas']] == [tarefa_id]
+    assert linhas['id'] == str(dados['cursor'])
+
+    # Fechar a conexão libera a vaga
+    stream.close()
+    assert app.extensions['eventos'].conexoes == 0
+
+
+def test_limite_de_streams_acompanha_as_threads_do_worker_gunicorn():
+    """Testa que em sync/gthread os streams nunca ocupam todas as threads do worker."""
+    import importlib.util
+    import os
+    from types import SimpleNamespace
+
+    caminho = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'gunicorn.conf.py')
+    especificacao = importlib.util.spec_from_file_location('gunicorn_conf', caminho)
+    conf = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(conf)
+
+    def limite_no_worker(worker_class, threads):
+        flask_app = SimpleNamespace(config={'EVENTOS_MAX_CONEXOES': 100})
+        cfg = SimpleNamespace(worker_class_str=worker_class, threads=threads)
+        conf.post_worker_init(SimpleNamespace(wsgi=flask_app, cfg=cfg))
+        return flask_app.config['EVENTOS_MAX_CONEXOES']
+
+    assert limite_no_worker('gthread', 4) == 3
+    assert limite_no_worker('sync', 1) == 0  # Stream sempre 503: não prende o único processo
+    assert limite_no_worker('gevent', 4) == 100
+
+
+# ===================================================================================
+# Testes de Prioridade (SMALLINT no banco, texto na API)
+# ===================================================================================
+
+def test_prioridade_gravada_como_codigo_e_ordenada_por_importancia(client, app, init_database):
+    """Testa o código numérico no banco e GET /tarefas?ordem=prioridade."""
+    from app import db
+
+    client.post('/auth/register', json={"email": "prioridade@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "prioridade@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    for descricao, prioridade in [("Média", "media"), ("Baixa", "baixa"), ("Alta", "alta")]:
+        response = client.post('/tarefas', headers=headers, json={"descricao": descricao, "prioridade": prioridade})
+        assert response.get_json()['prioridade'] == prioridade
+
+    with app.app_context():
+        codigos = db.session.execute(db.text('SELECT prioridade FROM tarefa ORDER BY id')).scalars().all()
+    assert codigos[-3:] == [2, 1, 3]
+
+    ordenadas = client.get('/tarefas?ordem=prioridade', headers=headers).get_json()
+    assert [t['prioridade'] for t in ordenadas] == ['alta', 'media', 'baixa']
+    padrao = client.get('/tarefas', headers=headers).get_json()
+    assert [t['descricao'] for t in padrao] == ["Média", "Baixa", "Alta"]
+    assert client.get('/tarefas?ordem=descricao', headers=headers).status_code == 400
+
+
+# ===================================================================================
+# Testes de Arquivamento (tarefa → tarefa_arquivada)
+# ===================================================================================
+
+def test_concluidas_antigas_sao_arquivadas_e_voltam_no_update(client, app, init_database, monkeypatch):
+    """Testa o job de arquivamento, ?incluir_arquivadas=true e o desarquivamento no PUT."""
+    client.post('/auth/register', json={"email": "arquivo@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "arquivo@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    antiga = client.post('/tarefas', headers=headers, json={"descricao": "Concluída antiga"}).get_json()['id']
+    pendente = client.post('/tarefas', headers=headers, json={"descricao": "Ainda pendente"}).get_json()['id']
+    client.put(f'/tarefas/{antiga}', headers=headers, json={"concluida": True})
+    cursor = client.get('/tarefas/changes?since=0', headers=headers).get_json()['cursor']
+
+    monkeypatch.setitem(app.config, 'ARQUIVO_APOS_DIAS', 0)
+    resultados = app.extensions['manutencao'].executar(deve_continuar=lambda: True)
+    assert resultados['arquivar_tarefas_concluidas'] >= 1
+
+    # Arquivada não deixa tombstone: quem tinha cursor recarrega (resync)
+    assert client.get(f'/tarefas/changes?since={cursor}', headers=headers).get_json()['resync'] is True
+    recarga = client.get('/tarefas/changes?since=0', headers=headers).get_json()
+    assert [m['tarefa']['id'] for m in recarga['mudancas']] == [pendente]
+
+    # Listagem padrão lê só a tabela quente
+    assert [t['id'] for t in client.get('/tarefas', headers=headers).get_json()] == [pendente]
+    todas = client.get('/tarefas?incluir_arquivadas=true', headers=headers).get_json()
+    assert [(t['id'], t['arquivada']) for t in todas] == [(antiga, True), (pendente, False)]
+    assert client.get(f'/tarefas/{antiga}', headers=headers).get_json()['arquivada'] is True
+
+    # PUT em tarefa arquivada devolve para a tabela quente
+    reaberta = client.put(f'/tarefas/{antiga}', headers=headers, json={"concluida": False})
+    assert reaberta.status_code == 200
+    assert reaberta.get_json()['arquivada'] is False
+    assert sorted(t['id'] for t in client.get('/tarefas', headers=headers).get_json()) == [antiga, pendente]
+    assert len(client.get('/tarefas?incluir_arquivadas=true', headers=headers).get_json()) == 2
+
+
+# ===================================================================================
+# Testes de Logout (revogação de tokens)
+# ===================================================================================
+
+def test_logout_revoga_o_token_e_sincroniza_revogacoes_de_outros_workers(client, app, init_database, monkeypatch):
+    """Testa POST /auth/logout e a leitura incremental da tabela token_revogado."""
+    from datetime import timedelta
+    from app import TokenRevogado, agora_utc, db
+
+    client.post('/auth/register', json={"email": "logout@email.com", "senha": "senha123"})
+    tokens = [
+        client.post('/auth/login', json={"email": "logout@email.com", "senha": "senha123"}).get_json()['access_token']
+        for _ in range(2)
+    ]
+    headers, outro = ({'Authorization': f'Bearer {t}'} for t in tokens)
+
+    assert client.post('/auth/logout', headers=headers).status_code == 200
+    assert client.get('/auth/me', headers=headers).status_code == 401
+    assert client.get('/tarefas', headers=headers).status_code == 401
+    assert client.get('/auth/me', headers=outro).status_code == 200  # Só o token do logout cai
+
+    # Revogação gravada por "outro worker" (direto no banco) chega na próxima sincronização
+    from flask_jwt_extended import decode_token
+    with app.app_context():
+        jti = decode_token(tokens[1])['jti']
+        db.session.add(TokenRevogado(
+            jti=jti,
+            expira_em=agora_utc() + timedelta(hours=1),
+            revogado_em=agora_utc(),
+        ))
+        db.session.commit()
+    monkeypatch.setattr(app.extensions['revogacao'], '_proxima_sincronizacao', 0.0)
+    assert client.get('/auth/me', headers=outro).status_code == 401
+
+
+# ===================================================================================
+# Testes do Cache de Tokens Verificados
+# ===================================================================================
+
+def test_cache_de_tokens_reaproveita_verificacao_e_respeita_revogacao_e_troca_de_chave(client, app, init_database, monkeypatch):
+    """Testa JWT_CACHE_ATIVO: acerto no cache, logout e troca da JWT_SECRET_KEY."""
+    monkeypatch.setitem(app.config, 'JWT_CACHE_ATIVO', True)
+    cache = app.extensions['cache_tokens']
+
+    client.post('/auth/register', json={"email": "cache@email.com", "senha": "senha123"})
+    tokens = [
+        client.post('/auth/login', json={"email": "cache@email.com", "senha": "senha123"}).get_json()['access_token']
+        for _ in range(2)
+    ]
+    headers, outro = ({'Authorization': f'Bearer {t}'} for t in tokens)
+
+    acertos = cache.acertos
+    assert client.get('/auth/me', headers=headers).get_json()['email'] == "cache@email.com"
+    assert client.get('/tarefas', headers=headers).status_code == 200
+    assert cache.acertos == acertos + 1  # 2ª requisição com o mesmo token não reverifica
+
+    # Revogação continua valendo para token que está no cache
+    assert client.post('/auth/logout', headers=headers).status_code == 200
+    assert client.get('/tarefas', headers=headers).status_code == 401
+
+    # Chave trocada: a verificação antiga não vale mais
+    assert client.get('/tarefas', headers=outro).status_code == 200
+    monkeypatch.setitem(app.config, 'JWT_SECRET_KEY', 'outra-chave-de-teste-com-mais-de-32-bytes')
+    assert client.get('/tarefas', headers=outro).status_code == 422
+
+
+# ===================================================================================
+# Testes de Email sem Diferenciar Maiúsculas
+# ===================================================================================
+
+def test_email_nao_diferencia_maiusculas_no_registro_login_e_me(client, init_database):
+    """Testa registro atômico (409 em conflito) e busca por lower(email)."""
+    resposta = client.post('/auth/register', json={"email": "Caixa@Email.com", "senha": "senha123"})
+    assert resposta.status_code == 201
+
+    for email in ("Caixa@Email.com", "caixa@email.com"):
+        resposta = client.post('/auth/register', json={"email": email, "senha": "outra456"})
+        assert resposta.status_code == 409
+
+    resposta = client.post('/auth/login', json={"email": "CAIXA@email.COM", "senha": "senha123"})
+    assert resposta.status_code == 200
+    headers = {'Authorization': f"Bearer {resposta.get_json()['access_token']}"}
+
+    me = client.get('/auth/me', headers=headers).get_json()
+    assert me['email'] == "Caixa@Email.com"  # Guardado como foi registrado
+    assert client.get('/tarefas', headers=headers).status_code == 200
+
+    # Token antigo (sem a claim uid) com o email em outra caixa: mesma regra do login
+    from flask_jwt_extended import create_access_token
+    with client.application.app_context():
+        antigo = {'Authorization': f"Bearer {create_access_token(identity='caixa@email.com')}"}
+    assert client.get('/auth/me', headers=antigo).get_json()['id'] == me['id']
+    assert client.post('/tarefas', headers=antigo, json={"descricao": "Token antigo"}).status_code == 201
+    assert [t['descricao'] for t in client.get('/tarefas', headers=antigo).get_json()] == ["Token antigo"]
+    assert client.get('/tarefas/changes?since=0', headers=antigo).status_code == 200
+
+
+# ===================================================================================
+# Testes do Semeador (flask seed)
+# ===================================================================================
+
+def test_flask_seed_gera_usuarios_e_tarefas_que_funcionam_na_api(client, app):
+    """Testa o comando flask seed: volumes, senha compartilhada e seq coerente."""
+    from app import Tarefa, Usuario
+
+    resultado = app.test_cli_runner().invoke(args=[
+        'seed', '--usuarios', '20', '--tarefas', '3', '--distribuicao', 'fixa',
+        '--prefixo', 'cli', '--concluidas', '0', '--lote', '7',
+    ])
+    assert resultado.exit_code == 0, resultado.output
+    assert 'linhas/s' in resultado.output
+
+    with app.app_context():
+        usuario = Usuario.query.filter(Usuario.email.like('cli%@seed.local')).first()
+        assert Usuario.query.filter(Usuario.email.like('cli%@seed.local')).count() == 20
+        assert Tarefa.query.filter_by(user_id=usuario.id).count() == 3
+        assert usuario.seq_mudancas == 3
+        email = usuario.email
+
+    resposta = client.post('/auth/login', json={"email": email, "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {resposta.get_json()['access_token']}"}
+    tarefas = client.get('/tarefas', headers=headers).get_json()
+    assert len(tarefas) == 3
+    assert all(t['prioridade'] in ('baixa', 'media', 'alta') for t in tarefas)
+
+
+# ===================================================================================
+# Testes dos Comandos Administrativos (flask admin)
+# ===================================================================================
+
+def test_flask_admin_conta_lista_e_agrupa_no_banco(client, app):
+    """Testa contar-usuarios, listar-usuarios, tarefas-por-usuario e top-usuarios."""
+    from app import Usuario, db
+
+    client.post('/auth/register', json={"email": "admin_top@email.com", "senha": "senha123"})
+    token = client.post('/auth/login', json={"email": "admin_top@email.com", "senha": "senha123"}).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    for i in range(60):
+        client.post('/tarefas', json={"descricao": f"Pesada {i}"}, headers=headers)
+
+    with app.app_context():
+        total = db.session.execute(db.select(db.func.count()).select_from(Usuario)).scalar()
+
+    runner = app.test_cli_runner()
+    assert f"{total:,}" in runner.invoke(args=['admin', 'contar-usuarios']).output
+
+    linhas = runner.invoke(args=['admin', 'listar-usuarios', '--lote', '2']).output.splitlines()
+    assert len(linhas) == total
+    assert any(linha.endswith('\tadmin_top@email.com') for linha in linhas)
+
+    por_usuario = runner.invoke(args=['admin', 'tarefas-por-usuario', '--lote', '2']).output
+    assert 'admin_top@email.com\t60' in por_usuario
+
+    top = runner.invoke(args=['admin', 'top-usuarios', '-n', '1']).output
+    assert top.strip() == '1. admin_top@email.com\t60'
+
+
+# ===================================================================================
+# Testes do Isolamento Transacional (fixture sessao_transacional)
+# ===================================================================================
+
+def test_sessao_transacional_enxerga_os_commits_da_api(client, sessao_transacional):
+    """Testa que commits da app viram savepoints visíveis dentro do teste."""
+    from app import Usuario
+
+    resposta = client.post('/auth/register', json={"email": "transacional@email.com", "senha": "senha123"})
+    assert resposta.status_code == 201
+    resposta = client.post('/auth/register', json={"email": "transacional@email.com", "senha": "senha123"})
+    assert resposta.status_code == 409  # Commit anterior segue valendo dentro da transação
+
+    login = client.post('/auth/login', json={"email": "transacional@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    assert client.post('/tarefas', json={"descricao": "Dentro da transação"}, headers=headers).status_code == 201
+    assert Usuario.query.filter_by(email="transacional@email.com").count() == 1
+
+
+def test_sessao_transacional_desfaz_tudo_no_final(client, app):
+    """Testa que nada do teste anterior chegou ao banco do módulo."""
+    from app import Usuario
+
+    with app.app_context():
+        assert Usuario.query.filter_by(email="transacional@email.com").count() == 0
+    login = client.post('/auth/login', json={"email": "transacional@email.com", "senha": "senha123"})
+    assert login.status_code == 401
+
+
+# ===================================================================================
+# Testes do Log de Consultas Lentas
+# ===================================================================================
+
+def test_consultas_lentas_registradas_com_rota_parametros_mascarados_e_plano(client, app, init_database, monkeypatch):
+    """Testa o ring buffer de SQL lento e GET /admin/consultas-lentas (só admin)."""
+    monkeypatch.setitem(app.config, 'CONSULTAS_LENTAS_LIMIAR_MS', 0)  # Tudo conta como lento
+    monkeypatch.setitem(app.config, 'CONSULTAS_LENTAS_EXPLAIN', True)
+    monkeypatch.setitem(app.config, 'ADMIN_EMAILS', ['admin_sql@email.com'])
+    registro = app.extensions['consultas_lentas']
+    registro.limpar()
+
+    for email in ("admin_sql@email.com", "comum_sql@email.com"):
+        client.post('/auth/register', json={"email": email, "senha": "senha123"})
+    tokens = {
+        email: client.post('/auth/login', json={"email": email, "senha": "senha123"}).get_json()['access_token']
+        for email in ("admin_sql@email.com", "comum_sql@email.com")
+    }
+    admin = {'Authorization': f"Bearer {tokens['admin_sql@email.com']}"}
+    comum = {'Authorization': f"Bearer {tokens['comum_sql@email.com']}"}
+
+    client.get('/tarefas', headers=comum)
+    assert client.get('/admin/consultas-lentas', headers=comum).status_code == 403
+
+    resposta = client.get('/admin/consultas-lentas', headers=admin)
+    assert resposta.status_code == 200
+    consultas = resposta.get_json()['consultas']
+    listagem = next(c for c in consultas if c['origem'] == 'GET /tarefas' and 'FROM tarefa' in c['sql'])
+    assert listagem['plano']  # EXPLAIN QUERY PLAN no SQLite
+    assert 'comum_sql@email.com' not in str(consultas)  # Email do token mascarado...
+    assert any('<str:19>' in str(c['parametros']) for c in consultas)  # ...como tipo:tamanho
+
+    assert client.delete('/admin/consultas-lentas', headers=admin).status_code == 204
+
+
+def test_explain_analyze_so_reexecuta_select_sem_efeito_colateral():
+    """Testa que FOR UPDATE/SHARE e chamadas de função impedem o EXPLAIN ANALYZE."""
+    from consultas_lentas import _pode_reexecutar
+
+    assert _pode_reexecutar('SELECT count(*) FROM tarefa WHERE user_id IN (%(a)s, %(b)s)')
+    assert _pode_reexecutar('SELECT tarefa.id FROM tarefa WHERE EXISTS (SELECT 1 FROM usuario)')
+    assert not _pode_reexecutar('SELECT * FROM usuario WHERE id = %(id)s FOR UPDATE')
+    assert not _pode_reexecutar('SELECT id FROM tarefa FOR NO KEY UPDATE SKIP LOCKED')
+    assert not _pode_reexecutar("SELECT pg_notify('tarefas_mudancas', %(dados)s)")
+    assert not _pode_reexecutar("SELECT nextval('tarefa_id_seq')")
+
+
+# ===================================================================================
+# Testes de Rastreamento (spans OTLP/JSON)
+# ===================================================================================
+
+def test_rastreamento_exporta_spans_de_http_sql_bcrypt_validacao_e_marshal(client, app, init_database, monkeypatch, tmp_path):
+    """Testa traces amostrados: hierarquia de spans, traceparent e arquivo OTLP/JSON."""
+    import json
+
+    arquivo = tmp_path / 'traces.jsonl'
+    monkeypatch.setitem(app.config, 'RASTREAMENTO_ATIVO', True)
+    monkeypatch.setitem(app.config, 'RASTREAMENTO_AMOSTRAGEM', 1.0)
+    monkeypatch.setitem(app.config, 'RASTREAMENTO_ARQUIVO', str(arquivo))
+    rastros = app.extensions['rastreamento']
+
+    client.post('/auth/register', json={"email": "rastro@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "rastro@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    pai = '00-' + 'ab' * 16 + '-' + 'cd' * 8 + '-01'
+    client.post('/tarefas', json={"descricao": "Rastreada"}, headers={**headers, 'traceparent': pai})
+    monkeypatch.setitem(app.config, 'RASTREAMENTO_AMOSTRAGEM', 0.0)
+    client.get('/tarefas', headers=headers)  # Não amostrada: nenhum trace
+    rastros.exportar_pendentes()
+
+    traces = [json.loads(linha) for linha in arquivo.read_text().splitlines()]
+    assert len(traces) == 3
+    spans = [[s for s in t['resourceSpans'][0]['scopeSpans'][0]['spans']] for t in traces]
+    nomes = [{s['name'] for s in trace} for trace in spans]
+
+    assert {'POST /auth/login', 'bcrypt.verificar'} <= nomes[1]
+    assert any(nome.startswith('db.query SELECT') for nome in nomes[1])
+    assert {'POST /tarefas', 'pydantic.validar', 'restx.marshal'} <= nomes[2]
+
+    raiz = next(s for s in spans[2] if s['name'] == 'POST /tarefas')
+    assert raiz['traceId'] == 'ab' * 16 and raiz['parentSpanId'] == 'cd' * 8  # Continua o trace de quem chamou
+    assert all(s['traceId'] == 'ab' * 16 for s in spans[2])
+    assert all(s.get('parentSpanId') == raiz['spanId'] for s in spans[2] if s is not raiz)
+    assert {'key': 'http.response.status_code', 'value': {'intValue': '201'}} in raiz['attributes']
+
+
+# ===================================================================================
+# Testes de Logs Estruturados (log de acesso)
+# ===================================================================================
+
+def test_log_de_acesso_estruturado_com_usuario_e_amostragem_por_rota(client, app, init_database, monkeypatch, caplog):
+    """Testa o registro de acesso: campos, uid do token, amostragem por rota e formato JSON."""
+    import json
+    import logging
+
+    from logs import FormatadorJSON
+
+    client.post('/auth/register', json={"email": "acesso@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "acesso@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    monkeypatch.setitem(app.config, 'LOG_ACESSO_AMOSTRAGEM_ROTAS', {'/health': 0.0})
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger='tarefas.acesso'):
+        client.get('/tarefas', headers=headers)
+        client.get('/health')  # Taxa 0: nunca registrada
+
+    registros = [r for r in caplog.records if r.name == 'tarefas.acesso']
+    assert [r.rota for r in registros] == ['/tarefas']
+    acesso = registros[0]
+    assert acesso.metodo == 'GET' and acesso.status == 200 and acesso.sql >= 1
+    assert acesso.usuario_id is not None and acesso.amostragem == 1.0
+
+    linha = json.loads(FormatadorJSON().format(acesso))
+    assert linha['logger'] == 'tarefas.acesso' and linha['rota'] == '/tarefas'
+    assert linha['usuario_id'] == acesso.usuario_id and 'duracao_ms' in linha
+
+
+# ===================================================================================
+# Testes de Resolução de DNS (hostaddr em cache)
+# ===================================================================================
+
+def test_cache_dns_com_timeout_renovacao_em_segundo_plano_e_ultimo_ip_bom(monkeypatch):
+    """Testa o CacheDNS: não espera além do timeout, serve o IP antigo e acompanha a troca."""
+    import socket
+    import threading
+    import time
+
+    from resolvedor_dns import CacheDNS
+
+    respostas = {'ip': '10.0.0.1'}
+    liberar = threading.Event()
+    liberar.set()
+
+    def getaddrinfo_falso(host, *args):
+        liberar.wait()
+        if respostas['ip'] is None:
+            raise socket.gaierror('falha temporária')
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (respostas['ip'], 0))]
+
+    monkeypatch.setattr(socket, 'getaddrinfo', getaddrinfo_falso)
+    cache = CacheDNS(ttl=60, timeout=0.05)
+    assert cache.resolver('db.exemplo') == '10.0.0.1'
+
+    # DNS travado sem cache: desiste no timeout (conecta sem hostaddr)
+    liberar.clear()
+    inicio = time.monotonic()
+    assert cache.resolver('outro.exemplo') is None
+    assert time.monotonic() - inicio < 1
+    liberar.set()
+
+    # TTL vencido: devolve o IP antigo na hora e renova em segundo plano
+    cache.ttl = 0
+    respostas['ip'] = '10.0.0.2'
+    assert cache.resolver('db.exemplo') == '10.0.0.1'
+    for thread in threading.enumerate():
+        if thread.name == 'dns-db.exemplo':
+            thread.join(1)
+    assert cache._entradas['db.exemplo'][0] == '10.0.0.2'
+
+    # Renovação que falha mantém o último IP bom
+    respostas['ip'] = None
+    assert cache.resolver('db.exemplo') == '10.0.0.2'
+    for thread in threading.enumerate():
+        if thread.name == 'dns-db.exemplo':
+            thread.join(1)
+    assert cache.resolver('db.exemplo') == '10.0.0.2'
+
+
+# ===================================================================================
+# Testes de Idempotency-Key
+# ===================================================================================
+
+def test_post_tarefa_com_idempotency_key_repete_a_primeira_resposta(client, init_database):
+    """Testa o replay: mesma chave não cria duplicata; outro corpo → 422; sem chave nada muda."""
+    client.post('/auth/register', json={"email": "idem@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "idem@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    com_chave = {**headers, 'Idempotency-Key': 'b1946ac9-2f7a-4f39-9f5e-1c0f3c1d2e3a'}
+
+    primeira = client.post('/tarefas', json={"descricao": "Só uma vez"}, headers=com_chave)
+    repetida = client.post('/tarefas', json={"descricao": "Só uma vez"}, headers=com_chave)
+    assert primeira.status_code == repetida.status_code == 201
+    assert repetida.get_json() == primeira.get_json()
+    assert repetida.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in primeira.headers
+
+    outro_corpo = client.post('/tarefas', json={"descricao": "Outra"}, headers=com_chave)
+    assert outro_corpo.status_code == 422
+
+    # Erro de validação (abort 400) libera a chave: a repetição só valida de novo
+    chave_invalida = {**headers, 'Idempotency-Key': 'invalida'}
+    assert client.post('/tarefas', json={"descricao": ""}, headers=chave_invalida).status_code == 400
+    assert client.post('/tarefas', json={"descricao": ""}, headers=chave_invalida).status_code == 400
+
+    client.post('/tarefas', json={"descricao": "Só uma vez"}, headers=headers)  # Sem chave: cria
+    descricoes = [t['descricao'] for t in client.get('/tarefas', headers=headers).get_json()]
+    assert descricoes.count("Só uma vez") == 2
+
+
+def test_idempotency_key_reserva_abandonada_e_assumida_pela_repeticao(client, app, init_database):
+    """Testa que uma reserva sem resposta (worker morreu) dá 409 só até o prazo de andamento."""
+    from datetime import timedelta
+    from app import RespostaIdempotente, Usuario, db
+
+    client.post('/auth/register', json={"email": "idemorfa@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "idemorfa@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}",
+               'Idempotency-Key': 'reserva-orfa'}
+    corpo = {"descricao": "Depois do crash"}
+
+    # Reserva deixada por um worker que morreu antes de guardar a resposta
+    primeira = client.post('/tarefas', json=corpo, headers=headers)
+    with app.app_context():
+        user_id = db.session.execute(
+            db.select(Usuario.id).filter_by(email="idemorfa@email.com")
+        ).scalar()
+        reserva = db.session.get(RespostaIdempotente, (user_id, 'reserva-orfa'))
+        reserva.status = reserva.corpo = None
+        db.session.commit()
+
+    assert client.post('/tarefas', json=corpo, headers=headers).status_code == 409
+
+    with app.app_context():
+        reserva = db.session.get(RespostaIdempotente, (user_id, 'reserva-orfa'))
+        reserva.criada_em -= timedelta(seconds=app.config['IDEMPOTENCIA_ANDAMENTO_SEGUNDOS'] + 1)
+        db.session.commit()
+
+    assumida = client.post('/tarefas', json=corpo, headers=headers)
+    assert assumida.status_code == 201
+    assert assumida.get_json()['id'] != primeira.get_json()['id']
+    assert client.post('/tarefas', json=corpo, headers=headers).headers['Idempotent-Replayed'] == 'true'
+
+
+# ===================================================================================
+# Testes de Leitura Única (single-flight de GET /tarefas)
+# ===================================================================================
+
+def test_leitura_unica_coalesce_consultas_simultaneas_da_mesma_chave(app):
+    """Testa o single-flight: 1 consulta para N chamadas simultâneas; chave diferente não espera."""
+    import threading
+    import time
+
+    leituras = app.extensions['leitura_unica']
+    antes = leituras.metricas
+    liberar = threading.Event()
+    chamadas = []
+
+    def consulta():
+        chamadas.append(1)
+        liberar.wait(5)
+        return [{'id': 1}]
+
+    resultados = []
+    threads = [
+        threading.Thread(target=lambda: resultados.append(leituras.executar(('teste', 1), consulta)))
+        for _ in range(5)
+    ]
+    threads[0].start()
+    while leituras.metricas['em_andamento'] == antes['em_andamento']:
+        time.sleep(0.001)  # Líder dentro da consulta
+    for thread in threads[1:]:
+        thread.start()
+    while leituras.metricas['coalescidas'] < antes['coalescidas'] + 4:
+        time.sleep(0.001)  # Seguidoras esperando
+    assert leituras.executar(('teste', 2), lambda: 'outra chave') == 'outra chave'
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(chamadas) == 1
+    assert resultados == [[{'id': 1}]] * 5 and all(r is resultados[0] for r in resultados)
+    assert leituras.metricas['executadas'] == antes['executadas'] + 2
+    assert leituras.metricas['em_andamento'] == 0
+
+
+def test_get_tarefas_passa_pela_leitura_unica_com_geracao_nova_apos_escrita(client, app, init_database, monkeypatch):
+    """Testa GET /tarefas: a escrita muda a geração e as métricas ficam em /admin/leituras."""
+    client.post('/auth/register', json={"email": "voo@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "voo@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    leituras = app.extensions['leitura_unica']
+    chaves, voos = [], []
+    executar_original = leituras.executar
+
+    def executar_registrando(chave, consulta):
+        chaves.append(chave)
+        voos.append(executar_original(chave, consulta))
+        return voos[-1]
+
+    monkeypatch.setattr(leituras, 'executar', executar_registrando)
+
+    client.get('/tarefas', headers=headers)
+    client.post('/tarefas', json={"descricao": "Nova geração"}, headers=headers)
+    lista = client.get('/tarefas', headers=headers).get_json()
+
+    assert [t['descricao'] for t in lista] == ["Nova geração"]
+    assert chaves[0][:2] == chaves[1][:2] and chaves[1][2] > chaves[0][2]
+    # O voo carrega o corpo já serializado: seguidoras não fazem marshal
+    assert voos[1] == lista and voos[1][0]['arquivada'] is False
+
+    assert client.get('/admin/leituras', headers=headers).status_code == 403
+    monkeypatch.setitem(app.config, 'ADMIN_EMAILS', ['voo@email.com'])
+    metricas = client.get('/admin/leituras', headers=headers).get_json()
+    assert set(metricas) == {'executadas', 'coalescidas', 'em_andamento'}
+
+
+# ===================================================================================
+# Testes de Validação do Corpo (bytes → schema em uma passada)
+# ===================================================================================
+
+def test_corpo_validado_direto_dos_bytes_com_limite_de_tamanho(client, app, init_database):
+    """Testa auth/tarefas: JSON inválido e campos ausentes → 400, corpo grande → 413, não-JSON → 415."""
+    assert client.post('/auth/register', json={"email": "bytes@email.com"}).status_code == 400
+    assert client.post('/auth/register', json={"email": "sem-arroba", "senha": "senha123"}).status_code == 400
+    sem_senha = client.post('/auth/login', json={"email": "bytes@email.com"})
+    assert sem_senha.status_code == 400
+    assert sem_senha.get_json()['erros'][0]['loc'] == ['senha']
+
+    client.post('/auth/register', json={"email": "bytes@email.com", "senha": "senha123"})
+    login = client.post('/auth/login', json={"email": "bytes@email.com", "senha": "senha123"})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    quebrado = client.post('/tarefas', data=b'{"descricao": ', headers=headers, content_type='application/json')
+    assert quebrado.status_code == 400
+    assert quebrado.get_json()['erros'][0]['type'] == 'json_invalid'
+    assert 'input' not in quebrado.get_json()['erros'][0]
+
+    texto = client.post('/tarefas', data='descricao=Texto', headers=headers, content_type='text/plain')
+    assert texto.status_code == 415
+
+    grande = 'x' * (app.config['MAX_CONTENT_LENGTH'] + 1)
+    assert client.post('/tarefas', json={"descricao": grande}, headers=headers).status_code == 413
+    assert client.post('/tarefas', json={"descricao": "Cabe no limite"}, headers=headers).status_code == 201
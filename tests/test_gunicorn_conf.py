@@ -0,0 +1,41 @@
+# ===================================================================================
+# Testes da Configuração do Gunicorn
+# ===================================================================================
+import os
+import runpy
+
+CAMINHO_CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'gunicorn.conf.py')
+
+
+def carregar_conf():
+    """Executa gunicorn.conf.py como o Gunicorn faz e retorna suas variáveis."""
+    return runpy.run_path(CAMINHO_CONF)
+
+
+def test_configuracao_lida_das_variaveis_de_ambiente(monkeypatch):
+    """Testa se worker class, threads, workers e reciclagem vêm do ambiente."""
+    monkeypatch.setenv('GUNICORN_WORKER_CLASS', 'sync')
+    monkeypatch.setenv('GUNICORN_WORKERS', '3')
+    monkeypatch.setenv('GUNICORN_THREADS', '8')
+    monkeypatch.setenv('GUNICORN_PRELOAD', 'false')
+    monkeypatch.setenv('GUNICORN_MAX_REQUESTS', '500')
+    monkeypatch.setenv('GUNICORN_MAX_REQUESTS_JITTER', '50')
+
+    conf = carregar_conf()
+
+    assert conf['worker_class'] == 'sync'
+    assert conf['workers'] == 3
+    assert conf['threads'] == 8
+    assert conf['preload_app'] is False
+    assert conf['max_requests'] == 500
+    assert conf['max_requests_jitter'] == 50
+
+
+def test_workers_derivados_das_cpus_quando_nao_configurado(monkeypatch):
+    """Testa se o número de workers segue a fórmula 2 x CPUs + 1."""
+    monkeypatch.delenv('GUNICORN_WORKERS', raising=False)
+
+    conf = carregar_conf()
+
+    assert conf['workers'] == conf['_cpus_disponiveis']() * 2 + 1
+    assert conf['preload_app'] is True